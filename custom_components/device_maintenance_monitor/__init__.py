@@ -1,21 +1,108 @@
-"""The Device Maintenance Monitor integration."""
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+"""The Device Maintenance Monitor integration.
 
-from .common import create_source_entity
-from .const import DOMAIN
-from .device_binding import bind_config_entry_to_device
-from .logics import get_maintenance_logic
+Home Assistant is only imported when an entry is set up, so the constants and the logics can be imported by the
+offline tools without it.
+"""
+from typing import TYPE_CHECKING, Any
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.BUTTON, Platform.SENSOR]
+from .const import (
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_AGGREGATE_MIN_ON,
+    CONF_AGGREGATE_MODE,
+    CONF_ANOMALY_Z_SCORE,
+    CONF_DIGEST_WINDOW,
+    CONF_ENTITY_ID,
+    CONF_FORECAST_MODE,
+    CONF_LOAD_ATTRIBUTE,
+    CONF_LOAD_ENTITY_ID,
+    CONF_SENSOR_TYPE,
+    DATA_MAINTENANCE_EVENTS,
+    DOMAIN,
+    SIGNAL_MONITOR_RECONFIGURED,
+    SIGNAL_MONITOR_UPDATED,
+    ForecastMode,
+)
 
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+# The values of homeassistant.const.Platform
+PLATFORMS: list[str] = ["binary_sensor", "button", "sensor"]
+
+# The options that change the entities, the listeners or the combined sources of a monitor, the other options are
+# applied to the live logic
+RELOAD_OPTIONS = (
+    CONF_SENSOR_TYPE,
+    CONF_ENTITY_ID,
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_AGGREGATE_MODE,
+    CONF_AGGREGATE_MIN_ON,
+    CONF_FORECAST_MODE,
+    CONF_LOAD_ENTITY_ID,
+    CONF_LOAD_ATTRIBUTE,
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the configuration schema when Home Assistant reads it, so the offline tools do not import it."""
+    if name != "CONFIG_SCHEMA":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from .config_schema import CONFIG_SCHEMA
+
+    # Cached in the module, so the next reads do not go through __getattr__
+    globals()[name] = CONFIG_SCHEMA
+    return CONFIG_SCHEMA
+
+
+async def async_setup(hass: "HomeAssistant", config: dict) -> bool:
+    """Set up the integration, registering the services, the websocket commands and the shared entities."""
+    from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+    from homeassistant.core import Event, callback
+    from homeassistant.helpers.discovery import async_load_platform
+
+    from .due_dates import async_get_due_date_tracker
+    from .maintenance_events import MaintenanceEventNotifier
+    from .services import async_register_services
+    from .websocket_api import async_register_websocket_commands
+
+    hass.data.setdefault(DOMAIN, {})
+    async_register_services(hass)
+    async_register_websocket_commands(hass)
+    async_get_due_date_tracker(hass)
+
+    if (previous_notifier := hass.data.get(DATA_MAINTENANCE_EVENTS)) is not None:
+        # Set up again, e.g. by the tests, replace the notifier instead of stacking its listener
+        previous_notifier.async_stop()
+    notifier = MaintenanceEventNotifier(hass, config.get(DOMAIN, {}).get(CONF_DIGEST_WINDOW))
+    stop_notifier = notifier.async_start()
+    hass.data[DATA_MAINTENANCE_EVENTS] = notifier
+
+    @callback
+    def async_stop_notifier(_: Event) -> None:
+        stop_notifier()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_notifier)
+
+    # The calendar and the next maintenance due sensor are shared by all the entries
+    hass.async_create_task(async_load_platform(hass, "calendar", DOMAIN, {}, config))
+    hass.async_create_task(async_load_platform(hass, "sensor", DOMAIN, {}, config))
+    return True
+
+
+async def async_setup_entry(hass: "HomeAssistant", entry: "ConfigEntry") -> bool:
     """Set up the integration from a config entry."""
+    # Already loaded by the config flow and the platforms by the time an entry is set up
+    from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+    from .common import create_source_entity
+    from .device_binding import bind_config_entry_to_device
+    from .logic_factory import async_reconfigure_logic, get_maintenance_logic
+    from .template_cache import async_get_template_cache
 
     # Get the maintenance logic for the entry
     logic = await get_maintenance_logic(hass, entry)
+    entry.async_on_unload(lambda: async_get_template_cache(hass).async_release(entry.entry_id))
 
     # Bind the config entry to the device from the source entity if it is not already bound
     source_entity = None
@@ -26,17 +113,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up sensors, binary sensors, and buttons
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = logic
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_dispatcher_send(hass, SIGNAL_MONITOR_UPDATED, entry.entry_id)
+
+    if entry.data.get(CONF_FORECAST_MODE) == ForecastMode.HOUR_OF_WEEK:
+        # The recorder is only imported by the monitors that forecast their usage
+        from .forecast import UsageForecaster
+
+        entry.async_on_unload(UsageForecaster(hass, entry, logic).async_start())
 
+    applied_data = dict(entry.data)
+
+    async def async_options_updated(hass: "HomeAssistant", entry: "ConfigEntry") -> None:
+        """Apply the new options to the live logic, without tearing down the entities and losing the usage."""
+        nonlocal applied_data
+        previous_data, applied_data = applied_data, dict(entry.data)
+        if previous_data == applied_data:
+            return
+        if _requires_reload(previous_data, applied_data):
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
+        await async_reconfigure_logic(hass, entry, logic)
+        # The monitor re-evaluates its sources with the new options, and writes its state once
+        async_dispatcher_send(hass, SIGNAL_MONITOR_RECONFIGURED, entry.entry_id)
+
+    entry.async_on_unload(entry.add_update_listener(async_options_updated))
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+def _requires_reload(previous_data: dict, data: dict) -> bool:
+    """Return whether the new options change the entities or the listeners of a monitor."""
+    if any(previous_data.get(key) != data.get(key) for key in RELOAD_OPTIONS):
+        return True
+    # The usage anomaly binary sensor only exists while the anomalies are detected
+    return bool(previous_data.get(CONF_ANOMALY_Z_SCORE)) != bool(data.get(CONF_ANOMALY_Z_SCORE))
+
+
+async def async_unload_entry(hass: "HomeAssistant", entry: "ConfigEntry") -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(
         entry,
         PLATFORMS,
     )
     if unload_ok:
+        from homeassistant.helpers.dispatcher import async_dispatcher_send
+
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_MONITOR_UPDATED, entry.entry_id)
 
     return True
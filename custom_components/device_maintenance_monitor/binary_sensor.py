@@ -11,34 +11,62 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
 from homeassistant.helpers import entity_platform, selector, start
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
     async_dispatcher_send,
 )
 from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
     async_track_state_change_event,
     async_track_time_interval,
+    async_track_utc_time_change,
 )
 from homeassistant.helpers.restore_state import RestoredExtraData, RestoreEntity
+import homeassistant.util.dt as dt_util
 
 from .common import SourceEntity, create_source_entity, generate_sensor_entity_id
 from .const import (
-    DATE_FORMAT,
     DOMAIN,
     ENTITY_BINARY_SENSOR_KEY,
     ENTITY_BINARY_SENSOR_TRANSLATION_KEY,
+    ENTITY_USAGE_ANOMALY_KEY,
     SERVICE_RESET_MAINTENANCE,
     SERVICE_RESET_MAINTENANCE_LAST_MAINTENANCE_DATE,
     SERVICE_UPDATE_MAINTENANCE_INFO,
+    SIGNAL_MAINTENANCE_REQUESTED,
+    SIGNAL_MONITOR_RECONFIGURED,
+    SIGNAL_MONITOR_UPDATED,
     SIGNAL_SENSOR_STATE_CHANGE,
+    STATE_CYCLE_COUNT,
+    STATE_DEVICE_TURN_ON_COUNT,
+    STATE_ENERGY_CONSUMED,
+    STATE_METER_CONSUMED,
+    STATE_METER_LAST_VALUE,
+    STATE_RUNTIME_DURATION,
+    MaintenanceAction,
+    MaintenanceSource,
 )
 from .device_binding import get_device_info
+from .event_queue import LoadEvent, MaintenanceEvent, SourceEvent, SourceEventQueue
 from .logics import MaintenanceLogic
+from .logics.clock import parse_date
+from .logics.range_maintenance_logic import RangeMaintenanceLogic
 
 _LOGGER = logging.getLogger(__name__)
 
+# The usage changes on every update and has dedicated sensors, writing it to the attributes would make the recorder
+# store a new row for the binary sensor every minute
+SENSOR_STATES = frozenset({
+    STATE_CYCLE_COUNT,
+    STATE_DEVICE_TURN_ON_COUNT,
+    STATE_ENERGY_CONSUMED,
+    STATE_METER_CONSUMED,
+    STATE_METER_LAST_VALUE,
+    STATE_RUNTIME_DURATION,
+})
+
 
 @callback
 def register_entity_services() -> None:
@@ -79,9 +107,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         logic.source_entity_id,
         logic.logic_type
     )
-    async_add_entities([
-        MaintenanceNeededBinarySensorEntity(hass, logic, entry.unique_id, source_entity),
-    ])
+    entities: list[BinarySensorEntity] = [
+        MaintenanceNeededBinarySensorEntity(hass, logic, entry.entry_id, entry.unique_id, source_entity),
+    ]
+    if isinstance(logic, RangeMaintenanceLogic) and logic.detects_usage_anomalies:
+        entities.append(
+            UsageAnomalyBinarySensorEntity(hass, logic, entry.entry_id, entry.unique_id, source_entity),
+        )
+    async_add_entities(entities)
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -89,24 +122,36 @@ class MaintenanceBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Class describing binary sensors entities."""
 
 
+MAINTENANCE_NEEDED_BINARY_SENSOR = MaintenanceBinarySensorEntityDescription(
+    key=ENTITY_BINARY_SENSOR_KEY,
+    has_entity_name=True,
+    translation_key=ENTITY_BINARY_SENSOR_TRANSLATION_KEY,
+    device_class=BinarySensorDeviceClass.PROBLEM,
+)
+
+USAGE_ANOMALY_BINARY_SENSOR = MaintenanceBinarySensorEntityDescription(
+    key=ENTITY_USAGE_ANOMALY_KEY,
+    has_entity_name=True,
+    translation_key=ENTITY_USAGE_ANOMALY_KEY,
+    device_class=BinarySensorDeviceClass.PROBLEM,
+)
+
+
 class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
     """A class that represents a binary sensor entity for indicating whether maintenance is needed."""
 
     def __init__(self,
                  hass: HomeAssistant,
                  logic: MaintenanceLogic,
+                 entry_id: str,
                  unique_id: str,
                  source_entity: SourceEntity | None):
         """Initialize the binary sensor entity.
 
         :param logic: The maintenance logic to be  used.
+        :param entry_id: The identifier of the config entry of the logic.
         """
-        self.entity_description = MaintenanceBinarySensorEntityDescription(
-            key=ENTITY_BINARY_SENSOR_KEY,
-            has_entity_name=True,
-            translation_key=ENTITY_BINARY_SENSOR_TRANSLATION_KEY,
-            device_class=BinarySensorDeviceClass.PROBLEM,
-        )
+        self.entity_description = MAINTENANCE_NEEDED_BINARY_SENSOR
         self._attr_unique_id = f"{unique_id}_maintenance_needed"
         if source_entity:
             self._attr_device_info = get_device_info(source_entity)
@@ -120,6 +165,10 @@ class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
         )
 
         self._logic = logic
+        self._entry_id = entry_id
+        self._queue = SourceEventQueue(hass, logic, entry_id, self._async_queue_drained)
+        self._next_update_time: datetime | None = None  # The time of the pending update requested by the logic
+        self._unsub_next_update: CALLBACK_TYPE | None = None
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -139,95 +188,196 @@ class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
             )
             self._logic.restore_state(restored_last_extra_data.as_dict())
 
-        if self._logic.source_entity_id:
-            async def initial_update_listener(hass: HomeAssistant) -> None:
-                """Handle the initial update after start."""
-                current_state = self.hass.states.get(self._logic.source_entity_id)
-                _LOGGER.info(
-                    "Handling initial update for binary sensor entity '%s' for device '%s', state: %s",
-                    self.entity_id,
-                    self._logic.source_entity_id,
-                    current_state,
-                )
-                if not current_state:
-                    return
-                await self._logic.handle_startup(current_state.state)
-                self.async_write_ha_state()
-
-                # Notify all sensors to update its state
-                async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
-
-            self.async_on_remove(start.async_at_start(self.hass, initial_update_listener))
-
-        if self._logic.source_entity_id:
-            async def source_entity_state_listener(event: Event) -> None:
-                old_state = event.data.get("old_state")
-                new_state = event.data.get("new_state")
-                if old_state != new_state:
-                    _LOGGER.info(
-                        "Handling state change for binary sensor entity '%s' for device '%s', old state: %s, "
-                        "new state: %s",
-                        self.entity_id,
-                        self._logic.source_entity_id,
-                        old_state,
-                        new_state,
-                    )
-
-                if old_state is None or new_state is None:
-                    return
-
-                await self._logic.handle_source_entity_state_change(
-                    old_state.state, new_state.state
-                )
-                self.async_write_ha_state()
-
-                # Notify all sensors to update its state
-                async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
-
+        if self._logic.load_entity_id:
+            # Tracked before the sources, so a load reported with a state change weights the runtime that follows it
             self.async_on_remove(
                 async_track_state_change_event(
                     self.hass,
-                    self._logic.source_entity_id,
-                    source_entity_state_listener,
+                    [self._logic.load_entity_id],
+                    self._async_load_entity_state_listener,
                 ),
             )
-
-        @callback
-        def signal_sensor_state_change_listener() -> None:
-            """Handle the sensor state change signal."""
-            _LOGGER.info(
-                "Handling sensor state change for binary sensor entity '%s' for device '%s'",
-                self.entity_id,
-                self._logic.source_entity_id,
+        if self._logic.source_entity_id:
+            self.async_on_remove(start.async_at_start(self.hass, self._async_initial_update_listener))
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass,
+                    self._logic.source_entity_ids,
+                    self._async_source_entity_state_listener,
+                ),
             )
-            self.async_write_ha_state()
 
         self.async_on_remove(
             async_dispatcher_connect(
                 self.hass,
                 SIGNAL_SENSOR_STATE_CHANGE,
-                signal_sensor_state_change_listener,
+                self._signal_sensor_state_change_listener,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_MONITOR_RECONFIGURED,
+                self._async_monitor_reconfigured,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_MAINTENANCE_REQUESTED,
+                self._async_maintenance_requested,
             )
         )
 
         if self._logic.update_frequency:
-            @callback
-            def async_update(__: datetime | None = None) -> None:
-                """Update the entity."""
-                _LOGGER.info(
-                    "Updating binary sensor entity '%s' for device '%s' based on the update frequency (%s)",
-                    self.entity_id,
-                    self._logic.source_entity_id,
-                    str(self._logic.update_frequency),
-                )
-                self._logic.update()
-                self.async_schedule_update_ha_state(True)
-
             self.async_on_remove(
                 async_track_time_interval(
-                    self.hass, async_update, self._logic.update_frequency
+                    self.hass, self._async_update, self._logic.update_frequency
                 )
             )
+        self.async_on_remove(self._async_cancel_next_update)
+
+    @callback
+    def _async_initial_update_listener(self, hass: HomeAssistant) -> None:
+        """Handle the initial update after start."""
+        now = dt_util.utcnow()
+        if self._logic.load_entity_id:
+            self._queue.async_put(LoadEvent(self._read_load(hass.states.get(self._logic.load_entity_id)), now))
+        for source_entity_id in self._logic.source_entity_ids:
+            current_state = hass.states.get(source_entity_id)
+            _LOGGER.info(
+                "Handling initial update for binary sensor entity '%s' for device '%s', state: %s",
+                self.entity_id,
+                source_entity_id,
+                current_state,
+            )
+            if not current_state:
+                continue
+            self._queue.async_put(SourceEvent(source_entity_id, None, current_state.state, now))
+
+    @callback
+    def _async_monitor_reconfigured(self, entry_id: str) -> None:
+        """Re-evaluate the sources with the new options of the logic, and write the state once the queue drained."""
+        if entry_id != self._entry_id:
+            return
+        _LOGGER.info(
+            "Reconfiguring binary sensor entity '%s' for device '%s'",
+            self.entity_id,
+            self._logic.source_entity_id,
+        )
+        if self.hass.is_running:
+            # A source is only turned on or off when it is seen differently with the new on states or template
+            now = dt_util.utcnow()
+            for source_entity_id in self._logic.source_entity_ids:
+                if current_state := self.hass.states.get(source_entity_id):
+                    self._queue.async_put(
+                        SourceEvent(source_entity_id, current_state.state, current_state.state, now)
+                    )
+        self._queue.async_put_update()
+
+    @callback
+    def _async_source_entity_state_listener(self, event: Event) -> None:
+        """Handle the state change of a source entity."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if old_state != new_state:
+            _LOGGER.info(
+                "Handling state change for binary sensor entity '%s' for device '%s', old state: %s, "
+                "new state: %s",
+                self.entity_id,
+                event.data.get("entity_id"),
+                old_state,
+                new_state,
+            )
+
+        if old_state is None or new_state is None:
+            return
+
+        self._queue.async_put(
+            SourceEvent(event.data.get("entity_id"), old_state.state, new_state.state, event.time_fired)
+        )
+
+    def _read_load(self, state: State | None) -> str | float | None:
+        """Read the load from the state of the load entity, from its attribute when one is set."""
+        if state is None:
+            return None
+        if self._logic.load_attribute:
+            return state.attributes.get(self._logic.load_attribute)
+        return state.state
+
+    @callback
+    def _async_load_entity_state_listener(self, event: Event) -> None:
+        """Handle the state change of the load entity, only queueing the changes of the load."""
+        load = self._read_load(event.data.get("new_state"))
+        if load != self._read_load(event.data.get("old_state")):
+            self._queue.async_put(LoadEvent(load, event.time_fired))
+
+    @callback
+    def _async_queue_drained(self, events_applied: bool) -> None:
+        """Write the state once for all the events applied by the queue."""
+        self._async_schedule_next_update()
+        self.async_write_ha_state()
+        if events_applied:
+            self._async_notify_state_change()
+        else:
+            async_dispatcher_send(self.hass, SIGNAL_MONITOR_UPDATED, self._entry_id)
+
+    @callback
+    def _async_schedule_next_update(self) -> None:
+        """Keep a single timer for the update requested by the logic, moving it when the requested time changes."""
+        next_update_time = self._logic.next_update_time
+        if next_update_time == self._next_update_time:
+            return
+        self._async_cancel_next_update()
+        if next_update_time is not None:
+            self._next_update_time = next_update_time
+            self._unsub_next_update = async_track_point_in_utc_time(
+                self.hass, self._async_next_update, next_update_time
+            )
+
+    @callback
+    def _async_cancel_next_update(self) -> None:
+        if self._unsub_next_update is not None:
+            self._unsub_next_update()
+            self._unsub_next_update = None
+        self._next_update_time = None
+
+    @callback
+    def _async_next_update(self, __: datetime) -> None:
+        """Update the logic at the time it requested."""
+        self._unsub_next_update = None
+        self._next_update_time = None
+        # Run after the pending source events, the drain schedules the next update
+        self._queue.async_put_update()
+
+    @callback
+    def _signal_sensor_state_change_listener(self) -> None:
+        """Handle the sensor state change signal."""
+        _LOGGER.info(
+            "Handling sensor state change for binary sensor entity '%s' for device '%s'",
+            self.entity_id,
+            self._logic.source_entity_id,
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _async_update(self, __: datetime | None = None) -> None:
+        """Update the entity based on the update frequency."""
+        _LOGGER.info(
+            "Updating binary sensor entity '%s' for device '%s' based on the update frequency (%s)",
+            self.entity_id,
+            self._logic.source_entity_id,
+            str(self._logic.update_frequency),
+        )
+        # Run after the pending source events, so the update does not interleave with them
+        self._queue.async_put_update()
+
+    @callback
+    def _async_notify_state_change(self) -> None:
+        """Notify the sensors and the fleet status subscribers that the state of the logic changed."""
+        # Notify all sensors to update its state
+        async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
+        async_dispatcher_send(self.hass, SIGNAL_MONITOR_UPDATED, self._entry_id)
 
     async def async_will_remove_from_hass(self) -> None:
         """Handle entity being removed from hass."""
@@ -240,8 +390,7 @@ class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
         self._logic.update()
         self.async_write_ha_state()
 
-        # Notify all sensors to update its state
-        async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
+        self._async_notify_state_change()
 
     @property
     def is_on(self):
@@ -250,13 +399,17 @@ class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
 
     @property
     def extra_state_attributes(self):
-        """Return the state attributes."""
-        return self._logic.get_state()
+        """Return the state attributes, without the usage that has dedicated sensors."""
+        return {
+            key: value
+            for key, value in self._logic.get_state().items()
+            if key not in SENSOR_STATES
+        }
 
     @property
     def extra_restore_state_data(self) -> RestoredExtraData:
-        """Return the state attributes."""
-        return RestoredExtraData(self._logic.get_state())
+        """Return the state to restore, with the usage statistics."""
+        return RestoredExtraData(self._logic.get_restore_state())
 
     @callback
     def async_reset(self, last_maintenance_date: str | None = None):
@@ -269,15 +422,15 @@ class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
         )
 
         if last_maintenance_date:
-            last_maintenance_date_parsed = datetime.strptime(last_maintenance_date, DATE_FORMAT)
+            last_maintenance_date_parsed = parse_date(last_maintenance_date)
         else:
             last_maintenance_date_parsed = None
-        # Reset the device maintenance monitor metrics
-        self._logic.reset(last_maintenance_date_parsed)
-        self.async_write_ha_state()
-
-        # Notify all sensors to update its state
-        async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
+        # Reset the device maintenance monitor metrics after the pending events, the drain writes the state
+        self._queue.async_put(
+            MaintenanceEvent(
+                MaintenanceAction.RESET, MaintenanceSource.SERVICE, last_maintenance_date_parsed, dt_util.utcnow()
+            )
+        )
 
     @callback
     def async_update_state(self, last_maintenance_date: str):
@@ -289,12 +442,87 @@ class MaintenanceNeededBinarySensorEntity(BinarySensorEntity, RestoreEntity):
             last_maintenance_date
         )
 
-        last_maintenance_date_parsed = datetime.strptime(last_maintenance_date, DATE_FORMAT)
-        # Update the device maintenance monitor state
-        self._logic.update_state(
-            last_maintenance_date=last_maintenance_date_parsed,
+        last_maintenance_date_parsed = parse_date(last_maintenance_date)
+        # Update the device maintenance monitor state after the pending events, the drain writes the state
+        self._queue.async_put(
+            MaintenanceEvent(
+                MaintenanceAction.UPDATE, MaintenanceSource.SERVICE, last_maintenance_date_parsed, dt_util.utcnow()
+            )
+        )
+
+    @callback
+    def _async_maintenance_requested(self, entry_id: str, event: MaintenanceEvent) -> None:
+        """Queue the maintenance requested for the logic of the binary sensor, e.g. by the button."""
+        if entry_id == self._entry_id:
+            self._queue.async_put(event)
+
+
+class UsageAnomalyBinarySensorEntity(BinarySensorEntity):
+    """A class that represents a binary sensor entity for indicating whether the usage of today is anomalous."""
+
+    def __init__(self,
+                 hass: HomeAssistant,
+                 logic: RangeMaintenanceLogic,
+                 entry_id: str,
+                 unique_id: str,
+                 source_entity: SourceEntity | None):
+        """Initialize the binary sensor entity.
+
+        :param logic: The maintenance logic keeping the statistics of the daily usage.
+        :param entry_id: The identifier of the config entry of the logic.
+        """
+        self.entity_description = USAGE_ANOMALY_BINARY_SENSOR
+        self._attr_unique_id = f"{unique_id}_{ENTITY_USAGE_ANOMALY_KEY}"
+        if source_entity:
+            self._attr_device_info = get_device_info(source_entity)
+        self.entity_id = generate_sensor_entity_id(
+            hass,
+            "binary_sensor",
+            ENTITY_USAGE_ANOMALY_KEY,
+            source_entity,
+            logic.name,
+            self.unique_id,
+        )
+
+        self._logic = logic
+        self._entry_id = entry_id
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added to hass."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_MONITOR_UPDATED,
+                self._async_monitor_updated,
+            )
+        )
+        # The days of the statistics are counted in UTC, a new day starts without usage
+        self.async_on_remove(
+            async_track_utc_time_change(self.hass, self._async_day_changed, hour=0, minute=0, second=0)
         )
+
+    @callback
+    def _async_monitor_updated(self, entry_id: str) -> None:
+        """Write the state when the logic of the sensor was updated."""
+        if entry_id == self._entry_id:
+            self.async_write_ha_state()
+
+    @callback
+    def _async_day_changed(self, __: datetime) -> None:
+        """Write the state when the day rolls over."""
         self.async_write_ha_state()
 
-        # Notify all sensors to update its state
-        async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
+    @property
+    def is_on(self) -> bool:
+        """Return whether the usage of today is anomalous."""
+        return self._logic.is_usage_anomalous
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int]:
+        """Return the statistics of the daily usage, which only change when the day rolls over."""
+        daily_usage = self._logic.daily_usage_statistics
+        return {
+            "daily_usage_mean": round(daily_usage.mean, 2),
+            "daily_usage_stdev": round(daily_usage.stdev, 2),
+            "days": daily_usage.days,
+        }
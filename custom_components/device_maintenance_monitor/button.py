@@ -7,15 +7,19 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+import homeassistant.util.dt as dt_util
 
 from .common import SourceEntity, create_source_entity, generate_sensor_entity_id
 from .const import (
     DOMAIN,
     ENTITY_BUTTON_KEY,
     ENTITY_BUTTON_TRANSLATION_KEY,
-    SIGNAL_SENSOR_STATE_CHANGE,
+    SIGNAL_MAINTENANCE_REQUESTED,
+    MaintenanceAction,
+    MaintenanceSource,
 )
 from .device_binding import get_device_info
+from .event_queue import MaintenanceEvent
 from .logics import MaintenanceLogic
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,7 +38,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         logic.logic_type
     )
     async_add_entities([
-        ResetMaintenanceButtonEntity(hass, logic, entry.unique_id, source_entity),
+        ResetMaintenanceButtonEntity(hass, logic, entry.entry_id, entry.unique_id, source_entity),
     ])
 
 
@@ -49,11 +53,13 @@ class ResetMaintenanceButtonEntity(ButtonEntity):
     def __init__(self,
                  hass: HomeAssistant,
                  logic: MaintenanceLogic,
+                 entry_id: str,
                  unique_id: str,
                  source_entity: SourceEntity | None):
         """Initialize the button entity.
 
         :param logic: The maintenance logic to be used.
+        :param entry_id: The identifier of the config entry of the logic.
         """
         self.entity_description = MaintenanceButtonEntityDescription(
             key=ENTITY_BUTTON_KEY,
@@ -74,12 +80,14 @@ class ResetMaintenanceButtonEntity(ButtonEntity):
         )
 
         self._logic = logic
+        self._entry_id = entry_id
 
     async def async_press(self) -> None:
         """Handle the press of the button."""
-        # Reset the device maintenance monitor metrics
-        self._logic.reset()
-        self.async_write_ha_state()
-
-        # Notify all sensors to update its state
-        async_dispatcher_send(self.hass, SIGNAL_SENSOR_STATE_CHANGE)
+        # Reset the device maintenance monitor metrics in the queue of the binary sensor, after the pending events
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_MAINTENANCE_REQUESTED,
+            self._entry_id,
+            MaintenanceEvent(MaintenanceAction.RESET, MaintenanceSource.BUTTON, None, dt_util.utcnow()),
+        )
@@ -0,0 +1,119 @@
+"""The calendar of the predicted maintenance dates for the Device Maintenance Monitor integration."""
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    ENTITY_CALENDAR_KEY,
+    ENTITY_CALENDAR_TRANSLATION_KEY,
+    SIGNAL_DUE_DATES_CHANGED,
+)
+from .due_dates import DueDateTracker, async_get_due_date_tracker
+
+_LOGGER = logging.getLogger(__name__)
+
+MAINTENANCE_CALENDAR = EntityDescription(
+    key=ENTITY_CALENDAR_KEY,
+    has_entity_name=True,
+    translation_key=ENTITY_CALENDAR_TRANSLATION_KEY,
+)
+
+
+async def async_setup_platform(
+        hass: HomeAssistant,
+        config: ConfigType,
+        async_add_entities: AddEntitiesCallback,
+        discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the calendar shared by all the monitors, loaded by the integration setup."""
+    if discovery_info is None:
+        return
+    async_add_entities([MaintenanceCalendarEntity(async_get_due_date_tracker(hass))])
+
+
+class MaintenanceCalendarEntity(CalendarEntity):
+    """A class that represents a calendar with an all day event for the due date of every monitor."""
+
+    def __init__(self, tracker: DueDateTracker):
+        """Initialize the calendar entity.
+
+        :param tracker: The tracker of the due dates of the monitors.
+        """
+        self.entity_description = MAINTENANCE_CALENDAR
+        self._attr_unique_id = f"{DOMAIN}_{ENTITY_CALENDAR_KEY}"
+        self._tracker = tracker
+        self._event: CalendarEvent | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added to hass."""
+        self._event = self._get_next_event()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DUE_DATES_CHANGED,
+                self._async_refresh_event,
+            )
+        )
+        # Today's events move to the past at midnight
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._async_refresh_event, hour=0, minute=0, second=0)
+        )
+
+    @callback
+    def _async_refresh_event(self, *_) -> None:
+        """Write the state when the next event has changed."""
+        event = self._get_next_event()
+        if event != self._event:
+            self._event = event
+            self.async_write_ha_state()
+
+    def _build_event(self, due_date: datetime, entry_id: str) -> CalendarEvent | None:
+        """Build the all day event of a monitor."""
+        logic = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if logic is None:
+            return None
+        start = dt_util.as_local(due_date).date()
+        return CalendarEvent(
+            start=start,
+            end=start + timedelta(days=1),
+            summary=f"{logic.name} maintenance",
+            uid=entry_id,
+        )
+
+    def _get_next_event(self) -> CalendarEvent | None:
+        """Return the next event, which is today's earliest event when there is one."""
+        start_of_today = dt_util.start_of_local_day()
+        for due_date, entry_id in self._tracker.index.first(1, dt_util.as_utc(start_of_today)):
+            return self._build_event(due_date, entry_id)
+        return None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next event."""
+        return self._event
+
+    async def async_get_events(
+            self,
+            hass: HomeAssistant,
+            start_date: datetime,
+            end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return the events overlapping the given range, read from the sorted index."""
+        # An all day event starts at the local midnight before its due date, and ends at the next local midnight
+        start = dt_util.as_utc(dt_util.start_of_local_day(dt_util.as_local(start_date)))
+        last_day = dt_util.start_of_local_day(dt_util.as_local(end_date - timedelta(microseconds=1)))
+        end = dt_util.as_utc(last_day + timedelta(days=1))
+        events = []
+        for due_date, entry_id in self._tracker.index.range(start, end):
+            if event := self._build_event(due_date, entry_id):
+                events.append(event)
+        return events
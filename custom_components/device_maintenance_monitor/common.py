@@ -2,16 +2,26 @@
 import logging
 from typing import NamedTuple
 
-from homeassistant.components.light import ATTR_SUPPORTED_COLOR_MODES, ColorMode
-from homeassistant.core import HomeAssistant, callback, split_entity_id
+from homeassistant.core import Event, HomeAssistant, callback, split_entity_id
 import homeassistant.helpers.device_registry as dr
-from homeassistant.helpers.entity import async_generate_entity_id
+from homeassistant.helpers.entity import async_generate_entity_id, get_capability
 import homeassistant.helpers.entity_registry as er
 
-from .const import DOMAIN
+from .const import (
+    DATA_CAPABILITY_CACHE,
+    DEFAULT_STATE_OPTIONS,
+    DOMAIN,
+    ENTITY_BINARY_SENSOR_KEY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# The attribute of the light component, spelled out to avoid importing it
+ATTR_SUPPORTED_COLOR_MODES = "supported_color_modes"
+
+# The capabilities listing the possible states of an entity, in order of preference
+STATE_OPTIONS_CAPABILITIES = ("hvac_modes", "options")
+
 
 class SourceEntity(NamedTuple):
     """A class that represents the source entity of the device."""
@@ -21,7 +31,7 @@ class SourceEntity(NamedTuple):
     domain: str
     unique_id: str | None = None
     name: str | None = None
-    supported_color_modes: list[ColorMode] | None = None
+    supported_color_modes: list[str] | None = None
     entity_entry: er.RegistryEntry | None = None
     device_entry: dr.DeviceEntry | None = None
 
@@ -41,7 +51,7 @@ async def create_source_entity(entity_id: str, hass: HomeAssistant) -> SourceEnt
     )
 
     unique_id = None
-    supported_color_modes: list[ColorMode] = []
+    supported_color_modes: list[str] = []
     if entity_entry:
         source_entity_domain = entity_entry.domain
         unique_id = entity_entry.unique_id
@@ -139,3 +149,80 @@ def generate_sensor_entity_id(
         f"{object_id}_{suffix}",
         hass=hass,
     )
+
+
+def generate_monitor_unique_id(entity_id: str, unique_id: str | None = None) -> str:
+    """Generate the unique_id of the config entry monitoring a source entity.
+
+    :param entity_id: The entity_id of the source entity.
+    :param unique_id: The unique identifier of the source entity in the entity registry.
+    :return: The unique_id of the config entry.
+    """
+    return f"mm_{unique_id or entity_id.replace('.', '_')}"
+
+
+@callback
+def get_maintenance_needed_entity_id(hass: HomeAssistant, entry_id: str) -> str | None:
+    """Get the entity_id of the maintenance needed binary sensor of a monitor.
+
+    :param hass: The Home Assistant instance.
+    :param entry_id: The identifier of the config entry of the monitor.
+    :return: The entity_id of the binary sensor, or None if it is not registered.
+    """
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.unique_id is None:
+        return None
+    return get_entity_id_by_unique_id(hass, "binary_sensor", f"{entry.unique_id}_{ENTITY_BINARY_SENSOR_KEY}")
+
+
+@callback
+def _get_capability_cache(hass: HomeAssistant) -> dict[str, list[str]]:
+    """Get the cache of the state options of the entities, dropping an entity whenever its registry entry changes."""
+    if (cache := hass.data.get(DATA_CAPABILITY_CACHE)) is not None:
+        return cache
+
+    cache = hass.data[DATA_CAPABILITY_CACHE] = {}
+
+    @callback
+    def entity_registry_updated_listener(event: Event) -> None:
+        cache.pop(event.data["entity_id"], None)
+        if old_entity_id := event.data.get("old_entity_id"):
+            cache.pop(old_entity_id, None)
+
+    hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, entity_registry_updated_listener)
+    return cache
+
+
+@callback
+def get_state_options(
+        hass: HomeAssistant,
+        entity_id: str,
+        entity_entry: er.RegistryEntry | None = None,
+) -> list[str]:
+    """Get the possible states of an entity, cached per registered entity.
+
+    :param hass: The Home Assistant instance.
+    :param entity_id: The entity_id of the entity.
+    :param entity_entry: The registry entry of the entity, looked up when omitted.
+    :return: The possible states of the entity.
+    """
+    cache = _get_capability_cache(hass)
+    if (options := cache.get(entity_id)) is not None:
+        return options
+
+    if entity_entry is None:
+        entity_entry = er.async_get(hass).async_get(entity_id)
+    if entity_entry is None:
+        # Without a registry entry the capabilities come from the state, which is not tracked by the cache
+        for capability in STATE_OPTIONS_CAPABILITIES:
+            if options := get_capability(hass, entity_id, capability):
+                return list(options)
+        return DEFAULT_STATE_OPTIONS
+
+    capabilities = entity_entry.capabilities or {}
+    options = next(
+        (list(capabilities[capability]) for capability in STATE_OPTIONS_CAPABILITIES if capabilities.get(capability)),
+        DEFAULT_STATE_OPTIONS,
+    )
+    cache[entity_id] = options
+    return options
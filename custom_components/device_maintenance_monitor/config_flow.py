@@ -1,4 +1,5 @@
 """Config flow for Device Maintenance Monitor integration."""
+import asyncio
 import copy
 import logging
 from typing import Any
@@ -8,25 +9,49 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry, FlowResult, OptionsFlow
 from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers import config_validation as cv, selector
-from homeassistant.helpers.entity import get_capability
 from homeassistant.helpers.typing import ConfigType
 
-from .common import SourceEntity, create_source_entity
+from .common import (
+    SourceEntity,
+    create_source_entity,
+    generate_monitor_unique_id,
+    get_state_options,
+)
 from .const import (
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_AGGREGATE_MIN_ON,
+    CONF_AGGREGATE_MODE,
+    CONF_ANOMALY_Z_SCORE,
+    CONF_AREA_IDS,
+    CONF_CONSUMPTION,
     CONF_COUNT,
+    CONF_DISCOVERED_ENTITY_IDS,
+    CONF_ENERGY,
     CONF_ENTITY_ID,
+    CONF_FORECAST_MODE,
+    CONF_IDLE_TIMEOUT,
     CONF_INTERVAL,
     CONF_IS_ON_TEMPLATE,
+    CONF_LOAD_ATTRIBUTE,
+    CONF_LOAD_ENTITY_ID,
+    CONF_LOAD_FULL_SCALE,
+    CONF_MAX_DELTA,
     CONF_MAX_INTERVAL,
+    CONF_MIN_CYCLE_LENGTH,
     CONF_MIN_INTERVAL,
     CONF_NAME,
     CONF_ON_STATES,
     CONF_SENSOR_TYPE,
+    CONF_START_THRESHOLD,
     CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
     DOMAIN,
+    AggregateMode,
+    ForecastMode,
     SensorType,
 )
+from .discovery import DiscoveryCandidate, async_discover_candidates
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +59,22 @@ SENSOR_TYPE_MENU = {
     SensorType.RUNTIME: "Runtime",
     SensorType.COUNT: "Power On Count",
     SensorType.FIXED_INTERVAL: "Fixed Interval",
+    SensorType.POWER: "Energy Consumption",
+    SensorType.METER: "Meter Consumption",
+    SensorType.CYCLE: "Cycle Count",
+}
+
+STEP_DISCOVER_DEVICES = "discover_devices"
+
+USER_MENU = {
+    **SENSOR_TYPE_MENU,
+    STEP_DISCOVER_DEVICES: "Discover Devices",
+}
+
+SENSOR_TYPES_WITH_ON_STATES = {
+    SensorType.RUNTIME,
+    SensorType.COUNT,
+    SensorType.CYCLE,
 }
 
 CONFIG_SCHEMA = {
@@ -45,6 +86,95 @@ OPTIONS_SCHEMA = {
     vol.Optional(CONF_NAME): selector.TextSelector(),
 }
 
+SCHEMA_DISCOVERY = {
+    vol.Optional(CONF_AREA_IDS): selector.AreaSelector(
+        selector.AreaSelectorConfig(
+            multiple=True,
+        ),
+    ),
+}
+
+# The defaults shared by all the monitors created from the discovered devices
+SCHEMA_DISCOVERY_DEFAULTS = {
+    vol.Optional(CONF_INTERVAL): selector.DurationSelector(),
+    vol.Optional(CONF_ENERGY): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            step="any",
+            unit_of_measurement="kWh",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(CONF_MIN_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    vol.Optional(CONF_MAX_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    vol.Optional(CONFIG_INITIAL_LAST_MAINTENANCE_DATE): selector.DateSelector(),
+}
+
+# The shared defaults used by every discovered sensor type
+DISCOVERY_DEFAULTS_BY_SENSOR_TYPE = {
+    SensorType.RUNTIME: (CONF_INTERVAL, CONF_MIN_INTERVAL, CONF_MAX_INTERVAL, CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+    SensorType.POWER: (CONF_ENERGY, CONF_MIN_INTERVAL, CONF_MAX_INTERVAL, CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+}
+
+SCHEMA_AGGREGATE = {
+    vol.Optional(CONF_ADDITIONAL_ENTITY_IDS): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            multiple=True,
+        ),
+    ),
+    vol.Optional(CONF_AGGREGATE_MODE): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[mode.value for mode in AggregateMode],
+            translation_key=CONF_AGGREGATE_MODE,
+        ),
+    ),
+    vol.Optional(CONF_AGGREGATE_MIN_ON): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+}
+
+SCHEMA_FORECAST = {
+    vol.Optional(CONF_FORECAST_MODE): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[mode.value for mode in ForecastMode],
+            translation_key=CONF_FORECAST_MODE,
+        ),
+    ),
+}
+
+SCHEMA_ANOMALY = {
+    vol.Optional(CONF_ANOMALY_Z_SCORE): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            step="any",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+}
+
+SCHEMA_LOAD = {
+    vol.Optional(CONF_LOAD_ENTITY_ID): selector.EntitySelector(),
+    vol.Optional(CONF_LOAD_ATTRIBUTE): selector.TextSelector(),
+    vol.Optional(CONF_LOAD_FULL_SCALE): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            step="any",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+}
+
 SCHEMA_RUNTIME = {
     vol.Required(CONF_ENTITY_ID): selector.EntitySelector(),
     vol.Required(CONF_INTERVAL): selector.DurationSelector(),
@@ -59,6 +189,10 @@ SCHEMA_RUNTIME = {
         ),
     ),
     vol.Optional(CONF_IS_ON_TEMPLATE): selector.TemplateSelector(),
+    **SCHEMA_AGGREGATE,
+    **SCHEMA_LOAD,
+    **SCHEMA_FORECAST,
+    **SCHEMA_ANOMALY,
 }
 
 SCHEMA_COUNT = {
@@ -70,6 +204,9 @@ SCHEMA_COUNT = {
         ),
     ),
     vol.Optional(CONF_IS_ON_TEMPLATE): selector.TemplateSelector(),
+    **SCHEMA_AGGREGATE,
+    **SCHEMA_FORECAST,
+    **SCHEMA_ANOMALY,
 }
 
 SCHEMA_FIXED_INTERVAL = {
@@ -81,6 +218,101 @@ SCHEMA_FIXED_INTERVAL = {
     ),
 }
 
+SCHEMA_POWER = {
+    vol.Required(CONF_ENTITY_ID): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="sensor",
+            device_class="power",
+        ),
+    ),
+    vol.Required(CONF_ENERGY): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            step="any",
+            unit_of_measurement="kWh",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(CONF_MIN_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    vol.Optional(CONF_MAX_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    **SCHEMA_FORECAST,
+}
+
+SCHEMA_METER = {
+    vol.Required(CONF_ENTITY_ID): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=["sensor", "counter", "input_number"],
+        ),
+    ),
+    vol.Required(CONF_CONSUMPTION): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            step="any",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(CONF_MAX_DELTA): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            step="any",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(CONF_MIN_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    vol.Optional(CONF_MAX_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    **SCHEMA_FORECAST,
+}
+
+SCHEMA_CYCLE = {
+    vol.Required(CONF_ENTITY_ID): selector.EntitySelector(),
+    vol.Required(CONF_COUNT): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(CONF_START_THRESHOLD): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            step="any",
+            unit_of_measurement="W",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(CONF_MIN_CYCLE_LENGTH): selector.DurationSelector(),
+    vol.Optional(CONF_IDLE_TIMEOUT): selector.DurationSelector(),
+    vol.Optional(CONF_MIN_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    vol.Optional(CONF_MAX_INTERVAL): selector.DurationSelector(
+        selector.DurationSelectorConfig(
+            enable_day=True,
+        ),
+    ),
+    vol.Optional(CONF_IS_ON_TEMPLATE): selector.TemplateSelector(),
+    **SCHEMA_AGGREGATE,
+    **SCHEMA_FORECAST,
+    **SCHEMA_ANOMALY,
+}
+
 
 def _get_schema_by_sensor_type(sensor_type: SensorType) -> dict:
     if sensor_type == SensorType.RUNTIME:
@@ -92,6 +324,15 @@ def _get_schema_by_sensor_type(sensor_type: SensorType) -> dict:
     if sensor_type == SensorType.FIXED_INTERVAL:
         return SCHEMA_FIXED_INTERVAL
 
+    if sensor_type == SensorType.POWER:
+        return SCHEMA_POWER
+
+    if sensor_type == SensorType.METER:
+        return SCHEMA_METER
+
+    if sensor_type == SensorType.CYCLE:
+        return SCHEMA_CYCLE
+
     raise NotImplementedError(f"Sensor type {sensor_type} is not implemented")
 
 
@@ -104,12 +345,35 @@ def _validate_min_and_max_interval(user_input: dict) -> bool:
     return cv.time_period_dict(min_interval) <= cv.time_period_dict(max_interval)
 
 
+def _validate_positive(user_input: dict, key: str) -> bool:
+    """Validate that the number under the given key is greater than 0, when it is set."""
+    value = user_input.get(key)
+    return value is None or value > 0
+
+
+def _validate_positive_duration(user_input: dict, key: str) -> bool:
+    """Validate that the duration under the given key is longer than 0, when it is set."""
+    duration = user_input.get(key)
+    return not duration or cv.time_period_dict(duration).total_seconds() > 0
+
+
+def _validate_aggregate_min_on(user_input: dict) -> bool:
+    """Validate that the minimum number of sources on does not exceed the number of source entities."""
+    min_on = user_input.get(CONF_AGGREGATE_MIN_ON)
+    if not min_on or user_input.get(CONF_AGGREGATE_MODE) != AggregateMode.AT_LEAST:
+        return True
+    source_entity_ids = {user_input.get(CONF_ENTITY_ID), *user_input.get(CONF_ADDITIONAL_ENTITY_IDS, [])}
+    return min_on <= len(source_entity_ids)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Device Maintenance Monitor."""
 
     VERSION = 1
     MINOR_VERSION = 1
 
+    _discovered_candidates: dict[str, DiscoveryCandidate]  # The devices found by the discovery step
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
@@ -121,7 +385,68 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             user_input: dict[str, Any] | None = None,
     ) -> FlowResult:
         """Handle the initial step."""
-        return self.async_show_menu(step_id="user", menu_options=SENSOR_TYPE_MENU)
+        return self.async_show_menu(step_id="user", menu_options=USER_MENU)
+
+    async def async_step_discover_devices(
+            self,
+            user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle the choice of the areas to discover."""
+        if user_input is not None:
+            self._discovered_candidates = {
+                candidate.entity_id: candidate
+                for candidate in async_discover_candidates(
+                    self.hass,
+                    user_input.get(CONF_AREA_IDS),
+                    self._async_current_ids(),
+                )
+            }
+            if not self._discovered_candidates:
+                return self.async_abort(reason="no_devices_found")
+            return await self.async_step_discover_devices_select()
+
+        return self.async_show_form(
+            step_id=STEP_DISCOVER_DEVICES,
+            data_schema=vol.Schema(SCHEMA_DISCOVERY),
+        )
+
+    async def async_step_discover_devices_select(
+            self,
+            user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle the selection of the discovered devices and their shared defaults."""
+        errors = {}
+        if user_input is not None:
+            selected_candidates = [
+                self._discovered_candidates[entity_id]
+                for entity_id in user_input.get(CONF_DISCOVERED_ENTITY_IDS, [])
+                if entity_id in self._discovered_candidates
+            ]
+            selected_sensor_types = {candidate.sensor_type for candidate in selected_candidates}
+            if not selected_candidates:
+                errors[CONF_DISCOVERED_ENTITY_IDS] = "Select at least one device"
+            if SensorType.RUNTIME in selected_sensor_types and not user_input.get(CONF_INTERVAL):
+                errors[CONF_INTERVAL] = "Interval is required to monitor the runtime of the selected devices"
+            if SensorType.POWER in selected_sensor_types and not user_input.get(CONF_ENERGY):
+                errors[CONF_ENERGY] = "Energy is required to monitor the consumption of the selected devices"
+            if not _validate_min_and_max_interval(user_input):
+                errors[CONF_MIN_INTERVAL] = "Minimum interval must be less than or equal to maximum interval"
+
+            if not errors:
+                return await self.create_discovered_config_entries(selected_candidates, user_input)
+
+        return self.async_show_form(
+            step_id="discover_devices_select",
+            data_schema=self._build_discover_devices_select_schema(),
+            errors=errors,
+            last_step=True,
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create a config entry for a device selected in the discovery step."""
+        entry_config = dict(import_data)
+        sensor_type = SensorType(entry_config.pop(CONF_SENSOR_TYPE))
+        return await self.create_config_entry(sensor_type, entry_config)
 
     async def async_step_runtime(
             self,
@@ -132,6 +457,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             if not _validate_min_and_max_interval(user_input):
                 errors[CONF_MIN_INTERVAL] = "Minimum interval must be less than or equal to maximum interval"
+            if not _validate_aggregate_min_on(user_input):
+                errors[CONF_AGGREGATE_MIN_ON] = "Minimum sources on must not exceed the number of source entities"
 
             if not errors:
                 return await self.create_config_entry(SensorType.RUNTIME, user_input)
@@ -150,6 +477,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the power on count logic configuration."""
         errors = {}  # TODO: validate user input
         if user_input is not None:
+            if not _validate_aggregate_min_on(user_input):
+                errors[CONF_AGGREGATE_MIN_ON] = "Minimum sources on must not exceed the number of source entities"
+
             if not errors:
                 return await self.create_config_entry(SensorType.COUNT, user_input)
 
@@ -179,6 +509,156 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             last_step=True,
         )
 
+    async def async_step_power(
+            self,
+            user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle the energy consumption logic configuration."""
+        errors = {}
+        if user_input is not None:
+            if not _validate_positive(user_input, CONF_ENERGY):
+                errors[CONF_ENERGY] = "Energy must be greater than 0"
+            if not _validate_min_and_max_interval(user_input):
+                errors[CONF_MIN_INTERVAL] = "Minimum interval must be less than or equal to maximum interval"
+
+            if not errors:
+                return await self.create_config_entry(SensorType.POWER, user_input)
+
+        return self.async_show_form(
+            step_id="power",
+            data_schema=self._build_setup_schema(SensorType.POWER),
+            errors=errors,
+            last_step=True,
+        )
+
+    async def async_step_meter(
+            self,
+            user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle the meter consumption logic configuration."""
+        errors = {}
+        if user_input is not None:
+            if not _validate_positive(user_input, CONF_CONSUMPTION):
+                errors[CONF_CONSUMPTION] = "Consumption must be greater than 0"
+            if not _validate_positive(user_input, CONF_MAX_DELTA):
+                errors[CONF_MAX_DELTA] = "Maximum delta must be greater than 0"
+            if not _validate_min_and_max_interval(user_input):
+                errors[CONF_MIN_INTERVAL] = "Minimum interval must be less than or equal to maximum interval"
+
+            if not errors:
+                return await self.create_config_entry(SensorType.METER, user_input)
+
+        return self.async_show_form(
+            step_id="meter",
+            data_schema=self._build_setup_schema(SensorType.METER),
+            errors=errors,
+            last_step=True,
+        )
+
+    async def async_step_cycle(
+            self,
+            user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle the cycle count logic configuration."""
+        errors = {}
+        if user_input is not None:
+            if not _validate_positive(user_input, CONF_START_THRESHOLD):
+                errors[CONF_START_THRESHOLD] = "Start threshold must be greater than 0"
+            if not _validate_positive_duration(user_input, CONF_MIN_CYCLE_LENGTH):
+                errors[CONF_MIN_CYCLE_LENGTH] = "Minimum cycle length must be longer than 0"
+            if not _validate_min_and_max_interval(user_input):
+                errors[CONF_MIN_INTERVAL] = "Minimum interval must be less than or equal to maximum interval"
+            if not _validate_aggregate_min_on(user_input):
+                errors[CONF_AGGREGATE_MIN_ON] = "Minimum sources on must not exceed the number of source entities"
+
+            if not errors:
+                return await self.create_config_entry(SensorType.CYCLE, user_input)
+
+        return self.async_show_form(
+            step_id="cycle",
+            data_schema=self._build_setup_schema(SensorType.CYCLE),
+            errors=errors,
+            last_step=True,
+        )
+
+    def _build_discover_devices_select_schema(self) -> vol.Schema:
+        options = [
+            selector.SelectOptionDict(
+                value=candidate.entity_id,
+                label=f"{candidate.name} ({SENSOR_TYPE_MENU[candidate.sensor_type]})",
+            )
+            for candidate in self._discovered_candidates.values()
+        ]
+        return vol.Schema(
+            {
+                vol.Required(
+                    CONF_DISCOVERED_ENTITY_IDS,
+                    default=list(self._discovered_candidates),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    ),
+                ),
+                **SCHEMA_DISCOVERY_DEFAULTS,
+            }
+        )
+
+    async def create_discovered_config_entries(
+            self,
+            candidates: list[DiscoveryCandidate],
+            user_input: dict[str, Any],
+    ) -> FlowResult:
+        """Create a config entry for every selected device with the shared defaults.
+
+        A flow creates a single entry, so the other entries are created by import flows. The import flows are awaited
+        before the first entry is created, so the result reports how many monitors were created and skipped.
+        """
+        entries_config = []
+        for candidate in candidates:
+            entry_config: ConfigType = {
+                key: user_input[key]
+                for key in DISCOVERY_DEFAULTS_BY_SENSOR_TYPE[candidate.sensor_type]
+                if key in user_input
+            }
+            entry_config[CONF_ENTITY_ID] = candidate.entity_id
+            entries_config.append((candidate.sensor_type, entry_config))
+
+        first_sensor_type, first_entry_config = entries_config[0]
+        results = await asyncio.gather(
+            *(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_IMPORT},
+                    data={CONF_SENSOR_TYPE: sensor_type, **entry_config},
+                )
+                for sensor_type, entry_config in entries_config[1:]
+            ),
+            return_exceptions=True,
+        )
+        created = 1
+        for (_, entry_config), result in zip(entries_config[1:], results, strict=True):
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "Error creating the monitor of discovered device '%s'",
+                    entry_config[CONF_ENTITY_ID],
+                    exc_info=result,
+                )
+            elif result["type"] == FlowResultType.CREATE_ENTRY:
+                created += 1
+            else:
+                _LOGGER.warning(
+                    "Skipped the monitor of discovered device '%s': %s",
+                    entry_config[CONF_ENTITY_ID],
+                    result.get("reason"),
+                )
+        return await self.create_config_entry(
+            first_sensor_type,
+            first_entry_config,
+            description_placeholders={"created": str(created), "skipped": str(len(entries_config) - created)},
+        )
+
     @staticmethod
     def _build_setup_schema(sensor_type: SensorType):
         schema = vol.Schema(CONFIG_SCHEMA)
@@ -189,8 +669,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self,
             selected_sensor_type: SensorType,
             user_input: dict[str, Any] | None = None,
+            description_placeholders: dict[str, str] | None = None,
     ) -> FlowResult:
-        """Create the config entry."""
+        """Create the config entry.
+
+        :param description_placeholders: The number of monitors created and skipped, when devices were discovered.
+        """
         source_entity_id = user_input.get(CONF_ENTITY_ID)
 
         entry_config: ConfigType = copy.copy(user_input)
@@ -202,8 +686,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self.hass,
             )
             name = user_input.get(CONF_NAME, f"{source_entity.name} Maintenance Monitor")
-            source_unique_id = source_entity.unique_id or (source_entity_id.replace(".", "_"))
-            await self.async_set_unique_id(f"mm_{source_unique_id}")
+            await self.async_set_unique_id(generate_monitor_unique_id(source_entity_id, source_entity.unique_id))
         else:
             name = user_input.get(CONF_NAME)
             if not name:
@@ -218,6 +701,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_NAME: name,
             }
         )
+        if description_placeholders is not None:
+            return self.async_create_entry(
+                title=str(name),
+                data=entry_config,
+                description="discovered_devices",
+                description_placeholders=description_placeholders,
+            )
         return self.async_create_entry(title=str(name), data=entry_config)
 
 
@@ -269,8 +759,20 @@ class OptionsFlowHandler(OptionsFlow):
             self.current_config[CONF_ENTITY_ID] = user_input[CONF_ENTITY_ID]
 
         errors = {}
+        if not _validate_positive(user_input, CONF_ENERGY):
+            errors[CONF_ENERGY] = "Energy must be greater than 0"
+        if not _validate_positive(user_input, CONF_CONSUMPTION):
+            errors[CONF_CONSUMPTION] = "Consumption must be greater than 0"
+        if not _validate_positive(user_input, CONF_MAX_DELTA):
+            errors[CONF_MAX_DELTA] = "Maximum delta must be greater than 0"
+        if not _validate_positive(user_input, CONF_START_THRESHOLD):
+            errors[CONF_START_THRESHOLD] = "Start threshold must be greater than 0"
+        if not _validate_positive_duration(user_input, CONF_MIN_CYCLE_LENGTH):
+            errors[CONF_MIN_CYCLE_LENGTH] = "Minimum cycle length must be longer than 0"
         if not _validate_min_and_max_interval(user_input):
             errors[CONF_MIN_INTERVAL] = "Minimum interval must be less than or equal to maximum interval"
+        if not _validate_aggregate_min_on(self.current_config):
+            errors[CONF_AGGREGATE_MIN_ON] = "Minimum sources on must not exceed the number of source entities"
 
         if errors:
             return errors
@@ -304,7 +806,7 @@ class OptionsFlowHandler(OptionsFlow):
         schema = vol.Schema(OPTIONS_SCHEMA)
         data_schema = schema.extend(_get_schema_by_sensor_type(self.sensor_type))
 
-        if self.source_entity_id:
+        if self.source_entity_id and self.sensor_type in SENSOR_TYPES_WITH_ON_STATES:
             # Get the optional states of the source entity
             options = self._get_source_entity_state_options()
             data_schema = data_schema.extend(
@@ -324,12 +826,7 @@ class OptionsFlowHandler(OptionsFlow):
 
     def _get_source_entity_state_options(self) -> list[str]:
         """Get the state options of the source entity."""
-        for capability in ["hvac_modes", "options"]:
-            capabilities = get_capability(self.hass, self.source_entity_id, capability)
-            if capabilities:
-                return capabilities
-
-        return ["on", "off"]
+        return get_state_options(self.hass, self.source_entity_id)
 
 
 def _fill_schema_defaults(
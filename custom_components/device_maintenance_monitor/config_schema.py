@@ -0,0 +1,17 @@
+"""Defines the YAML configuration schema of the integration, kept apart so the package imports without Home Assistant."""
+import voluptuous as vol
+
+import homeassistant.helpers.config_validation as cv
+
+from .const import CONF_DIGEST_WINDOW, DOMAIN
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(CONF_DIGEST_WINDOW): cv.positive_time_period,
+            }
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
@@ -3,58 +3,141 @@ from datetime import timedelta
 from enum import StrEnum
 from typing import Final
 
-from homeassistant.components.climate import HVACMode
-
 DOMAIN: Final = "device_maintenance_monitor"
 
 # Configuration
 CONF_SENSOR_TYPE: Final = "sensor_type"
 CONF_ENTITY_ID: Final = "entity_id"
+CONF_ADDITIONAL_ENTITY_IDS: Final = "additional_entity_ids"
+CONF_AGGREGATE_MODE: Final = "aggregate_mode"
+CONF_AGGREGATE_MIN_ON: Final = "aggregate_min_on"
 CONF_COUNT: Final = "count"
+CONF_ENERGY: Final = "energy"
+CONF_CONSUMPTION: Final = "consumption"
+CONF_MAX_DELTA: Final = "max_delta"
 CONF_INTERVAL: Final = "interval"
 CONF_NAME: Final = "name"
 CONF_ON_STATES: Final = "on_states"
+# The HVAC modes are spelled out to avoid importing the climate component
 DEFAULT_ON_STATES: Final = [
     "on",
-    HVACMode.DRY,
-    HVACMode.COOL,
-    HVACMode.HEAT_COOL,
-    HVACMode.HEAT,
+    "dry",
+    "cool",
+    "heat_cool",
+    "heat",
 ]  # TODO: Based on the device type
 CONF_IS_ON_TEMPLATE: Final = "is_on_template"
 CONF_MIN_INTERVAL: Final = "min_interval"
 CONF_MAX_INTERVAL: Final = "max_interval"
 CONFIG_INITIAL_LAST_MAINTENANCE_DATE: Final = "initial_last_maintenance_date"
+CONF_AREA_IDS: Final = "area_ids"
+CONF_DISCOVERED_ENTITY_IDS: Final = "discovered_entity_ids"
+CONF_DIGEST_WINDOW: Final = "digest_window"
+CONF_FORECAST_MODE: Final = "forecast_mode"
+CONF_ANOMALY_Z_SCORE: Final = "anomaly_z_score"
+CONF_START_THRESHOLD: Final = "start_threshold"
+CONF_MIN_CYCLE_LENGTH: Final = "min_cycle_length"
+CONF_IDLE_TIMEOUT: Final = "idle_timeout"
+CONF_LOAD_ENTITY_ID: Final = "load_entity_id"
+CONF_LOAD_ATTRIBUTE: Final = "load_attribute"
+CONF_LOAD_FULL_SCALE: Final = "load_full_scale"
 
 # Events
 SIGNAL_SENSOR_STATE_CHANGE: Final = "device_maintenance_monitor_sensor_state_change"
+SIGNAL_MONITOR_UPDATED: Final = "device_maintenance_monitor_monitor_updated"  # Sent with the entry_id of the monitor
+SIGNAL_DUE_DATES_CHANGED: Final = "device_maintenance_monitor_due_dates_changed"
+SIGNAL_MONITOR_RECONFIGURED: Final = "device_maintenance_monitor_monitor_reconfigured"  # Sent with the entry_id
+# Sent with the entry_id of the monitor and the maintenance event to queue
+SIGNAL_MAINTENANCE_REQUESTED: Final = "device_maintenance_monitor_maintenance_requested"
+EVENT_MAINTENANCE_DUE: Final = f"{DOMAIN}_maintenance_due"
+EVENT_MAINTENANCE_DUE_DIGEST: Final = f"{DOMAIN}_maintenance_due_digest"
 
 # States
 STATE_LAST_MAINTENANCE_DATE: Final = "last_maintenance_date"
 STATE_LAST_RESET_DATE: Final = "last_reset_date"
+STATE_LAST_RESET_TIME: Final = "last_reset_time"
 STATE_PREDICTED_MAINTENANCE_DATE: Final = "predicted_maintenance_date"
 STATE_DEVICE_TURN_ON_COUNT: Final = "device_turn_on_count"
 STATE_RUNTIME_DURATION: Final = "runtime_duration"
+STATE_ENERGY_CONSUMED: Final = "energy_consumed"
+STATE_METER_CONSUMED: Final = "meter_consumed"
+STATE_METER_LAST_VALUE: Final = "meter_last_value"
+STATE_RUNTIME_REMAINING: Final = "runtime_remaining"
+STATE_DEVICE_TURN_ON_REMAINING: Final = "device_turn_on_remaining"
+STATE_ENERGY_REMAINING: Final = "energy_remaining"
+STATE_METER_REMAINING: Final = "meter_remaining"
+STATE_DAILY_USAGE: Final = "daily_usage"
+STATE_HOURLY_USAGE: Final = "hourly_usage"
+STATE_RUNTIME_LAST_24_HOURS: Final = "runtime_last_24_hours"
+STATE_RUNTIME_LAST_7_DAYS: Final = "runtime_last_7_days"
+STATE_DEVICE_TURN_ONS_LAST_24_HOURS: Final = "device_turn_ons_last_24_hours"
+STATE_CYCLE_COUNT: Final = "cycle_count"
+STATE_CYCLE_REMAINING: Final = "cycle_remaining"
 
 # Services
 SERVICE_RESET_MAINTENANCE: Final = "reset_maintenance"
 SERVICE_UPDATE_MAINTENANCE_INFO: Final = "update_maintenance_info"
+SERVICE_GET_NEXT_MAINTENANCE: Final = "get_next_maintenance"
+SERVICE_GET_MAINTENANCE_HISTORY: Final = "get_maintenance_history"
+SERVICE_EXPORT_MONITORS: Final = "export_monitors"
+SERVICE_IMPORT_MONITORS: Final = "import_monitors"
 
 # Services fields
 SERVICE_RESET_MAINTENANCE_LAST_MAINTENANCE_DATE: Final = "last_maintenance_date"
+SERVICE_GET_NEXT_MAINTENANCE_COUNT: Final = "count"
+SERVICE_HISTORY_ENTITY_ID: Final = "entity_id"
+SERVICE_HISTORY_ACTION: Final = "action"
+SERVICE_HISTORY_SOURCE: Final = "source"
+SERVICE_HISTORY_START_TIME: Final = "start_time"
+SERVICE_HISTORY_END_TIME: Final = "end_time"
+SERVICE_HISTORY_OFFSET: Final = "offset"
+SERVICE_HISTORY_LIMIT: Final = "limit"
+SERVICE_TRANSFER_FILE_PATH: Final = "file_path"
+SERVICE_TRANSFER_RESTORE_CONFIG: Final = "restore_config"
+
+# Websocket commands
+WS_SUBSCRIBE_FLEET_STATUS: Final = f"{DOMAIN}/subscribe_fleet_status"
+WS_GET_MAINTENANCE_HISTORY: Final = f"{DOMAIN}/get_maintenance_history"
 
 # Entities
 ENTITY_BINARY_SENSOR_KEY: Final = "maintenance_needed"
 ENTITY_BINARY_SENSOR_TRANSLATION_KEY: Final = "maintenance_needed"
 ENTITY_BUTTON_KEY: Final = "reset_maintenance"
 ENTITY_BUTTON_TRANSLATION_KEY: Final = "reset_maintenance"
+ENTITY_CALENDAR_KEY: Final = "maintenance_calendar"
+ENTITY_CALENDAR_TRANSLATION_KEY: Final = "maintenance_calendar"
+ENTITY_NEXT_MAINTENANCE_DUE_KEY: Final = "next_maintenance_due"
+ENTITY_USAGE_ANOMALY_KEY: Final = "usage_anomaly"
 
 # Formats
 DATE_FORMAT: Final = "%Y-%m-%d"
 
+# Data
+DATA_CAPABILITY_CACHE: Final = f"{DOMAIN}_capability_cache"
+DATA_TEMPLATE_CACHE: Final = f"{DOMAIN}_template_cache"
+DATA_FLEET_STATUS: Final = f"{DOMAIN}_fleet_status"
+DATA_DUE_DATES: Final = f"{DOMAIN}_due_dates"
+DATA_MAINTENANCE_EVENTS: Final = f"{DOMAIN}_maintenance_events"
+DATA_MAINTENANCE_HISTORY: Final = f"{DOMAIN}_maintenance_history"
+
 # Other
 DEFAULT_FIXED_INTERVAL_UPDATE_FREQUENCY: Final = timedelta(minutes=10)
 DEFAULT_RUNTIME_UPDATE_FREQUENCY: Final = timedelta(minutes=1)
+DEFAULT_POWER_UPDATE_FREQUENCY: Final = timedelta(minutes=1)
+DEFAULT_POWER_MAX_SAMPLE_GAP: Final = timedelta(minutes=15)
+DEFAULT_STATE_OPTIONS: Final = ["on", "off"]
+DEFAULT_FLEET_STATUS_UPDATE_DELAY: Final = timedelta(seconds=1)
+DEFAULT_NEXT_MAINTENANCE_COUNT: Final = 5
+DEFAULT_FORECAST_REFIT_INTERVAL: Final = timedelta(days=1)
+DEFAULT_FORECAST_HISTORY: Final = timedelta(weeks=4)
+DEFAULT_ANOMALY_MIN_DAYS: Final = 7
+DEFAULT_CYCLE_IDLE_TIMEOUT: Final = timedelta(minutes=5)
+DEFAULT_LOAD_FULL_SCALE: Final = 100.0  # The load reported at full intensity, e.g. a fan percentage
+DEFAULT_HISTORY_MAX_SIZE: Final = 1024 * 1024  # The size of the history log file, in bytes
+DEFAULT_HISTORY_PAGE_SIZE: Final = 50
+MAX_HISTORY_PAGE_SIZE: Final = 500
+DEFAULT_TRANSFER_FILE: Final = f"{DOMAIN}.export.jsonl"  # Relative to the configuration folder
+DEFAULT_TRANSFER_CHUNK_SIZE: Final = 500  # The number of monitors written or read per executor job
 
 
 class SensorType(StrEnum):
@@ -63,3 +146,35 @@ class SensorType(StrEnum):
     RUNTIME = "runtime"
     COUNT = "count"
     FIXED_INTERVAL = "fixed_interval"
+    POWER = "power"
+    METER = "meter"
+    CYCLE = "cycle"
+
+
+class AggregateMode(StrEnum):
+    """Possible ways to combine the on state of several source entities."""
+
+    ANY = "any"
+    ALL = "all"
+    AT_LEAST = "at_least"
+
+
+class ForecastMode(StrEnum):
+    """Possible ways to predict the maintenance date from the usage."""
+
+    AVERAGE = "average"
+    HOUR_OF_WEEK = "hour_of_week"
+
+
+class MaintenanceAction(StrEnum):
+    """Possible changes of the maintenance of a monitor recorded in the history."""
+
+    RESET = "reset"
+    UPDATE = "update"
+
+
+class MaintenanceSource(StrEnum):
+    """Possible origins of a change of the maintenance of a monitor."""
+
+    BUTTON = "button"
+    SERVICE = "service"
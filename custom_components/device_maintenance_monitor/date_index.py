@@ -0,0 +1,140 @@
+"""Provides a sorted index of the maintenance dates of the monitors."""
+from bisect import bisect_left, insort
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import islice
+
+# The number of monitors a bucket holds before it is split, so the memmove of an update is bounded by the bucket size
+BUCKET_SIZE = 256
+
+DateEntry = tuple[datetime, str]
+
+
+class DateIndex:
+    """A class that keeps the monitors sorted by date.
+
+    The (date, entry_id) pairs are kept sorted in a list of buckets of at most BUCKET_SIZE pairs, with the last pair of
+    every bucket in a separate list. An update bisects the last pairs and moves pairs within a single bucket, so it
+    takes O(log n) with a memmove bounded by the bucket size, instead of moving half of a flat list. A range query
+    takes O(log n + k).
+    """
+
+    __slots__ = ("_dates", "_buckets", "_maxes", "_len")
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._dates: dict[str, datetime] = {}  # The date of every entry_id
+        self._buckets: list[list[DateEntry]] = []  # The (date, entry_id) pairs sorted by date, split in buckets
+        self._maxes: list[DateEntry] = []  # The last pair of every bucket
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of monitors in the index."""
+        return self._len
+
+    def get(self, entry_id: str) -> datetime | None:
+        """Return the date of a monitor.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        :return: The date of the monitor, or None if it is not indexed.
+        """
+        return self._dates.get(entry_id)
+
+    def update(self, entry_id: str, date: datetime | None) -> bool:
+        """Set the date of a monitor, removing it when the date is None.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        :param date: The new date of the monitor.
+        :return: True if the index has changed; otherwise, False.
+        """
+        previous_date = self._dates.get(entry_id)
+        if previous_date == date:
+            return False
+
+        if previous_date is not None:
+            self._remove((previous_date, entry_id))
+        if date is None:
+            del self._dates[entry_id]
+        else:
+            self._dates[entry_id] = date
+            self._insert((date, entry_id))
+        return True
+
+    def _insert(self, pair: DateEntry) -> None:
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([pair])
+            self._maxes.append(pair)
+            return
+
+        position = bisect_left(self._maxes, pair)
+        if position == len(self._buckets):
+            # After every pair, append to the last bucket
+            position -= 1
+            self._buckets[position].append(pair)
+            self._maxes[position] = pair
+        else:
+            insort(self._buckets[position], pair)
+
+        bucket = self._buckets[position]
+        if len(bucket) > BUCKET_SIZE:
+            # Split the bucket in halves
+            half = bucket[BUCKET_SIZE // 2:]
+            del bucket[BUCKET_SIZE // 2:]
+            self._buckets.insert(position + 1, half)
+            self._maxes[position] = bucket[-1]
+            self._maxes.insert(position + 1, half[-1])
+
+    def _remove(self, pair: DateEntry) -> None:
+        self._len -= 1
+        position = bisect_left(self._maxes, pair)
+        bucket = self._buckets[position]
+        del bucket[bisect_left(bucket, pair)]
+        if bucket:
+            self._maxes[position] = bucket[-1]
+        else:
+            del self._buckets[position]
+            del self._maxes[position]
+
+    def _iter_from(self, start: datetime | None) -> Iterator[DateEntry]:
+        """Iterate the pairs in date order, from the first pair dated at or after the start."""
+        position = index = 0
+        if start is not None:
+            # The empty entry_id sorts before any other entry_id of the same date
+            position = bisect_left(self._maxes, (start, ""))
+            if position < len(self._buckets):
+                index = bisect_left(self._buckets[position], (start, ""))
+        for bucket in islice(self._buckets, position, None):
+            yield from islice(bucket, index, None)
+            index = 0
+
+    def remove(self, entry_id: str) -> bool:
+        """Remove a monitor from the index.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        :return: True if the monitor was indexed; otherwise, False.
+        """
+        return self.update(entry_id, None)
+
+    def range(self, start: datetime, end: datetime) -> list[DateEntry]:
+        """Return the monitors dated within a range.
+
+        :param start: The start of the range, inclusive.
+        :param end: The end of the range, exclusive.
+        :return: The (date, entry_id) pairs within the range, sorted by date.
+        """
+        pairs = []
+        for pair in self._iter_from(start):
+            if pair[0] >= end:
+                break
+            pairs.append(pair)
+        return pairs
+
+    def first(self, count: int = 1, start: datetime | None = None) -> list[DateEntry]:
+        """Return the monitors with the earliest dates.
+
+        :param count: The number of monitors to return.
+        :param start: Only return the monitors dated at or after this date, all the monitors when omitted.
+        :return: The (date, entry_id) pairs with the earliest dates, sorted by date.
+        """
+        return list(islice(self._iter_from(start), count))
@@ -0,0 +1,111 @@
+"""Discovery of the devices that can be monitored, used by the config flow."""
+import logging
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.device_registry as dr
+import homeassistant.helpers.entity_registry as er
+
+from .common import (
+    generate_monitor_unique_id,
+    get_state_options,
+    get_wrapped_entity_name,
+)
+from .const import DOMAIN, SensorType
+
+_LOGGER = logging.getLogger(__name__)
+
+# The domains discovered in the chosen areas
+AREA_DISCOVERY_DOMAINS = {"climate", "fan", "humidifier", "switch", "vacuum", "water_heater"}
+
+
+class DiscoveryCandidate(NamedTuple):
+    """A class that represents a device that can be monitored."""
+
+    entity_id: str  # The source entity of the monitor
+    sensor_type: SensorType
+    name: str
+    unique_id: str  # The unique_id of the config entry that would monitor the device
+
+
+@callback
+def async_discover_candidates(
+        hass: HomeAssistant,
+        area_ids: list[str] | None = None,
+        configured_unique_ids: set[str] | None = None,
+) -> list[DiscoveryCandidate]:
+    """Scan the entity registry once for the devices that can be monitored.
+
+    Climate entities are monitored by runtime, and switches by energy consumption when their device has a power
+    sensor. When areas are chosen, only their devices are discovered, and their other switch like entities are
+    monitored by runtime.
+
+    :param hass: The Home Assistant instance.
+    :param area_ids: The areas to discover, all areas when omitted.
+    :param configured_unique_ids: The unique_ids of the config entries that already exist.
+    :return: The candidates, sorted by name.
+    """
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    area_ids = set(area_ids or [])
+    configured_unique_ids = configured_unique_ids or set()
+
+    power_sensors: dict[str, er.RegistryEntry] = {}  # The first power sensor of every device
+    sources: list[tuple[er.RegistryEntry, dr.DeviceEntry | None]] = []
+    for entity_entry in entity_registry.entities.values():
+        if entity_entry.disabled_by or entity_entry.platform == DOMAIN:
+            continue
+
+        if entity_entry.domain == "sensor":
+            device_class = entity_entry.device_class or entity_entry.original_device_class
+            if entity_entry.device_id and device_class == "power":
+                power_sensors.setdefault(entity_entry.device_id, entity_entry)
+            continue
+
+        if entity_entry.domain not in AREA_DISCOVERY_DOMAINS:
+            continue
+        if not area_ids and entity_entry.domain not in ("climate", "switch"):
+            continue
+
+        device_entry = device_registry.async_get(entity_entry.device_id) if entity_entry.device_id else None
+        if area_ids:
+            area_id = entity_entry.area_id or (device_entry.area_id if device_entry else None)
+            if area_id not in area_ids:
+                continue
+        sources.append((entity_entry, device_entry))
+
+    candidates: dict[str, DiscoveryCandidate] = {}
+    for entity_entry, device_entry in sources:
+        name = get_wrapped_entity_name(
+            hass,
+            entity_entry.entity_id,
+            entity_entry.entity_id.split(".", 1)[1],
+            entity_entry,
+            device_entry,
+        )
+        source_entry = entity_entry
+        sensor_type = SensorType.RUNTIME
+        if entity_entry.domain == "switch":
+            power_sensor = power_sensors.get(entity_entry.device_id) if entity_entry.device_id else None
+            if power_sensor:
+                source_entry = power_sensor
+                sensor_type = SensorType.POWER
+            elif not area_ids:
+                # A switch without a power sensor is only discovered in the chosen areas
+                continue
+        elif entity_entry.domain == "climate":
+            # Warm the capability cache used by the options flow of the monitor
+            get_state_options(hass, entity_entry.entity_id, entity_entry)
+
+        unique_id = generate_monitor_unique_id(source_entry.entity_id, source_entry.unique_id)
+        if unique_id in configured_unique_ids or source_entry.entity_id in candidates:
+            continue
+        candidates[source_entry.entity_id] = DiscoveryCandidate(source_entry.entity_id, sensor_type, name, unique_id)
+
+    _LOGGER.info(
+        "Discovered %s devices out of %s entities in areas %s",
+        len(candidates),
+        len(entity_registry.entities),
+        sorted(area_ids) or "all",
+    )
+    return sorted(candidates.values(), key=lambda candidate: candidate.name.lower())
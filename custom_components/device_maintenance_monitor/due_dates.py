@@ -0,0 +1,81 @@
+"""Tracks the date the maintenance of every monitor is due."""
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DATA_DUE_DATES,
+    DOMAIN,
+    SIGNAL_DUE_DATES_CHANGED,
+    SIGNAL_MONITOR_UPDATED,
+)
+from .date_index import DateIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DueDateTracker:
+    """A class that keeps the due date of every monitor in a sorted index.
+
+    Only the updated monitor is read when a monitor is updated, instead of reading every monitor on every query.
+    The monitors whose maintenance is already needed keep the date it became due, so they do not move on every update.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the tracker.
+
+        :param hass: The Home Assistant instance.
+        """
+        self._hass = hass
+        self._index = DateIndex()
+
+    @property
+    def index(self) -> DateIndex:
+        """Return the index of the due dates by entry_id."""
+        return self._index
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start tracking the updates of the monitors.
+
+        :return: The callback to stop tracking.
+        """
+        return async_dispatcher_connect(self._hass, SIGNAL_MONITOR_UPDATED, self.async_update)
+
+    @callback
+    def async_update(self, entry_id: str) -> None:
+        """Update the due date of a monitor.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        """
+        logic = self._hass.data.get(DOMAIN, {}).get(entry_id)
+        due_date = logic.maintenance_due_date if logic else None
+        previous_due_date = self._index.get(entry_id)
+        if due_date is not None and previous_due_date is not None:
+            now = dt_util.utcnow()
+            if due_date <= now and previous_due_date <= now:
+                # Keep the date the maintenance became due
+                return
+
+        if self._index.update(entry_id, due_date):
+            async_dispatcher_send(self._hass, SIGNAL_DUE_DATES_CHANGED, entry_id)
+
+
+@callback
+def async_get_due_date_tracker(hass: HomeAssistant) -> DueDateTracker:
+    """Get the due date tracker, creating and starting it on first use.
+
+    :param hass: The Home Assistant instance.
+    :return: The due date tracker.
+    """
+    if (tracker := hass.data.get(DATA_DUE_DATES)) is None:
+        tracker = hass.data[DATA_DUE_DATES] = DueDateTracker(hass)
+        tracker.async_start()
+        for entry_id in hass.data.get(DOMAIN, {}):
+            tracker.async_update(entry_id)
+    return tracker
@@ -0,0 +1,158 @@
+"""Serializes the updates of a maintenance logic, applying a burst of source events at once."""
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+import logging
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import MaintenanceAction, MaintenanceSource
+from .logics import MaintenanceLogic
+from .logics.clock import EventClock
+from .maintenance_history import async_get_maintenance_history
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SourceEvent(NamedTuple):
+    """A class that represents a state reported by a source entity."""
+
+    entity_id: str
+    old_state: str | None  # None for the state found at startup
+    new_state: str
+    time_fired: datetime
+
+
+class LoadEvent(NamedTuple):
+    """A class that represents a load reported by the load entity."""
+
+    load: str | float | None  # None when the load entity or its attribute is not available
+    time_fired: datetime
+
+
+class MaintenanceEvent(NamedTuple):
+    """A class that represents a reset or an update of the maintenance, requested by a service or the button."""
+
+    action: MaintenanceAction
+    source: MaintenanceSource
+    last_maintenance_date: datetime | None  # None for the current date
+    time_fired: datetime
+
+
+QueuedEvent = SourceEvent | LoadEvent | MaintenanceEvent
+
+
+class SourceEventQueue:
+    """A class that owns the updates of a maintenance logic and applies them one after the other.
+
+    The events put during a loop iteration are drained by a single task on the next one, in the order they were
+    fired and with the time they were fired. The periodic update and the resets and updates of the maintenance run in
+    the same task, so they never run while an event is awaiting the is on expression. The listener is called once per
+    drain, so a burst results in a single state write.
+    """
+
+    def __init__(self,
+                 hass: HomeAssistant,
+                 logic: MaintenanceLogic,
+                 entry_id: str,
+                 on_drained: Callable[[bool], None]):
+        """Initialize the queue.
+
+        :param hass: The Home Assistant instance.
+        :param logic: The maintenance logic the events are applied to.
+        :param entry_id: The identifier of the config entry of the logic, for the maintenance history.
+        :param on_drained: The callback after the queue was drained, called with whether events were applied.
+        """
+        self._hass = hass
+        self._logic = logic
+        self._entry_id = entry_id
+        self._on_drained = on_drained
+        self._events: deque[QueuedEvent] = deque()
+        self._update_pending = False
+        self._draining = False
+
+    @callback
+    def async_put(self, event: QueuedEvent) -> None:
+        """Put an event to apply on the next drain.
+
+        :param event: The state reported by a source entity, the load reported by the load entity, or a maintenance.
+        """
+        self._events.append(event)
+        self._async_schedule_drain()
+
+    @callback
+    def async_put_update(self) -> None:
+        """Request the periodic update of the logic on the next drain."""
+        self._update_pending = True
+        self._async_schedule_drain()
+
+    @callback
+    def _async_schedule_drain(self) -> None:
+        if self._draining:
+            # The running drain picks up the new event
+            return
+        self._draining = True
+        # Not started eagerly, so the rest of the burst is queued before the drain starts
+        self._hass.async_create_task(self._async_drain(), eager_start=False)
+
+    async def _async_drain(self) -> None:
+        """Apply the pending events in order, and then the pending update."""
+        applied = 0
+        try:
+            while self._events or self._update_pending:
+                while self._events:
+                    event = self._events.popleft()
+                    try:
+                        await self._async_apply(event)
+                    except Exception:
+                        # Do not leave the rest of the burst behind
+                        _LOGGER.exception("Error applying %s to device '%s'", event, self._logic.name)
+                    applied += 1
+                if self._update_pending:
+                    self._update_pending = False
+                    try:
+                        self._logic.update()
+                    except Exception:
+                        # Still write the state of the events already applied
+                        _LOGGER.exception("Error updating device '%s'", self._logic.name)
+        finally:
+            self._draining = False
+
+        if applied > 1:
+            _LOGGER.debug("Applied %s events of device '%s' at once", applied, self._logic.name)
+        self._on_drained(applied > 0)
+
+    async def _async_apply(self, event: QueuedEvent) -> None:
+        """Apply an event with the time it was fired."""
+        clock = self._logic.clock
+        if isinstance(clock, EventClock):
+            clock.set_event_time(event.time_fired)
+        try:
+            if isinstance(event, MaintenanceEvent):
+                self._apply_maintenance(event)
+            elif isinstance(event, LoadEvent):
+                self._logic.handle_load_change(event.load)
+            elif event.old_state is None:
+                await self._logic.handle_startup(event.new_state, event.entity_id)
+            else:
+                await self._logic.handle_source_entity_state_change(
+                    event.old_state, event.new_state, event.entity_id
+                )
+        finally:
+            if isinstance(clock, EventClock):
+                clock.clear_event_time()
+
+    def _apply_maintenance(self, event: MaintenanceEvent) -> None:
+        """Record the maintenance in the history with the usage before it, and apply it to the logic."""
+        async_get_maintenance_history(self._hass).async_record(
+            self._entry_id,
+            self._logic,
+            event.action,
+            event.source,
+            event.last_maintenance_date,
+        )
+        if event.action == MaintenanceAction.RESET:
+            self._logic.reset(event.last_maintenance_date)
+        else:
+            self._logic.update_state(last_maintenance_date=event.last_maintenance_date)
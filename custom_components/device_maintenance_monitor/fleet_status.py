@@ -0,0 +1,150 @@
+"""Tracks the maintenance status of every monitor for the fleet status subscriptions."""
+from collections.abc import Callable
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .common import get_maintenance_needed_entity_id
+from .const import (
+    DATA_FLEET_STATUS,
+    DEFAULT_FLEET_STATUS_UPDATE_DELAY,
+    DOMAIN,
+    SIGNAL_MONITOR_UPDATED,
+)
+from .logics import MaintenanceLogic
+
+_LOGGER = logging.getLogger(__name__)
+
+FleetStatusDelta = dict[str, Any]
+FleetStatusListener = Callable[[FleetStatusDelta], None]
+
+
+class FleetStatusTracker:
+    """A class that keeps the last known status of every monitor and pushes the changes to the subscribers.
+
+    The monitors are only tracked while there are subscribers. The monitors updated during the update delay are
+    collected and their status is computed once, so a burst of changes results in a single delta for every subscriber
+    that only holds the fields that changed.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the tracker.
+
+        :param hass: The Home Assistant instance.
+        """
+        self._hass = hass
+        self._statuses: dict[str, dict[str, Any]] = {}  # The last status sent for every entry_id
+        self._pending_entry_ids: set[str] = set()  # The monitors updated since the last delta
+        self._listeners: set[FleetStatusListener] = set()
+        self._unsub_monitor_updated: CALLBACK_TYPE | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    def _get_logics(self) -> dict[str, MaintenanceLogic]:
+        return self._hass.data.get(DOMAIN, {})
+
+    def _build_status(self, entry_id: str, logic: MaintenanceLogic) -> dict[str, Any]:
+        """Build the status of a monitor from its logic."""
+        return {
+            "name": logic.name,
+            "entity_id": get_maintenance_needed_entity_id(self._hass, entry_id),
+            "logic_type": logic.logic_type,
+            "maintenance_needed": logic.is_maintenance_needed,
+            **logic.get_state(),
+        }
+
+    @callback
+    def async_subscribe(self, listener: FleetStatusListener) -> tuple[dict[str, dict[str, Any]], CALLBACK_TYPE]:
+        """Subscribe to the status changes of the monitors.
+
+        :param listener: The callback receiving every delta.
+        :return: The current status of every monitor, and the callback to unsubscribe.
+        """
+        if not self._listeners:
+            self._statuses = {
+                entry_id: self._build_status(entry_id, logic)
+                for entry_id, logic in self._get_logics().items()
+            }
+            self._unsub_monitor_updated = async_dispatcher_connect(
+                self._hass,
+                SIGNAL_MONITOR_UPDATED,
+                self._async_monitor_updated,
+            )
+        self._listeners.add(listener)
+
+        @callback
+        def unsubscribe() -> None:
+            self._listeners.discard(listener)
+            if not self._listeners:
+                self._async_stop()
+
+        return dict(self._statuses), unsubscribe
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop tracking the monitors once the last subscriber left."""
+        if self._unsub_monitor_updated:
+            self._unsub_monitor_updated()
+            self._unsub_monitor_updated = None
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending_entry_ids.clear()
+        self._statuses.clear()
+
+    @callback
+    def _async_monitor_updated(self, entry_id: str) -> None:
+        """Collect an updated monitor until the next delta."""
+        self._pending_entry_ids.add(entry_id)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass,
+                DEFAULT_FLEET_STATUS_UPDATE_DELAY,
+                self._async_flush,
+            )
+
+    @callback
+    def _async_flush(self, __: datetime | None = None) -> None:
+        """Send the changes of the monitors updated since the last delta."""
+        self._unsub_flush = None
+        logics = self._get_logics()
+        changed: dict[str, dict[str, Any]] = {}
+        removed: list[str] = []
+        for entry_id in self._pending_entry_ids:
+            logic = logics.get(entry_id)
+            if logic is None:
+                if self._statuses.pop(entry_id, None) is not None:
+                    removed.append(entry_id)
+                continue
+
+            status = self._build_status(entry_id, logic)
+            previous_status = self._statuses.get(entry_id, {})
+            delta = {key: value for key, value in status.items() if previous_status.get(key) != value}
+            # A field that is no longer reported, e.g. the predicted date once maintenance is done, is cleared
+            delta.update({key: None for key in previous_status.keys() - status.keys()})
+            if delta:
+                changed[entry_id] = delta
+            self._statuses[entry_id] = status
+        self._pending_entry_ids.clear()
+
+        if not changed and not removed:
+            return
+        _LOGGER.debug("Sending fleet status delta, changed: %s, removed: %s", list(changed), removed)
+        delta = {"changed": changed, "removed": removed}
+        for listener in list(self._listeners):
+            listener(delta)
+
+
+@callback
+def async_get_fleet_status_tracker(hass: HomeAssistant) -> FleetStatusTracker:
+    """Get the fleet status tracker, creating it on first use.
+
+    :param hass: The Home Assistant instance.
+    :return: The fleet status tracker.
+    """
+    if (tracker := hass.data.get(DATA_FLEET_STATUS)) is None:
+        tracker = hass.data[DATA_FLEET_STATUS] = FleetStatusTracker(hass)
+    return tracker
@@ -0,0 +1,195 @@
+"""Exports the state and the config of every monitor to a JSONL file, and imports them back, e.g. on a new host.
+
+The monitors are streamed in chunks, serialized on the event loop and written or read in the executor, so the
+memory stays flat however many monitors there are.
+"""
+from collections.abc import Iterator
+import json
+import logging
+import os
+from pathlib import Path
+from typing import IO, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import Config, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import restore_state
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    DEFAULT_TRANSFER_CHUNK_SIZE,
+    DOMAIN,
+    SIGNAL_MONITOR_UPDATED,
+    SIGNAL_SENSOR_STATE_CHANGE,
+)
+from .logics import MaintenanceLogic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _resolve_path(config: Config, file_path: str) -> str | None:
+    """Resolve the path of a transfer file, in the executor.
+
+    A relative path is resolved in the configuration folder, an absolute path must be in an allowed external folder.
+
+    :return: The absolute path, or None if the path is not allowed.
+    """
+    if os.path.isabs(file_path):
+        return file_path if config.is_allowed_path(file_path) else None
+    path = Path(config.path(file_path)).resolve()
+    if not path.is_relative_to(Path(config.config_dir).resolve()):
+        return None
+    return str(path)
+
+
+def _open_export(path: str) -> IO[bytes]:
+    """Open a temporary file next to the export file, in the executor."""
+    return open(f"{path}.tmp", "wb")
+
+
+def _write_lines(export_file: IO[bytes], lines: list[bytes]) -> None:
+    """Write a chunk of lines to the export file, in the executor."""
+    export_file.writelines(lines)
+
+
+def _close_export(export_file: IO[bytes], path: str, completed: bool) -> None:
+    """Close the temporary file, and replace the export file with it once every monitor was written, in the executor."""
+    export_file.close()
+    if completed:
+        os.replace(export_file.name, path)
+    else:
+        os.remove(export_file.name)
+
+
+def _read_records(import_file: IO[bytes], count: int) -> list[dict[str, Any]]:
+    """Read the next records of the import file, in the executor.
+
+    :return: Up to count records, an empty list at the end of the file.
+    """
+    records = []
+    for line in import_file:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            _LOGGER.warning("Skipping an invalid monitor record in the import file")
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+        if len(records) >= count:
+            break
+    return records
+
+
+def _chunks(entries: list[ConfigEntry], size: int) -> Iterator[list[ConfigEntry]]:
+    for start in range(0, len(entries), size):
+        yield entries[start:start + size]
+
+
+def _export_record(entry: ConfigEntry, logic: MaintenanceLogic | None) -> bytes:
+    """Serialize the config of a monitor, and its state when it is loaded, as a line of the export file."""
+    record: dict[str, Any] = {
+        "unique_id": entry.unique_id,
+        "title": entry.title,
+        "data": dict(entry.data),
+    }
+    if logic is not None:
+        record["logic_type"] = logic.logic_type
+        record["state"] = logic.get_restore_state()
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+async def _async_resolve_path(hass: HomeAssistant, file_path: str) -> str:
+    if (path := await hass.async_add_executor_job(_resolve_path, hass.config, file_path)) is None:
+        raise HomeAssistantError(f"Access to {file_path} is not allowed")
+    return path
+
+
+async def async_export_monitors(hass: HomeAssistant, file_path: str) -> dict[str, Any]:
+    """Write the config of every monitor, and the state of the loaded monitors, to a JSONL file.
+
+    The file is written to a temporary file first, so a failed export leaves the previous export intact.
+
+    :param hass: The Home Assistant instance.
+    :param file_path: The path of the file, relative to the configuration folder or in an allowed external folder.
+    :return: The path of the file under 'file_path', and the number of monitors written under 'monitors'.
+    """
+    path = await _async_resolve_path(hass, file_path)
+    logics: dict[str, MaintenanceLogic] = hass.data.get(DOMAIN, {})
+    entries = [entry for entry in hass.config_entries.async_entries(DOMAIN) if entry.unique_id]
+    try:
+        export_file = await hass.async_add_executor_job(_open_export, path)
+    except OSError as e:
+        raise HomeAssistantError(f"Error opening {path}: {e}") from e
+
+    completed = False
+    try:
+        for chunk in _chunks(entries, DEFAULT_TRANSFER_CHUNK_SIZE):
+            lines = [_export_record(entry, logics.get(entry.entry_id)) for entry in chunk]
+            await hass.async_add_executor_job(_write_lines, export_file, lines)
+        completed = True
+    except OSError as e:
+        raise HomeAssistantError(f"Error writing {path}: {e}") from e
+    finally:
+        await hass.async_add_executor_job(_close_export, export_file, path, completed)
+
+    _LOGGER.info("Exported %s monitors to %s", len(entries), path)
+    return {"file_path": path, "monitors": len(entries)}
+
+
+async def async_import_monitors(hass: HomeAssistant, file_path: str, restore_config: bool) -> dict[str, Any]:
+    """Restore the monitors from a JSONL file written by async_export_monitors, matching them by unique_id.
+
+    The state of the monitors is restored as one batch: the entities are written once every record was read, and the
+    stored states are saved once. The config is applied afterwards, so a monitor that is reloaded by its new config
+    keeps the restored state.
+
+    :param hass: The Home Assistant instance.
+    :param file_path: The path of the file, relative to the configuration folder or in an allowed external folder.
+    :param restore_config: Whether to also restore the config of the monitors.
+    :return: The number of monitors whose state was restored, whose config was restored, and of unmatched records.
+    """
+    path = await _async_resolve_path(hass, file_path)
+    logics: dict[str, MaintenanceLogic] = hass.data.get(DOMAIN, {})
+    entries = {entry.unique_id: entry for entry in hass.config_entries.async_entries(DOMAIN) if entry.unique_id}
+    try:
+        import_file = await hass.async_add_executor_job(open, path, "rb")
+    except OSError as e:
+        raise HomeAssistantError(f"Error opening {path}: {e}") from e
+
+    restored = reconfigured = unmatched = 0
+    try:
+        while records := await hass.async_add_executor_job(_read_records, import_file, DEFAULT_TRANSFER_CHUNK_SIZE):
+            for record in records:
+                if (entry := entries.get(record.get("unique_id"))) is None:
+                    unmatched += 1
+                    continue
+
+                logic = logics.get(entry.entry_id)
+                state = record.get("state")
+                if state and logic is not None and logic.logic_type == record.get("logic_type"):
+                    logic.restore_state(state)
+                    async_dispatcher_send(hass, SIGNAL_MONITOR_UPDATED, entry.entry_id)
+                    restored += 1
+
+                data = record.get("data")
+                if restore_config and data and data != entry.data:
+                    hass.config_entries.async_update_entry(entry, data=data, title=record.get("title", entry.title))
+                    reconfigured += 1
+    except OSError as e:
+        raise HomeAssistantError(f"Error reading {path}: {e}") from e
+    finally:
+        await hass.async_add_executor_job(import_file.close)
+
+    if restored:
+        # Every monitor writes its state once, and the stored states are saved once for the whole batch
+        async_dispatcher_send(hass, SIGNAL_SENSOR_STATE_CHANGE)
+        await restore_state.async_get(hass).async_dump_states()
+
+    _LOGGER.info(
+        "Imported monitors from %s, state restored: %s, config restored: %s, unmatched: %s",
+        path,
+        restored,
+        reconfigured,
+        unmatched,
+    )
+    return {"restored": restored, "reconfigured": reconfigured, "unmatched": unmatched}
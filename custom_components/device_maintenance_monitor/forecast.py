@@ -0,0 +1,132 @@
+"""Fits the usage profiles of the monitors from the long term statistics of their usage sensors."""
+from datetime import datetime, timezone
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import start
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from .common import get_entity_id_by_unique_id
+from .const import (
+    DEFAULT_FORECAST_HISTORY,
+    DEFAULT_FORECAST_REFIT_INTERVAL,
+    SIGNAL_MONITOR_UPDATED,
+    STATE_CYCLE_COUNT,
+    STATE_DEVICE_TURN_ON_COUNT,
+    STATE_ENERGY_CONSUMED,
+    STATE_METER_CONSUMED,
+    STATE_RUNTIME_DURATION,
+)
+from .logics import (
+    CountMaintenanceLogic,
+    CycleMaintenanceLogic,
+    MeterMaintenanceLogic,
+    PowerMaintenanceLogic,
+    RuntimeMaintenanceLogic,
+)
+from .logics.range_maintenance_logic import RangeMaintenanceLogic
+from .logics.usage_profile import UsageProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+# The usage sensor of every logic, and the units the statistics are read in to match the usage of the logic
+USAGE_STATISTICS: dict[type[RangeMaintenanceLogic], tuple[str, dict[str, str] | None]] = {
+    RuntimeMaintenanceLogic: (STATE_RUNTIME_DURATION, {"duration": UnitOfTime.SECONDS}),
+    CountMaintenanceLogic: (STATE_DEVICE_TURN_ON_COUNT, None),
+    PowerMaintenanceLogic: (STATE_ENERGY_CONSUMED, {"energy": UnitOfEnergy.KILO_WATT_HOUR}),
+    MeterMaintenanceLogic: (STATE_METER_CONSUMED, None),
+    CycleMaintenanceLogic: (STATE_CYCLE_COUNT, None),
+}
+
+
+def _fit_usage_profile(
+        hass: HomeAssistant,
+        statistic_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        units: dict[str, str] | None,
+) -> UsageProfile | None:
+    """Read the hourly usage from the statistics and fit the profile, run in the recorder executor."""
+    rows = statistics_during_period(hass, start_time, end_time, {statistic_id}, "hour", units, {"change"})
+    return UsageProfile.fit(
+        (datetime.fromtimestamp(row["start"], tz=timezone.utc), row["change"])
+        for row in rows.get(statistic_id, [])
+        if row.get("change") is not None
+    )
+
+
+class UsageForecaster:
+    """A class that periodically fits the usage profile of a monitor and sets it on its logic.
+
+    The statistics are read and the profile is fitted in the recorder executor, the logic only follows the fitted
+    profile when the predicted date is read.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, logic: RangeMaintenanceLogic):
+        """Initialize the forecaster.
+
+        :param hass: The Home Assistant instance.
+        :param entry: The config entry of the monitor.
+        :param logic: The maintenance logic of the monitor.
+        """
+        self._hass = hass
+        self._entry_id = entry.entry_id
+        self._unique_id = entry.unique_id
+        self._logic = logic
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Fit the profile once Home Assistant has started, and then periodically.
+
+        :return: The callback to stop fitting the profile.
+        """
+        unsub_started = start.async_at_started(self._hass, self.async_refit)
+        unsub_interval = async_track_time_interval(self._hass, self.async_refit, DEFAULT_FORECAST_REFIT_INTERVAL)
+
+        @callback
+        def stop() -> None:
+            unsub_started()
+            unsub_interval()
+
+        return stop
+
+    async def async_refit(self, *_) -> None:
+        """Fit the profile from the usage of the last weeks."""
+        if "recorder" not in self._hass.config.components:
+            _LOGGER.warning("The recorder is not loaded, cannot forecast the usage of device '%s'", self._logic.name)
+            return
+
+        usage_statistics = next(
+            (usage for logic_type, usage in USAGE_STATISTICS.items() if isinstance(self._logic, logic_type)),
+            None,
+        )
+        if usage_statistics is None:
+            return
+        sensor_key, units = usage_statistics
+        statistic_id = get_entity_id_by_unique_id(self._hass, "sensor", f"{self._unique_id}_{sensor_key}")
+        if statistic_id is None:
+            return
+
+        end_time = dt_util.utcnow()
+        usage_profile = await get_instance(self._hass).async_add_executor_job(
+            _fit_usage_profile,
+            self._hass,
+            statistic_id,
+            end_time - DEFAULT_FORECAST_HISTORY,
+            end_time,
+            units,
+        )
+        _LOGGER.debug(
+            "Fitted the usage profile of device '%s' from %s, weekly usage: %s",
+            self._logic.name,
+            statistic_id,
+            usage_profile.weekly_usage if usage_profile else None,
+        )
+        self._logic.set_usage_profile(usage_profile)
+        async_dispatcher_send(self._hass, SIGNAL_MONITOR_UPDATED, self._entry_id)
@@ -0,0 +1,80 @@
+"""Builds the maintenance logic of a config entry."""
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_IDLE_TIMEOUT,
+    CONF_INTERVAL,
+    CONF_IS_ON_TEMPLATE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_CYCLE_LENGTH,
+    CONF_MIN_INTERVAL,
+    CONF_SENSOR_TYPE,
+    CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
+)
+from .logics import IMPLEMENTED_LOGICS, MaintenanceLogic
+from .logics.clock import EventClock, parse_date
+from .template_cache import async_get_template_cache
+
+_LOGGER = logging.getLogger(__name__)
+
+# The options entered with a duration selector
+DURATION_OPTIONS = (CONF_INTERVAL, CONF_MIN_INTERVAL, CONF_MAX_INTERVAL, CONF_MIN_CYCLE_LENGTH, CONF_IDLE_TIMEOUT)
+
+
+async def get_maintenance_logic(
+        hass: HomeAssistant, config_entry: ConfigEntry
+) -> MaintenanceLogic:
+    """Get the maintenance logic for the config entry.
+
+    :param hass: The Home Assistant instance.
+    :param config_entry: The config entry.
+    :return: The maintenance logic.
+    """
+    sensor_type = config_entry.data.get(CONF_SENSOR_TYPE)
+    if sensor_type is None:
+        raise ValueError(f"{CONF_SENSOR_TYPE} is required in {config_entry.data}")
+
+    config_data = dict(config_entry.data)
+
+    # Convert the durations from a time period dict to a timedelta
+    for option in DURATION_OPTIONS:
+        duration = config_data.get(option)
+        if duration is not None:
+            config_data[option] = cv.time_period_dict(duration)
+
+    # Get the expression of the is_on_template string, shared with the other entries using the same template
+    is_on_template_str: str | None = config_data.get(CONF_IS_ON_TEMPLATE)
+    template_cache = async_get_template_cache(hass)
+    if is_on_template_str:
+        config_data[CONF_IS_ON_TEMPLATE] = template_cache.async_acquire(config_entry.entry_id, is_on_template_str)
+    else:
+        template_cache.async_release(config_entry.entry_id)
+
+    # Convert the date string to a datetime object
+    initial_last_maintenance_date_str: str | None = config_data.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE)
+    if initial_last_maintenance_date_str:
+        config_data[CONFIG_INITIAL_LAST_MAINTENANCE_DATE] = parse_date(initial_last_maintenance_date_str)
+
+    # Get the logic class and create an instance
+    logic = IMPLEMENTED_LOGICS.get(sensor_type)
+    if not logic:
+        raise NotImplementedError(f"sensor_type {sensor_type} is not implemented")
+
+    # The source events are applied with the time they were fired, see the event_queue module
+    return logic.get_instance(config_data, EventClock())
+
+
+async def async_reconfigure_logic(
+        hass: HomeAssistant, config_entry: ConfigEntry, logic: MaintenanceLogic
+) -> None:
+    """Apply the configuration of the config entry to its live logic, keeping the usage and the maintenance dates.
+
+    :param hass: The Home Assistant instance.
+    :param config_entry: The config entry.
+    :param logic: The maintenance logic of the config entry.
+    """
+    logic.reconfigure(await get_maintenance_logic(hass, config_entry))
@@ -3,14 +3,17 @@ from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
 import logging
-from typing import final
+from typing import ClassVar, final
 
 from ..const import (
-    DATE_FORMAT,
     STATE_LAST_MAINTENANCE_DATE,
     STATE_LAST_RESET_DATE,
+    STATE_LAST_RESET_TIME,
     STATE_PREDICTED_MAINTENANCE_DATE,
+    AggregateMode,
 )
+from .clock import SYSTEM_CLOCK, Clock, format_date, parse_date
+from .source_aggregate import SourceAggregate
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,17 +23,38 @@ IsOnExpression = Callable[[], Awaitable[bool]]
 class MaintenanceLogic(ABC):
     """An abstract base class that represents the logic for maintaining a device."""
 
+    __slots__ = (
+        "_name",
+        "_entity_id",
+        "_on_states",
+        "_is_on_expression",
+        "_source_aggregate",
+        "_clock",
+        "_last_maintenance_date",
+        "_last_reset_date",
+        "_last_state_on",
+    )
+
     _name: str  # The name of the entity
     _entity_id: str | None  # The unique identifier of the source entity
     _on_states: list[str] | None  # The states in which the device is considered to be "on"
     _is_on_expression: IsOnExpression | None  # The expression to determine if the device is on
+    _source_aggregate: SourceAggregate | None  # The aggregation of the on state of several source entities
+    _clock: Clock  # The clock used to read the current time
+
+    # The attributes taken from the new configuration by reconfigure, every subclass lists its own
+    _CONFIG_ATTRIBUTES: ClassVar[tuple[str, ...]] = ("_name", "_on_states", "_is_on_expression")
 
     def __init__(self, *,
                  name: str,
                  entity_id: str | None,
                  on_states: list[str] | None = None,
                  is_on_expression: IsOnExpression | None = None,
-                 initial_last_maintenance_date: datetime | None = None):
+                 initial_last_maintenance_date: datetime | None = None,
+                 additional_entity_ids: list[str] | None = None,
+                 aggregate_mode: AggregateMode | None = None,
+                 aggregate_min_on: int | None = None,
+                 clock: Clock | None = None):
         """Initialize a new instance of the MaintenanceLogic class.
 
         :param name: The name of the entity.
@@ -38,24 +62,45 @@ class MaintenanceLogic(ABC):
         :param on_states: The states in which the device is considered to be "on".
         :param is_on_expression: The expression to determine if the device is on.
         :param initial_last_maintenance_date: The initial last maintenance date.
+        :param additional_entity_ids: The unique identifiers of additional source entities.
+        :param aggregate_mode: The way the on state of the source entities is combined.
+        :param aggregate_min_on: The number of sources that must be on, used by the 'at least' mode.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         """
+        self._clock = clock or SYSTEM_CLOCK
         self._name = name
         self._entity_id = entity_id
         self._on_states = on_states
         self._is_on_expression = is_on_expression
 
+        additional_entity_ids = [
+            additional_entity_id
+            for additional_entity_id in additional_entity_ids or []
+            if additional_entity_id != entity_id
+        ]
+        if entity_id and additional_entity_ids:
+            self._source_aggregate = SourceAggregate(
+                [entity_id, *additional_entity_ids],
+                aggregate_mode or AggregateMode.ANY,
+                aggregate_min_on,
+            )
+        else:
+            self._source_aggregate = None
+
+        now = self._clock.utcnow()
         if initial_last_maintenance_date:
             self._last_maintenance_date = initial_last_maintenance_date  # The date of the last maintenance
         else:
-            self._last_maintenance_date = datetime.now()  # The date of the last maintenance
-        self._last_reset_date = datetime.now()  # The date of the last reset
+            self._last_maintenance_date = now  # The date of the last maintenance
+        self._last_reset_date = now  # The date of the last reset
         self._last_state_on = False  # The state of the device during the last update
 
     @classmethod
-    def get_instance(cls, config: dict) -> "MaintenanceLogic":
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "MaintenanceLogic":
         """Return an instance of the maintenance logic.
 
         :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         :return: An instance of the maintenance logic.
         """
         raise NotImplementedError
@@ -65,20 +110,45 @@ class MaintenanceLogic(ABC):
         """Returns the source entity of the device."""
         return self._entity_id
 
+    @property
+    def source_entity_ids(self) -> list[str]:
+        """Returns all the source entities the device is listening to."""
+        if self._source_aggregate:
+            return self._source_aggregate.entity_ids
+        if self._entity_id:
+            return [self._entity_id]
+        return []
+
     @final
     def reset(self, last_maintenance_date: datetime | None = None):
         """Reset the last maintenance date to the current date."""
+        now = self._clock.utcnow()
         if last_maintenance_date:
             self._last_maintenance_date = last_maintenance_date
         else:
-            self._last_maintenance_date = datetime.now()
+            self._last_maintenance_date = now
 
-        self._last_reset_date = datetime.now()
+        self._last_reset_date = now
         self._reset()
+        self._maintenance_dates_changed()
 
     def _reset(self):
         """Provide additional reset logic."""
 
+    @final
+    def reconfigure(self, other: "MaintenanceLogic"):
+        """Take the configuration of another logic of the same type and sources, keeping the usage and the dates.
+
+        :param other: The logic built from the new configuration.
+        """
+        for cls in type(self).__mro__:
+            for attribute in cls.__dict__.get("_CONFIG_ATTRIBUTES", ()):
+                setattr(self, attribute, getattr(other, attribute))
+        self._maintenance_dates_changed()
+
+    def _maintenance_dates_changed(self):
+        """Provide additional logic when the last maintenance date or the last reset date changes."""
+
     async def _is_device_on(self, state: str) -> bool:
         """Return whether the device is on.
 
@@ -86,16 +156,32 @@ class MaintenanceLogic(ABC):
         """
         if self._is_on_expression:
             return await self._is_on_expression()
+        if not self._on_states:
+            return False
         return state in self._on_states
 
+    async def _is_aggregate_on(self, state: str, entity_id: str | None) -> bool:
+        """Return whether the device is on, taking all the source entities into account.
+
+        :param state: The state of the source entity that reported it.
+        :param entity_id: The unique identifier of the source entity that reported the state.
+        :return: True if the device is on; otherwise, False.
+        """
+        is_on = await self._is_device_on(state)
+        if self._source_aggregate:
+            return self._source_aggregate.update(entity_id or self._entity_id, is_on)
+        return is_on
+
     @final
-    async def handle_source_entity_state_change(self, old_state: str, new_state: str):
+    async def handle_source_entity_state_change(self, old_state: str, new_state: str, entity_id: str | None = None):
         """Handle the state change of the source entity.
 
         :param old_state: The previous state of the source entity.
         :param new_state: The new state of the source entity.
+        :param entity_id: The unique identifier of the source entity, defaults to the main source entity.
         """
-        is_new_state_on = await self._is_device_on(new_state)
+        self._handle_source_state(new_state)
+        is_new_state_on = await self._is_aggregate_on(new_state, entity_id)
         _LOGGER.info(
             "Handling state change for device '%s', old state: %s, new state: %s (%s)",
             self._name,
@@ -117,12 +203,18 @@ class MaintenanceLogic(ABC):
             self._last_state_on = False
 
     @final
-    async def handle_startup(self, current_state: str):
+    async def handle_startup(self, current_state: str, entity_id: str | None = None):
         """Handle the startup of the device.
 
         :param current_state: The current state of the device.
+        :param entity_id: The unique identifier of the source entity, defaults to the main source entity.
         """
-        is_current_state_on = await self._is_device_on(current_state)
+        self._handle_source_state(current_state)
+        is_current_state_on = await self._is_aggregate_on(current_state, entity_id)
+        if self._source_aggregate and is_current_state_on == self._last_state_on:
+            # Another source entity has already set the combined state
+            return
+
         if is_current_state_on:
             # The device is on.
             self._handle_turn_on()
@@ -132,17 +224,32 @@ class MaintenanceLogic(ABC):
             self._handle_turn_off()
             self._last_state_on = False
 
+    def _handle_source_state(self, state: str):
+        """Provide additional logic for every state reported by the source entity.
+
+        :param state: The state reported by the source entity.
+        """
+
     def _handle_turn_on(self):
         """Provide additional logic when the device turns on."""
 
     def _handle_turn_off(self):
         """Provide additional logic when the device turns off."""
 
+    @final
     @property
-    @abstractmethod
     def is_maintenance_needed(self) -> bool:
         """Indicate whether maintenance is needed.
 
+        :return: True if maintenance is needed; otherwise, False.
+        """
+        return self._is_maintenance_needed_at(self._clock.utcnow())
+
+    @abstractmethod
+    def _is_maintenance_needed_at(self, now: datetime) -> bool:
+        """Indicate whether maintenance is needed at the given time.
+
+        :param now: The current UTC time.
         :return: True if maintenance is needed; otherwise, False.
         """
         raise NotImplementedError
@@ -153,19 +260,12 @@ class MaintenanceLogic(ABC):
 
         :return: The current state of the device.
         """
+        now = self._clock.utcnow()
         state = self._get_state()
-        state[STATE_LAST_MAINTENANCE_DATE] = self._last_maintenance_date.strftime(
-            DATE_FORMAT
-        )
-        state[STATE_LAST_RESET_DATE] = self._last_reset_date.strftime(
-            DATE_FORMAT
-        )
-        if self.is_maintenance_needed:
-            state[STATE_PREDICTED_MAINTENANCE_DATE] = datetime.now().strftime(DATE_FORMAT)
-        elif self.predicted_maintenance_date:
-            state[STATE_PREDICTED_MAINTENANCE_DATE] = (
-                self.predicted_maintenance_date.strftime(DATE_FORMAT)
-            )
+        state[STATE_LAST_MAINTENANCE_DATE] = format_date(self._last_maintenance_date)
+        state[STATE_LAST_RESET_DATE] = format_date(self._last_reset_date)
+        if maintenance_due_date := self._maintenance_due_date_at(now):
+            state[STATE_PREDICTED_MAINTENANCE_DATE] = format_date(maintenance_due_date)
         return state
 
     def _get_state(self) -> dict[str, str]:
@@ -175,6 +275,26 @@ class MaintenanceLogic(ABC):
         """
         return {}
 
+    @final
+    def get_restore_state(self) -> dict[str, str]:
+        """Return the state of the device to store, with the state that is only kept to be restored.
+
+        :return: The state to pass to restore_state.
+        """
+        return {
+            **self.get_state(),
+            # The reset time is kept at full precision, so a second reset on the same day starts a new cycle
+            STATE_LAST_RESET_TIME: self._last_reset_date.isoformat(),
+            **self._get_restore_only_state(),
+        }
+
+    def _get_restore_only_state(self) -> dict[str, str]:
+        """Provide additional state that is only stored to be restored, and is not reported.
+
+        :return: Additional state to store.
+        """
+        return {}
+
     @final
     def restore_state(self, state: dict[str, str]):
         """Restore the state of the device from the given state.
@@ -183,18 +303,18 @@ class MaintenanceLogic(ABC):
         """
         last_maintenance_date = state.get(STATE_LAST_MAINTENANCE_DATE)
         if last_maintenance_date:
-            self._last_maintenance_date = datetime.strptime(
-                last_maintenance_date, DATE_FORMAT
-            )
+            self._last_maintenance_date = parse_date(last_maintenance_date)
+        last_reset_time = state.get(STATE_LAST_RESET_TIME)
         last_reset_date = state.get(STATE_LAST_RESET_DATE)
-        if last_reset_date:
-            self._last_reset_date = datetime.strptime(
-                last_reset_date, DATE_FORMAT
-            )
+        if last_reset_time:
+            self._last_reset_date = datetime.fromisoformat(last_reset_time)
+        elif last_reset_date:
+            self._last_reset_date = parse_date(last_reset_date)
         else:
             # Backward compatibility, set the last reset date to the last maintenance date
             self._last_reset_date = self._last_maintenance_date
         self._restore_state(state)
+        self._maintenance_dates_changed()
 
     def _restore_state(self, state: dict[str, str]):
         """Provide additional state restoration logic.
@@ -210,14 +330,76 @@ class MaintenanceLogic(ABC):
         """
         return
 
+    @property
+    def load_entity_id(self) -> str | None:
+        """Return the entity reporting the load of the device, None if the usage is not weighted by a load."""
+        return None
+
+    @property
+    def load_attribute(self) -> str | None:
+        """Return the attribute of the load entity holding the load, None to read its state."""
+        return None
+
+    def handle_load_change(self, load: str | float | None):
+        """Handle a change of the load reported by the load entity.
+
+        :param load: The new load, None when it is not available.
+        """
+
+    @property
+    def next_update_time(self) -> datetime | None:
+        """Return the time the device should be updated at, besides the update frequency and the source states.
+
+        :return: The UTC time of the next update, or None if no update is pending.
+        """
+        return None
+
+    @final
     @property
     def predicted_maintenance_date(self) -> datetime | None:
         """Return the predicted date of the next maintenance.
 
+        :return: The predicted date of the next maintenance.
+        """
+        return self._predicted_maintenance_date_at(self._clock.utcnow())
+
+    def _predicted_maintenance_date_at(self, now: datetime) -> datetime | None:
+        """Return the predicted date of the next maintenance as seen at the given time.
+
+        :param now: The current UTC time.
         :return: The predicted date of the next maintenance.
         """
         return None
 
+    @final
+    @property
+    def maintenance_due_date(self) -> datetime | None:
+        """Return the date the maintenance is due, which is now when maintenance is already needed.
+
+        :return: The date the maintenance is due.
+        """
+        return self._maintenance_due_date_at(self._clock.utcnow())
+
+    @final
+    def _maintenance_due_date_at(self, now: datetime) -> datetime | None:
+        if self._is_maintenance_needed_at(now):
+            return now
+        predicted_maintenance_date = self._predicted_maintenance_date_at(now)
+        max_maintenance_date = self._max_maintenance_date()
+        if predicted_maintenance_date is None or (
+                max_maintenance_date is not None and max_maintenance_date < predicted_maintenance_date
+        ):
+            # Without enough usage to predict a date, the maintenance is still due by the maximum interval
+            return max_maintenance_date
+        return predicted_maintenance_date
+
+    def _max_maintenance_date(self) -> datetime | None:
+        """Return the date the maintenance is needed by, regardless of the usage.
+
+        :return: The latest maintenance date, or None if there is no such limit.
+        """
+        return None
+
     def update(self):
         """Provide additional update logic."""
 
@@ -227,6 +409,18 @@ class MaintenanceLogic(ABC):
         """Return the name of the entity."""
         return self._name
 
+    @final
+    @property
+    def clock(self) -> Clock:
+        """Return the clock used to read the current time."""
+        return self._clock
+
+    @final
+    @property
+    def last_reset_date(self) -> datetime:
+        """Return the date the usage was last reset."""
+        return self._last_reset_date
+
     @final
     @property
     def logic_type(self) -> str:
@@ -238,3 +432,4 @@ class MaintenanceLogic(ABC):
         """Update the state of the device."""
         if last_maintenance_date:
             self._last_maintenance_date = last_maintenance_date
+            self._maintenance_dates_changed()
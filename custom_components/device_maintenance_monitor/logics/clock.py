@@ -0,0 +1,148 @@
+"""Provides the clocks used by the maintenance logics to read the current time."""
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+import time
+
+from ..const import DATE_FORMAT
+
+
+class Clock(ABC):
+    """An abstract base class that represents a source of time for the maintenance logics.
+
+    Durations are accounted with the monotonic time, which never jumps, and dates are computed from the UTC wall time.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Return the monotonic time in seconds, only meaningful relative to other readings of the same clock."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def utcnow(self) -> datetime:
+        """Return the current time as a timezone aware UTC datetime."""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """A clock that reads the time of the system."""
+
+    __slots__ = ()
+
+    def monotonic(self) -> float:
+        """Return the monotonic time of the system."""
+        return time.monotonic()
+
+    def utcnow(self) -> datetime:
+        """Return the current UTC time of the system."""
+        return datetime.now(timezone.utc)
+
+
+class FakeClock(Clock):
+    """A clock that only moves when it is told to, used for simulations and benchmarks."""
+
+    __slots__ = ("_utcnow", "_monotonic")
+
+    def __init__(self, now: datetime):
+        """Initialize the clock at the given time.
+
+        :param now: The initial time, naive datetimes are considered to be UTC.
+        """
+        self._utcnow = _as_utc(now)
+        self._monotonic = 0.0
+
+    def monotonic(self) -> float:
+        """Return the simulated monotonic time."""
+        return self._monotonic
+
+    def utcnow(self) -> datetime:
+        """Return the simulated UTC time."""
+        return self._utcnow
+
+    def advance(self, delta: timedelta) -> None:
+        """Move the clock forward by the given duration."""
+        self._utcnow += delta
+        self._monotonic += delta.total_seconds()
+
+    def set(self, now: datetime) -> None:
+        """Move the clock to the given time.
+
+        Moving the wall time backwards does not move the monotonic time, just like a system clock adjustment.
+        """
+        now = _as_utc(now)
+        self._monotonic += max((now - self._utcnow).total_seconds(), 0)
+        self._utcnow = now
+
+
+class EventClock(Clock):
+    """A clock that reads the system clock, except while an event is applied, when it reads the time it was fired.
+
+    The events are applied some time after they were fired, reading the time they were fired keeps the durations
+    between them exact. The monotonic time of an event is derived from its age, and never goes backwards.
+    """
+
+    __slots__ = ("_event_utcnow", "_event_monotonic", "_last_monotonic")
+
+    def __init__(self):
+        """Initialize the clock on the system time."""
+        self._event_utcnow: datetime | None = None
+        self._event_monotonic: float | None = None
+        self._last_monotonic = 0.0  # The last monotonic time read from the clock
+
+    def monotonic(self) -> float:
+        """Return the monotonic time of the event, or of the system."""
+        if self._event_monotonic is not None:
+            monotonic = self._event_monotonic
+        else:
+            monotonic = time.monotonic()
+        self._last_monotonic = monotonic
+        return monotonic
+
+    def utcnow(self) -> datetime:
+        """Return the time the event was fired, or the current UTC time of the system."""
+        if self._event_utcnow is not None:
+            return self._event_utcnow
+        return datetime.now(timezone.utc)
+
+    def set_event_time(self, time_fired: datetime) -> None:
+        """Read the time the event was fired until the event time is cleared.
+
+        :param time_fired: The time the event was fired, naive datetimes are considered to be UTC.
+        """
+        time_fired = _as_utc(time_fired)
+        age = max((datetime.now(timezone.utc) - time_fired).total_seconds(), 0)
+        self._event_utcnow = time_fired
+        self._event_monotonic = max(time.monotonic() - age, self._last_monotonic)
+
+    def clear_event_time(self) -> None:
+        """Go back to reading the system time."""
+        self._event_utcnow = None
+        self._event_monotonic = None
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_date(value: str) -> datetime:
+    """Parse a date string into the UTC time of the local midnight of that date.
+
+    :param value: The date string.
+    :return: The timezone aware UTC datetime.
+    """
+    return datetime.strptime(value, DATE_FORMAT).astimezone(timezone.utc)
+
+
+def format_date(value: datetime) -> str:
+    """Format a datetime as the local date string.
+
+    :param value: The timezone aware datetime.
+    :return: The date string.
+    """
+    return value.astimezone().strftime(DATE_FORMAT)
@@ -3,6 +3,10 @@ from datetime import datetime, timedelta
 import logging
 
 from ..const import (
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_AGGREGATE_MIN_ON,
+    CONF_AGGREGATE_MODE,
+    CONF_ANOMALY_Z_SCORE,
     CONF_COUNT,
     CONF_ENTITY_ID,
     CONF_IS_ON_TEMPLATE,
@@ -13,16 +17,21 @@ from ..const import (
     CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
     DEFAULT_ON_STATES,
     STATE_DEVICE_TURN_ON_COUNT,
+    AggregateMode,
 )
-from .base_maintenance_logic import IsOnExpression, MaintenanceLogic
+from .base_maintenance_logic import IsOnExpression
+from .clock import Clock
+from .range_maintenance_logic import RangeMaintenanceLogic
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class CountMaintenanceLogic(MaintenanceLogic):
+class CountMaintenanceLogic(RangeMaintenanceLogic):
     """A class that represents the logic for maintaining a device based on the turn on count."""
 
-    _count: int  # The count of maintenance
+    __slots__ = (
+        "_device_turn_on_count",
+    )
 
     def __init__(self, *,
                  name: str,
@@ -32,7 +41,12 @@ class CountMaintenanceLogic(MaintenanceLogic):
                  entity_id: str | None,
                  on_states: list[str] | None,
                  is_on_expression: IsOnExpression | None,
-                 initial_last_maintenance_date: datetime | None = None):
+                 initial_last_maintenance_date: datetime | None = None,
+                 additional_entity_ids: list[str] | None = None,
+                 aggregate_mode: AggregateMode | None = None,
+                 aggregate_min_on: int | None = None,
+                 anomaly_z_score: float | None = None,
+                 clock: Clock | None = None):
         """Initialize a new instance of the MaintenanceLogic class.
 
         :param name: The name of the entity.
@@ -43,25 +57,36 @@ class CountMaintenanceLogic(MaintenanceLogic):
         :param on_states: The states in which the device is considered to be "on".
         :param is_on_expression: The expression to determine if the device is on.
         :param initial_last_maintenance_date: The initial last maintenance date.
+        :param additional_entity_ids: The unique identifiers of additional source entities.
+        :param aggregate_mode: The way the on state of the source entities is combined.
+        :param aggregate_min_on: The number of sources that must be on, used by the 'at least' mode.
+        :param anomaly_z_score: The z-score of the daily usage from which a day is anomalous, None to not detect.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         """
         super().__init__(
             name=name,
+            usage_limit=count,
+            min_interval=min_interval,
+            max_interval=max_interval,
             entity_id=entity_id,
             on_states=on_states,
             is_on_expression=is_on_expression,
             initial_last_maintenance_date=initial_last_maintenance_date,
+            additional_entity_ids=additional_entity_ids,
+            aggregate_mode=aggregate_mode,
+            aggregate_min_on=aggregate_min_on,
+            anomaly_z_score=anomaly_z_score,
+            clock=clock,
         )
-        self._count = count
-        self._min_interval = min_interval
-        self._max_interval = max_interval
 
         self._device_turn_on_count = 0
 
     @classmethod
-    def get_instance(cls, config: dict) -> "CountMaintenanceLogic":
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "CountMaintenanceLogic":
         """Return an instance of the maintenance logic.
 
         :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         :return: An instance of the maintenance logic.
         """
         return CountMaintenanceLogic(
@@ -73,6 +98,11 @@ class CountMaintenanceLogic(MaintenanceLogic):
             on_states=config.get(CONF_ON_STATES) or DEFAULT_ON_STATES,
             is_on_expression=config.get(CONF_IS_ON_TEMPLATE),
             initial_last_maintenance_date=config.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+            additional_entity_ids=config.get(CONF_ADDITIONAL_ENTITY_IDS),
+            aggregate_mode=config.get(CONF_AGGREGATE_MODE),
+            aggregate_min_on=config.get(CONF_AGGREGATE_MIN_ON),
+            anomaly_z_score=config.get(CONF_ANOMALY_Z_SCORE),
+            clock=clock,
         )
 
     def _reset(self):
@@ -80,88 +110,34 @@ class CountMaintenanceLogic(MaintenanceLogic):
 
     def _handle_turn_on(self):
         self._device_turn_on_count += 1
+        self._record_usage(1)
 
-    @property
-    def is_maintenance_needed(self) -> bool:
-        """Indicate whether maintenance is needed based on the turn on count.
-
-        :return: True if maintenance is needed, False otherwise.
-        """
-        # TODO: Create base class 'RangeMaintenanceLogic' and move this logic there (also from runtime logic)
-        _LOGGER.info(
-            "Checking if maintenance is needed for device '%s', Turn on count: %s, Min interval: %s, Max interval: "
-            "%s, Count: %s, Last Maintenance Date: %s, Last Reset Date: %s",
-            self._name,
-            self._device_turn_on_count,
-            self._min_interval,
-            self._max_interval,
-            self._count,
-            self._last_maintenance_date,
-            self._last_reset_date,
-        )
-        now = datetime.now()
-
-        if self._max_interval:
-            # Check if enough time has passed since the last maintenance
-            max_maintenance_date = self._last_maintenance_date + self._max_interval
-            if now > max_maintenance_date:
-                return True
-
-        if self._min_interval:
-            # Check if the minimum interval has passed since the last maintenance
-            min_maintenance_date = self._last_maintenance_date + self._min_interval
-            if now < min_maintenance_date:
-                return False
-
-        # Check if the count has been reached
-        return self._device_turn_on_count >= self._count
+    def _usage(self) -> float:
+        return self._device_turn_on_count
 
     def _get_state(self) -> dict[str, str]:
         return {
+            **super()._get_state(),
             STATE_DEVICE_TURN_ON_COUNT: str(self._device_turn_on_count),
         }
 
     def _restore_state(self, state: dict[str, str]):
+        super()._restore_state(state)
         self._device_turn_on_count = int(
             state.get(STATE_DEVICE_TURN_ON_COUNT, self._device_turn_on_count)
         )
 
     @property
-    def predicted_maintenance_date(self) -> datetime | None:
-        """Return the predicted maintenance date based on the average turn on per day.
+    def device_turn_on_count(self) -> int:
+        """Return the number of times the device turned on since the last reset."""
+        return self._device_turn_on_count
 
-        :return: The predicted maintenance date.
-        """
-        if self._last_reset_date is None:
-            return None
-
-        now = datetime.now()
-        days_since_last_maintenance = (
-                                              now - self._last_reset_date
-                                      ).total_seconds() / 86400
-        if days_since_last_maintenance == 0:
-            return None
-        average_turn_on_per_day = (
-                self._device_turn_on_count / days_since_last_maintenance
-        )
-        if average_turn_on_per_day == 0:
-            return None
-        turn_on_left_until_maintenance = self._count - self._device_turn_on_count
-        days_left_until_maintenance = (
-                turn_on_left_until_maintenance / average_turn_on_per_day
-        )
-        predicted_date = now + timedelta(days=days_left_until_maintenance)
-
-        # TODO: Create base class 'RangeMaintenanceLogic' and move this logic there (also from runtime logic)
-        # Ensure the predicted date falls within the min and max intervals
-        if self._min_interval:
-            min_maintenance_date = self._last_maintenance_date + self._min_interval
-            if predicted_date < min_maintenance_date:
-                return min_maintenance_date
-
-        if self._max_interval:
-            max_maintenance_date = self._last_maintenance_date + self._max_interval
-            if predicted_date > max_maintenance_date:
-                return max_maintenance_date
+    @property
+    def device_turn_ons_last_24_hours(self) -> int:
+        """Return the number of times the device turned on during the last 24 hours."""
+        return round(self._usage_in_last_hours(24))
 
-        return predicted_date
+    @property
+    def device_turn_on_remaining(self) -> int:
+        """Return the number of times the device can turn on until maintenance is needed."""
+        return max(int(self._usage_limit) - self._device_turn_on_count, 0)
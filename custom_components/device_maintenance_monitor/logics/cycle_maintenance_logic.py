@@ -0,0 +1,232 @@
+"""A module that defines the logic for maintaining a device based on the completed cycles."""
+from datetime import datetime, timedelta
+import logging
+
+from ..const import (
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_AGGREGATE_MIN_ON,
+    CONF_AGGREGATE_MODE,
+    CONF_ANOMALY_Z_SCORE,
+    CONF_COUNT,
+    CONF_ENTITY_ID,
+    CONF_IDLE_TIMEOUT,
+    CONF_IS_ON_TEMPLATE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_CYCLE_LENGTH,
+    CONF_MIN_INTERVAL,
+    CONF_NAME,
+    CONF_ON_STATES,
+    CONF_START_THRESHOLD,
+    CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
+    DEFAULT_CYCLE_IDLE_TIMEOUT,
+    DEFAULT_ON_STATES,
+    STATE_CYCLE_COUNT,
+    AggregateMode,
+)
+from .base_maintenance_logic import IsOnExpression
+from .clock import Clock
+from .numeric_state import parse_power
+from .range_maintenance_logic import RangeMaintenanceLogic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CycleMaintenanceLogic(RangeMaintenanceLogic):
+    """A class that represents the logic for maintaining a device based on the completed cycles.
+
+    Washing machines and dishwashers go on and off many times within a single cycle, so every turn on is not a use.
+    The device is active while its power is at or above the start threshold, or while it is in one of the on states
+    without a threshold. A cycle starts when the device becomes active, and ends once it has been idle for the idle
+    timeout, at the time it went idle. The cycles shorter than the minimum cycle length are not counted.
+
+    Every state is handled in constant time, and the only pending timer is the end of the current cycle, read from
+    next_update_time. A cycle still running when Home Assistant stops is not counted.
+    """
+
+    __slots__ = (
+        "_start_threshold",
+        "_min_cycle_length",
+        "_idle_timeout",
+        "_cycle_count",
+        "_cycle_start",
+        "_idle_since",
+        "_cycle_end_time",
+    )
+
+    _start_threshold: float | None  # The power (W) from which the device is active, None to use the on states
+    _min_cycle_length: timedelta | None  # The length from which a cycle is counted
+    _idle_timeout: timedelta  # The time the device stays idle before the cycle ends
+    _cycle_count: int  # The number of cycles completed since the last reset
+    _cycle_start: float | None  # The monotonic time the current cycle started, None when no cycle is running
+    _idle_since: float | None  # The monotonic time the device went idle during the current cycle
+    _cycle_end_time: datetime | None  # The time the current cycle ends unless the device becomes active again
+
+    _CONFIG_ATTRIBUTES = ("_start_threshold", "_min_cycle_length", "_idle_timeout")
+
+    def __init__(self, *,
+                 name: str,
+                 count: int,
+                 min_interval: timedelta | None,
+                 max_interval: timedelta | None,
+                 entity_id: str | None,
+                 on_states: list[str] | None,
+                 is_on_expression: IsOnExpression | None,
+                 start_threshold: float | None = None,
+                 min_cycle_length: timedelta | None = None,
+                 idle_timeout: timedelta | None = None,
+                 initial_last_maintenance_date: datetime | None = None,
+                 additional_entity_ids: list[str] | None = None,
+                 aggregate_mode: AggregateMode | None = None,
+                 aggregate_min_on: int | None = None,
+                 anomaly_z_score: float | None = None,
+                 clock: Clock | None = None):
+        """Initialize a new instance of the CycleMaintenanceLogic class.
+
+        :param name: The name of the entity.
+        :param count: The number of cycles between each maintenance.
+        :param min_interval: The minimum interval for maintenance.
+        :param max_interval: The maximum interval for maintenance.
+        :param entity_id: The unique identifier of the source power sensor or status entity.
+        :param on_states: The states in which the device is considered to be active, used without a start threshold.
+        :param is_on_expression: The expression to determine if the device is active, used without a start threshold.
+        :param start_threshold: The power (W) from which the device is active.
+        :param min_cycle_length: The length from which a cycle is counted.
+        :param idle_timeout: The time the device stays idle before the cycle ends.
+        :param initial_last_maintenance_date: The initial last maintenance date.
+        :param additional_entity_ids: The unique identifiers of additional source entities.
+        :param aggregate_mode: The way the on state of the source entities is combined.
+        :param aggregate_min_on: The number of sources that must be on, used by the 'at least' mode.
+        :param anomaly_z_score: The z-score of the daily usage from which a day is anomalous, None to not detect.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        """
+        super().__init__(
+            name=name,
+            usage_limit=count,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            entity_id=entity_id,
+            on_states=on_states,
+            is_on_expression=is_on_expression,
+            initial_last_maintenance_date=initial_last_maintenance_date,
+            additional_entity_ids=additional_entity_ids,
+            aggregate_mode=aggregate_mode,
+            aggregate_min_on=aggregate_min_on,
+            anomaly_z_score=anomaly_z_score,
+            clock=clock,
+        )
+
+        self._start_threshold = start_threshold
+        self._min_cycle_length = min_cycle_length
+        self._idle_timeout = idle_timeout or DEFAULT_CYCLE_IDLE_TIMEOUT
+        self._cycle_count = 0
+        self._cycle_start = None
+        self._idle_since = None
+        self._cycle_end_time = None
+
+    @classmethod
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "CycleMaintenanceLogic":
+        """Return an instance of the maintenance logic.
+
+        :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        :return: An instance of the maintenance logic.
+        """
+        start_threshold = config.get(CONF_START_THRESHOLD)
+        return CycleMaintenanceLogic(
+            name=config.get(CONF_NAME),
+            count=config.get(CONF_COUNT),
+            min_interval=config.get(CONF_MIN_INTERVAL),
+            max_interval=config.get(CONF_MAX_INTERVAL),
+            entity_id=config.get(CONF_ENTITY_ID),
+            on_states=config.get(CONF_ON_STATES) or DEFAULT_ON_STATES,
+            is_on_expression=config.get(CONF_IS_ON_TEMPLATE),
+            start_threshold=float(start_threshold) if start_threshold is not None else None,
+            min_cycle_length=config.get(CONF_MIN_CYCLE_LENGTH),
+            idle_timeout=config.get(CONF_IDLE_TIMEOUT),
+            initial_last_maintenance_date=config.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+            additional_entity_ids=config.get(CONF_ADDITIONAL_ENTITY_IDS),
+            aggregate_mode=config.get(CONF_AGGREGATE_MODE),
+            aggregate_min_on=config.get(CONF_AGGREGATE_MIN_ON),
+            anomaly_z_score=config.get(CONF_ANOMALY_Z_SCORE),
+            clock=clock,
+        )
+
+    async def _is_device_on(self, state: str) -> bool:
+        if self._start_threshold is None:
+            return await super()._is_device_on(state)
+        power = parse_power(state)
+        return power is not None and power >= self._start_threshold
+
+    def _end_cycle_if_idle(self):
+        """Complete the current cycle once the device has been idle for the idle timeout."""
+        if self._cycle_end_time is None or self._clock.utcnow() < self._cycle_end_time:
+            return
+
+        cycle_length = self._idle_since - self._cycle_start
+        if self._min_cycle_length is None or cycle_length >= self._min_cycle_length.total_seconds():
+            self._cycle_count += 1
+            self._record_usage(1)
+        else:
+            _LOGGER.debug("Ignoring a cycle of %ss for device '%s', too short", cycle_length, self._name)
+        self._cycle_start = None
+        self._idle_since = None
+        self._cycle_end_time = None
+
+    def _handle_source_state(self, state: str):
+        # The cycle that timed out before this state is completed first, the state may start the next one
+        self._end_cycle_if_idle()
+
+    def _handle_turn_on(self):
+        if self._cycle_start is None:
+            self._cycle_start = self._clock.monotonic()
+        self._idle_since = None
+        self._cycle_end_time = None
+
+    def _handle_turn_off(self):
+        if self._cycle_start is None:
+            return
+        self._idle_since = self._clock.monotonic()
+        self._cycle_end_time = self._clock.utcnow() + self._idle_timeout
+
+    def _reset(self):
+        # The running cycle is counted after the maintenance
+        self._cycle_count = 0
+
+    def _usage(self) -> float:
+        return self._cycle_count
+
+    def _get_state(self) -> dict[str, str]:
+        return {
+            **super()._get_state(),
+            STATE_CYCLE_COUNT: str(self._cycle_count),
+        }
+
+    def _restore_state(self, state: dict[str, str]):
+        super()._restore_state(state)
+        self._cycle_count = int(
+            state.get(STATE_CYCLE_COUNT, self._cycle_count)
+        )
+
+    @property
+    def cycle_count(self) -> int:
+        """Return the number of cycles completed since the last reset."""
+        return self._cycle_count
+
+    @property
+    def cycle_remaining(self) -> int:
+        """Return the number of cycles the device can complete until maintenance is needed."""
+        return max(int(self._usage_limit) - self._cycle_count, 0)
+
+    @property
+    def is_cycle_running(self) -> bool:
+        """Return whether a cycle is running."""
+        return self._cycle_start is not None
+
+    @property
+    def next_update_time(self) -> datetime | None:
+        """Return the time the current cycle ends unless the device becomes active again."""
+        return self._cycle_end_time
+
+    def update(self):
+        """Complete the current cycle once the idle timeout elapsed."""
+        self._end_cycle_if_idle()
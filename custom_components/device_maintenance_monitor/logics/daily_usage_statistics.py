@@ -0,0 +1,108 @@
+"""Provides the streaming statistics of the daily usage of a device, used to detect unusual days."""
+from datetime import date, datetime, timezone
+import math
+
+
+class DailyUsageStatistics:
+    """A class that keeps the mean and the variance of the usage per day, updated with Welford's algorithm.
+
+    Only the usage of the current day and the running statistics of the completed days are kept, so the memory is
+    constant however long the device is monitored. The days are counted in UTC, and the days without any usage are
+    folded in as idle days when the next usage is added.
+    """
+
+    __slots__ = ("_day", "_day_usage", "_days", "_mean", "_m2")
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self._day: date | None = None  # The current day
+        self._day_usage = 0.0  # The usage during the current day
+        self._days = 0  # The number of completed days
+        self._mean = 0.0  # The mean usage of the completed days
+        self._m2 = 0.0  # The sum of the squared differences from the mean of the completed days
+
+    def _add_days(self, count: int, usage: float):
+        """Fold a number of days with the same usage into the statistics, as one batch of Chan's update."""
+        days = self._days + count
+        delta = usage - self._mean
+        self._mean += delta * count / days
+        self._m2 += delta * delta * self._days * count / days
+        self._days = days
+
+    def roll_over(self, now: datetime):
+        """Complete the days before the given time.
+
+        :param now: The current UTC time.
+        """
+        today = now.astimezone(timezone.utc).date()
+        if self._day is None:
+            self._day = today
+            return
+        if today <= self._day:
+            return
+
+        self._add_days(1, self._day_usage)
+        idle_days = (today - self._day).days - 1
+        if idle_days:
+            self._add_days(idle_days, 0.0)
+        self._day = today
+        self._day_usage = 0.0
+
+    def add(self, now: datetime, usage: float):
+        """Add usage to the day of the given time.
+
+        :param now: The current UTC time.
+        :param usage: The usage to add, in the unit of the logic.
+        """
+        self.roll_over(now)
+        self._day_usage += usage
+
+    @property
+    def day_usage(self) -> float:
+        """Return the usage during the current day."""
+        return self._day_usage
+
+    @property
+    def days(self) -> int:
+        """Return the number of completed days."""
+        return self._days
+
+    @property
+    def mean(self) -> float:
+        """Return the mean usage of the completed days."""
+        return self._mean
+
+    @property
+    def stdev(self) -> float:
+        """Return the sample standard deviation of the usage of the completed days."""
+        if self._days < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self._days - 1))
+
+    def z_score(self, min_days: int) -> float | None:
+        """Return how many standard deviations the usage of the current day is above the mean.
+
+        :param min_days: The number of completed days needed before the usage is compared.
+        :return: The z-score, or None if there are not enough days or the usage never varied.
+        """
+        stdev = self.stdev
+        if self._days < min_days or stdev == 0:
+            return None
+        return (self._day_usage - self._mean) / stdev
+
+    def to_state(self) -> str:
+        """Return the statistics as a string to store in the state of the logic."""
+        day = self._day.isoformat() if self._day else ""
+        return f"{day},{self._day_usage},{self._days},{self._mean},{self._m2}"
+
+    def restore_state(self, value: str):
+        """Restore the statistics from a string returned by to_state.
+
+        :param value: The stored statistics.
+        """
+        day, day_usage, days, mean, m2 = value.split(",")
+        self._day = date.fromisoformat(day) if day else None
+        self._day_usage = float(day_usage)
+        self._days = int(days)
+        self._mean = float(mean)
+        self._m2 = float(m2)
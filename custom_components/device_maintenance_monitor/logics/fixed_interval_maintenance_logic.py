@@ -9,37 +9,46 @@ from ..const import (
     DEFAULT_FIXED_INTERVAL_UPDATE_FREQUENCY,
 )
 from .base_maintenance_logic import MaintenanceLogic
+from .clock import Clock
 
 
 class FixedIntervalMaintenanceLogic(MaintenanceLogic):
     """A class that represents the logic for maintaining a device based on a fixed interval."""
 
+    __slots__ = ("_interval",)
+
     _interval: timedelta  # The interval for maintenance
 
+    _CONFIG_ATTRIBUTES = ("_interval",)
+
     def __init__(self, *,
                  name: str,
                  interval: timedelta,
                  entity_id: str | None,
-                 initial_last_maintenance_date: datetime | None = None):
+                 initial_last_maintenance_date: datetime | None = None,
+                 clock: Clock | None = None):
         """Initialize a new instance of the MaintenanceLogic class.
 
         :param name: The name of the entity.
         :param interval: The interval for maintenance.
         :param entity_id: The unique identifier of the source entity.
         :param initial_last_maintenance_date: The initial last maintenance date.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         """
         super().__init__(
             entity_id=entity_id,
             name=name,
             initial_last_maintenance_date=initial_last_maintenance_date,
+            clock=clock,
         )
         self._interval = interval
 
     @classmethod
-    def get_instance(cls, config: dict) -> "FixedIntervalMaintenanceLogic":
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "FixedIntervalMaintenanceLogic":
         """Return an instance of the maintenance logic.
 
         :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         :return: An instance of the maintenance logic.
         """
         return FixedIntervalMaintenanceLogic(
@@ -47,17 +56,18 @@ class FixedIntervalMaintenanceLogic(MaintenanceLogic):
             interval=config.get(CONF_INTERVAL),
             entity_id=config.get(CONF_ENTITY_ID),
             initial_last_maintenance_date=config.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+            clock=clock,
         )
 
-    @property
-    def is_maintenance_needed(self) -> bool:
+    def _is_maintenance_needed_at(self, now: datetime) -> bool:
         """Indicate whether maintenance is needed based on the fixed interval.
 
+        :param now: The current UTC time.
         :return: True if maintenance is needed, False otherwise.
         """
         if self._last_maintenance_date is None:
             return True
-        return datetime.now() - self._last_maintenance_date >= self._interval
+        return now - self._last_maintenance_date >= self._interval
 
     @property
     def update_frequency(self) -> timedelta | None:
@@ -67,10 +77,10 @@ class FixedIntervalMaintenanceLogic(MaintenanceLogic):
         """
         return DEFAULT_FIXED_INTERVAL_UPDATE_FREQUENCY
 
-    @property
-    def predicted_maintenance_date(self) -> datetime | None:
+    def _predicted_maintenance_date_at(self, now: datetime) -> datetime | None:
         """Return the predicted maintenance date based on the fixed interval.
 
+        :param now: The current UTC time.
         :return: The predicted maintenance date.
         """
         if self._last_maintenance_date is None:
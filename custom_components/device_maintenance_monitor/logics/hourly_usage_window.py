@@ -0,0 +1,104 @@
+"""Provides the rolling window of the hourly usage of a device, used for the usage over the last hours."""
+from array import array
+from datetime import datetime
+
+# A week, and the hour before it that is partially part of a week long sliding window
+HOURS_PER_WINDOW = 169
+SECONDS_PER_HOUR = 3600
+
+
+def _hour_index(now: datetime) -> tuple[int, float]:
+    """Return the number of whole hours between the epoch and a timezone aware datetime, and the fraction elapsed."""
+    hour, seconds = divmod(now.timestamp(), SECONDS_PER_HOUR)
+    return int(hour), seconds / SECONDS_PER_HOUR
+
+
+class HourlyUsageWindow:
+    """A class that keeps the usage of every hour of the last week in a ring of hourly buckets.
+
+    The usage over the last hours adds up the buckets of the hours within the range, and the part of the oldest bucket
+    that is still within the range, assuming the usage was spread evenly over that hour.
+
+    Adding usage only touches the bucket of the current hour, and clears the buckets of the hours skipped since the
+    last update, so it never walks more than the window. The buckets are single precision floats and are only
+    allocated once the device is used, to keep the idle monitors small.
+    """
+
+    __slots__ = ("_buckets", "_hour")
+
+    def __init__(self):
+        """Initialize an empty window."""
+        self._buckets: array | None = None  # The usage of every hour, indexed by the hour modulo the window
+        self._hour = 0  # The hour of the newest bucket, counted from the epoch
+
+    def _advance(self, hour: int):
+        """Move the newest bucket to the given hour, clearing the buckets of the hours in between."""
+        elapsed = hour - self._hour
+        if elapsed <= 0:
+            return
+        if elapsed >= HOURS_PER_WINDOW:
+            self._buckets = array("f", bytes(4 * HOURS_PER_WINDOW))
+        else:
+            for skipped_hour in range(self._hour + 1, hour + 1):
+                self._buckets[skipped_hour % HOURS_PER_WINDOW] = 0.0
+        self._hour = hour
+
+    def add(self, now: datetime, usage: float):
+        """Add usage to the hour of the given time.
+
+        :param now: The current UTC time.
+        :param usage: The usage to add, in the unit of the logic.
+        """
+        hour, __ = _hour_index(now)
+        if self._buckets is None:
+            self._buckets = array("f", bytes(4 * HOURS_PER_WINDOW))
+            self._hour = hour
+        else:
+            # Usage reported late is added to the newest hour
+            self._advance(hour)
+        self._buckets[self._hour % HOURS_PER_WINDOW] += usage
+
+    def total(self, now: datetime, hours: int) -> float:
+        """Return the usage of the last hours, including the current hour.
+
+        :param now: The current UTC time.
+        :param hours: The number of hours, up to a week.
+        :return: The usage during the hours.
+        """
+        if self._buckets is None:
+            return 0.0
+        hour, fraction = _hour_index(now)
+        self._advance(hour)
+        oldest_hour = self._hour - min(hours, HOURS_PER_WINDOW - 1)
+        usage = sum(
+            self._buckets[bucket_hour % HOURS_PER_WINDOW]
+            for bucket_hour in range(oldest_hour + 1, self._hour + 1)
+        )
+        return usage + self._buckets[oldest_hour % HOURS_PER_WINDOW] * (1 - fraction)
+
+    def to_state(self) -> str:
+        """Return the window as a string to store in the state of the logic, the newest hour first."""
+        if self._buckets is None:
+            return ""
+        usage = [
+            f"{self._buckets[hour % HOURS_PER_WINDOW]:g}"
+            for hour in range(self._hour, self._hour - HOURS_PER_WINDOW, -1)
+        ]
+        # The hours without usage at the end of the window are implied
+        while usage and usage[-1] == "0":
+            usage.pop()
+        return ",".join([str(self._hour), *usage])
+
+    def restore_state(self, value: str):
+        """Restore the window from a string returned by to_state.
+
+        :param value: The stored window.
+        """
+        if not value:
+            self._buckets = None
+            return
+        hour, *usage = value.split(",")
+        self._hour = int(hour)
+        self._buckets = array("f", bytes(4 * HOURS_PER_WINDOW))
+        for offset, hourly_usage in enumerate(usage[:HOURS_PER_WINDOW]):
+            self._buckets[(self._hour - offset) % HOURS_PER_WINDOW] = float(hourly_usage)
@@ -0,0 +1,166 @@
+"""A module that defines the logic for maintaining a device based on a cumulative meter."""
+from datetime import datetime, timedelta
+import logging
+
+from ..const import (
+    CONF_CONSUMPTION,
+    CONF_ENTITY_ID,
+    CONF_MAX_DELTA,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_NAME,
+    CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
+    STATE_METER_CONSUMED,
+    STATE_METER_LAST_VALUE,
+)
+from .clock import Clock
+from .numeric_state import parse_number
+from .range_maintenance_logic import RangeMaintenanceLogic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MeterMaintenanceLogic(RangeMaintenanceLogic):
+    """A class that represents the logic for maintaining a device based on a cumulative meter.
+
+    The consumption is accumulated from the deltas between consecutive meter readings. A reading lower than the
+    previous one, or a delta larger than the maximum delta, is held until the next reading. When the next reading
+    continues from the previous reading, the held reading was a glitch and is dropped. When it continues from the held
+    reading, the held reading is confirmed: after a drop the meter was reset and the new reading is the consumption
+    since the reset, after a jump the whole jump is counted.
+    """
+
+    __slots__ = (
+        "_max_delta",
+        "_meter_consumed",
+        "_last_meter_value",
+        "_pending_value",
+    )
+
+    _max_delta: float | None  # The largest delta accepted between two consecutive readings
+
+    _CONFIG_ATTRIBUTES = ("_max_delta",)
+
+    def __init__(self, *,
+                 name: str,
+                 consumption: float,
+                 max_delta: float | None,
+                 min_interval: timedelta | None,
+                 max_interval: timedelta | None,
+                 entity_id: str | None,
+                 initial_last_maintenance_date: datetime | None = None,
+                 clock: Clock | None = None):
+        """Initialize a new instance of the MaintenanceLogic class.
+
+        :param name: The name of the entity.
+        :param consumption: The consumed units between each maintenance.
+        :param max_delta: The largest delta accepted between two consecutive readings.
+        :param min_interval: The minimum interval for maintenance.
+        :param max_interval: The maximum interval for maintenance.
+        :param entity_id: The unique identifier of the source meter entity.
+        :param initial_last_maintenance_date: The initial last maintenance date.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        """
+        super().__init__(
+            name=name,
+            usage_limit=consumption,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            entity_id=entity_id,
+            initial_last_maintenance_date=initial_last_maintenance_date,
+            clock=clock,
+        )
+        self._max_delta = max_delta
+
+        self._meter_consumed = 0.0  # The consumed units since the last reset
+        self._last_meter_value: float | None = None  # The last accepted meter reading
+        self._pending_value: float | None = None  # A held reading waiting to be confirmed by the next reading
+
+    @classmethod
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "MeterMaintenanceLogic":
+        """Return an instance of the maintenance logic.
+
+        :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        :return: An instance of the maintenance logic.
+        """
+        max_delta = config.get(CONF_MAX_DELTA)
+        return MeterMaintenanceLogic(
+            name=config.get(CONF_NAME),
+            consumption=float(config.get(CONF_CONSUMPTION)),
+            max_delta=float(max_delta) if max_delta else None,
+            min_interval=config.get(CONF_MIN_INTERVAL),
+            max_interval=config.get(CONF_MAX_INTERVAL),
+            entity_id=config.get(CONF_ENTITY_ID),
+            initial_last_maintenance_date=config.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+            clock=clock,
+        )
+
+    def _is_valid_delta(self, delta: float) -> bool:
+        return delta >= 0 and (self._max_delta is None or delta <= self._max_delta)
+
+    def _handle_source_state(self, state: str):
+        value = parse_number(state)
+        if value is None:
+            # The meter is unavailable, keep the last reading to compute the delta when it is back
+            return
+
+        if self._last_meter_value is None:
+            # First reading, nothing to accumulate yet
+            self._last_meter_value = value
+            return
+
+        delta = value - self._last_meter_value
+        pending_value = self._pending_value
+        if pending_value is not None and not self._is_valid_delta(delta) and self._is_valid_delta(value - pending_value):
+            if pending_value < self._last_meter_value:
+                # The drop has been confirmed, the meter was reset and the reading is the consumption since the reset
+                delta = value
+            # Otherwise the jump has been confirmed and is counted in full
+        elif not self._is_valid_delta(delta):
+            _LOGGER.warning(
+                "Holding meter reading %s of device '%s' until the next reading confirms it, the last reading is %s",
+                value,
+                self._name,
+                self._last_meter_value,
+            )
+            self._pending_value = value
+            return
+
+        self._pending_value = None
+        self._meter_consumed += delta
+        self._last_meter_value = value
+
+    def _reset(self):
+        # Reset the consumed units to 0, the next delta is computed from the last reading
+        self._meter_consumed = 0.0
+
+    def _usage(self) -> float:
+        return self._meter_consumed
+
+    def _get_state(self) -> dict[str, str]:
+        state = {
+            STATE_METER_CONSUMED: str(round(self._meter_consumed, 3)),
+        }
+        if self._last_meter_value is not None:
+            state[STATE_METER_LAST_VALUE] = str(self._last_meter_value)
+        return state
+
+    def _restore_state(self, state: dict[str, str]):
+        self._meter_consumed = float(
+            state.get(STATE_METER_CONSUMED, self._meter_consumed)
+        )
+        last_meter_value = state.get(STATE_METER_LAST_VALUE)
+        if last_meter_value is not None:
+            # Count the consumption while Home Assistant was down from the last known reading
+            self._last_meter_value = float(last_meter_value)
+
+    @property
+    def meter_consumed(self) -> float:
+        """Return the units consumed since the last reset."""
+        return self._meter_consumed
+
+    @property
+    def meter_remaining(self) -> float:
+        """Return the units left to consume until maintenance is needed."""
+        return max(self._usage_limit - self._meter_consumed, 0.0)
@@ -0,0 +1,29 @@
+"""Provides the parsers of the numeric states reported by the source entities, e.g. power sensors and meters."""
+import math
+
+
+def parse_number(state: str | float | None) -> float | None:
+    """Parse the state of a numeric entity into a number.
+
+    :param state: The state of the entity.
+    :return: The number, or None if the state is not a finite number, e.g. while the entity is unavailable.
+    """
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(value):
+        return None
+    return value
+
+
+def parse_power(state: str | float | None) -> float | None:
+    """Parse the state of a power sensor into watts.
+
+    :param state: The state of the power sensor.
+    :return: The power in watts, or None if the state is not a valid reading.
+    """
+    power = parse_number(state)
+    if power is None or power < 0:
+        return None
+    return power
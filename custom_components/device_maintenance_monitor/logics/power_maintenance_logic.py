@@ -0,0 +1,175 @@
+"""A module that defines the logic for maintaining a device based on the consumed energy."""
+from datetime import datetime, timedelta
+import logging
+
+from ..const import (
+    CONF_ENERGY,
+    CONF_ENTITY_ID,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_NAME,
+    CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
+    DEFAULT_POWER_MAX_SAMPLE_GAP,
+    DEFAULT_POWER_UPDATE_FREQUENCY,
+    STATE_ENERGY_CONSUMED,
+)
+from .clock import Clock
+from .numeric_state import parse_power
+from .range_maintenance_logic import RangeMaintenanceLogic
+
+_LOGGER = logging.getLogger(__name__)
+
+_WATT_SECONDS_PER_KWH = 3_600_000
+
+
+class PowerMaintenanceLogic(RangeMaintenanceLogic):
+    """A class that represents the logic for maintaining a device based on the consumed energy.
+
+    The power sensor is integrated into kWh incrementally on every reported state using the trapezoidal rule.
+    When two samples are further apart than the maximum sample gap, the previous reading is held instead of
+    interpolated, and no energy is accumulated while the sensor is unavailable.
+
+    Between two samples, the periodic update holds the last reading up to the current time so the usage keeps up with
+    a steady load. That estimate is replaced by the integral between the samples once the next sample arrives, which
+    can be lower. The reported energy never goes down until the next reset, so the total sensor does not record the
+    correction as negative consumption.
+    """
+
+    __slots__ = (
+        "_energy_consumed",
+        "_held_energy",
+        "_reported_energy",
+        "_last_sample_time",
+        "_last_sample_power",
+    )
+
+    def __init__(self, *,
+                 name: str,
+                 energy: float,
+                 min_interval: timedelta | None,
+                 max_interval: timedelta | None,
+                 entity_id: str | None,
+                 initial_last_maintenance_date: datetime | None = None,
+                 clock: Clock | None = None):
+        """Initialize a new instance of the MaintenanceLogic class.
+
+        :param name: The name of the entity.
+        :param energy: The energy (kWh) consumed between each maintenance.
+        :param min_interval: The minimum interval for maintenance.
+        :param max_interval: The maximum interval for maintenance.
+        :param entity_id: The unique identifier of the source power sensor.
+        :param initial_last_maintenance_date: The initial last maintenance date.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        """
+        super().__init__(
+            name=name,
+            usage_limit=energy,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            entity_id=entity_id,
+            initial_last_maintenance_date=initial_last_maintenance_date,
+            clock=clock,
+        )
+
+        self._energy_consumed = 0.0  # The energy (kWh) consumed since the last reset, up to the last sample
+        self._held_energy = 0.0  # The energy (kWh) estimated since the last sample by holding its reading
+        self._reported_energy = 0.0  # The highest energy (kWh) reported since the last reset
+        self._last_sample_time: float | None = None  # The monotonic time of the last valid power reading
+        self._last_sample_power: float | None = None  # The last valid power reading (W)
+
+    @classmethod
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "PowerMaintenanceLogic":
+        """Return an instance of the maintenance logic.
+
+        :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        :return: An instance of the maintenance logic.
+        """
+        return PowerMaintenanceLogic(
+            name=config.get(CONF_NAME),
+            energy=float(config.get(CONF_ENERGY)),
+            min_interval=config.get(CONF_MIN_INTERVAL),
+            max_interval=config.get(CONF_MAX_INTERVAL),
+            entity_id=config.get(CONF_ENTITY_ID),
+            initial_last_maintenance_date=config.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+            clock=clock,
+        )
+
+    def _integrate(self, now: float, power: float | None):
+        """Add the energy consumed since the last sample and record the new sample.
+
+        :param now: The monotonic time of the new sample.
+        :param power: The new power reading (W), or None if the sensor is unavailable.
+        """
+        self._held_energy = 0.0
+        if self._last_sample_time is not None and self._last_sample_power is not None:
+            elapsed = now - self._last_sample_time
+            if elapsed > 0:
+                if power is None or elapsed > DEFAULT_POWER_MAX_SAMPLE_GAP.total_seconds():
+                    # Hold the previous reading over the gap instead of interpolating
+                    average_power = self._last_sample_power
+                else:
+                    average_power = (self._last_sample_power + power) / 2
+                self._energy_consumed += average_power * elapsed / _WATT_SECONDS_PER_KWH
+
+        self._last_sample_time = now if power is not None else None
+        self._last_sample_power = power
+        self._report_energy()
+
+    def _report_energy(self):
+        """Raise the reported energy to the current usage, keeping it when the estimate was corrected down."""
+        self._reported_energy = max(self._reported_energy, self._usage())
+
+    def _handle_source_state(self, state: str):
+        self._integrate(self._clock.monotonic(), parse_power(state))
+
+    def _reset(self):
+        # Reset the consumed energy to 0, and start integrating from the current reading
+        self._energy_consumed = 0.0
+        self._held_energy = 0.0
+        self._reported_energy = 0.0
+        if self._last_sample_time is not None:
+            self._last_sample_time = self._clock.monotonic()
+
+    def _usage(self) -> float:
+        return self._energy_consumed + self._held_energy
+
+    def _get_state(self) -> dict[str, str]:
+        return {
+            STATE_ENERGY_CONSUMED: str(round(self._reported_energy, 3)),
+        }
+
+    def _restore_state(self, state: dict[str, str]):
+        self._energy_consumed = float(
+            state.get(STATE_ENERGY_CONSUMED, self._energy_consumed)
+        )
+        self._reported_energy = self._energy_consumed
+
+    @property
+    def energy_consumed(self) -> float:
+        """Return the energy (kWh) consumed since the last reset, never lower than the energy reported before."""
+        return self._reported_energy
+
+    @property
+    def energy_remaining(self) -> float:
+        """Return the energy (kWh) left to consume until maintenance is needed."""
+        return max(self._usage_limit - self._reported_energy, 0.0)
+
+    @property
+    def update_frequency(self) -> timedelta | None:
+        """Return the update frequency of the device.
+
+        :return: The update frequency of the device.
+        """
+        return DEFAULT_POWER_UPDATE_FREQUENCY
+
+    def update(self):
+        """Estimate the energy since the last sample by holding its reading up to the current time.
+
+        The last sample is kept, so the next sample is still integrated from it with the trapezoidal rule.
+        """
+        if self._last_sample_time is None:
+            return
+        elapsed = self._clock.monotonic() - self._last_sample_time
+        self._held_energy = max(elapsed, 0) * self._last_sample_power / _WATT_SECONDS_PER_KWH
+        self._report_energy()
@@ -0,0 +1,260 @@
+"""Provides the base class for the logics that need maintenance after some usage, within a range of dates."""
+from abc import abstractmethod
+from datetime import date, datetime, timedelta
+import logging
+
+from ..const import (
+    DEFAULT_ANOMALY_MIN_DAYS,
+    STATE_DAILY_USAGE,
+    STATE_HOURLY_USAGE,
+    AggregateMode,
+)
+from .base_maintenance_logic import IsOnExpression, MaintenanceLogic
+from .clock import Clock
+from .daily_usage_statistics import DailyUsageStatistics
+from .hourly_usage_window import HourlyUsageWindow
+from .usage_profile import UsageProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RangeMaintenanceLogic(MaintenanceLogic):
+    """An abstract base class for the logics that need maintenance once the usage reaches a limit.
+
+    The maintenance is needed no earlier than the minimum interval and no later than the maximum interval after the
+    last maintenance. The deadlines are computed when the maintenance dates change, instead of on every read, and the
+    predicted date is kept until the usage changes, the logic is reset or the day rolls over.
+
+    The prediction extrapolates the average usage since the last reset, or follows the usage profile of the device
+    when one was fitted.
+
+    The logics that report their usage as it happens also keep the usage of every hour of the last week, for the usage
+    over the last day and week. When an anomaly z-score is set, they also keep the statistics of their daily usage, and
+    a day whose usage is that many standard deviations above the mean is reported as anomalous.
+    """
+
+    __slots__ = (
+        "_min_interval",
+        "_max_interval",
+        "_usage_limit",
+        "_min_deadline",
+        "_max_deadline",
+        "_prediction_key",
+        "_prediction",
+        "_usage_profile",
+        "_anomaly_z_score",
+        "_daily_usage",
+        "_usage_window",
+    )
+
+    _min_interval: timedelta | None  # The minimum interval for maintenance
+    _max_interval: timedelta | None  # The maximum interval for maintenance
+    _usage_limit: float  # The usage between each maintenance, in the unit of the logic
+    _min_deadline: datetime | None  # The date the maintenance can be needed from
+    _max_deadline: datetime | None  # The date the maintenance is needed by, regardless of the usage
+    _prediction_key: tuple[float, date] | None  # The usage and the day the cached prediction was made for
+    _prediction: datetime | None  # The cached predicted maintenance date
+    _usage_profile: UsageProfile | None  # The expected usage for every hour of the week
+    _anomaly_z_score: float | None  # The z-score of the daily usage from which a day is anomalous
+    _daily_usage: DailyUsageStatistics | None  # The statistics of the daily usage, when detecting anomalies
+    _usage_window: HourlyUsageWindow  # The usage of every hour of the last week
+
+    # The statistics of the daily usage are kept, enabling or disabling the anomaly detection reloads the entry
+    _CONFIG_ATTRIBUTES = ("_usage_limit", "_min_interval", "_max_interval", "_anomaly_z_score")
+
+    def __init__(self, *,
+                 name: str,
+                 usage_limit: float,
+                 min_interval: timedelta | None,
+                 max_interval: timedelta | None,
+                 entity_id: str | None,
+                 on_states: list[str] | None = None,
+                 is_on_expression: IsOnExpression | None = None,
+                 initial_last_maintenance_date: datetime | None = None,
+                 additional_entity_ids: list[str] | None = None,
+                 aggregate_mode: AggregateMode | None = None,
+                 aggregate_min_on: int | None = None,
+                 anomaly_z_score: float | None = None,
+                 clock: Clock | None = None):
+        """Initialize a new instance of the RangeMaintenanceLogic class.
+
+        :param name: The name of the entity.
+        :param usage_limit: The usage between each maintenance, in the unit of the logic.
+        :param min_interval: The minimum interval for maintenance.
+        :param max_interval: The maximum interval for maintenance.
+        :param entity_id: The unique identifier of the source entity.
+        :param on_states: The states in which the device is considered to be "on".
+        :param is_on_expression: The expression to determine if the device is on.
+        :param initial_last_maintenance_date: The initial last maintenance date.
+        :param additional_entity_ids: The unique identifiers of additional source entities.
+        :param aggregate_mode: The way the on state of the source entities is combined.
+        :param aggregate_min_on: The number of sources that must be on, used by the 'at least' mode.
+        :param anomaly_z_score: The z-score of the daily usage from which a day is anomalous, None to not detect.
+        :param clock: The clock used to read the current time, defaults to the system clock.
+        """
+        super().__init__(
+            name=name,
+            entity_id=entity_id,
+            on_states=on_states,
+            is_on_expression=is_on_expression,
+            initial_last_maintenance_date=initial_last_maintenance_date,
+            additional_entity_ids=additional_entity_ids,
+            aggregate_mode=aggregate_mode,
+            aggregate_min_on=aggregate_min_on,
+            clock=clock,
+        )
+        self._usage_limit = usage_limit
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._usage_profile = None
+        self._anomaly_z_score = anomaly_z_score
+        self._daily_usage = DailyUsageStatistics() if anomaly_z_score else None
+        self._usage_window = HourlyUsageWindow()
+        self._maintenance_dates_changed()
+
+    @abstractmethod
+    def _usage(self) -> float:
+        """Return the usage since the last reset, in the unit of the logic.
+
+        :return: The usage since the last reset.
+        """
+        raise NotImplementedError
+
+    def _record_usage(self, usage: float):
+        """Add usage to the hourly window and the statistics of the daily usage, which are kept across the resets.
+
+        :param usage: The usage to add, in the unit of the logic.
+        """
+        now = self._clock.utcnow()
+        self._usage_window.add(now, usage)
+        if self._daily_usage is not None:
+            self._daily_usage.add(now, usage)
+
+    def _usage_in_last_hours(self, hours: int) -> float:
+        """Return the usage during the last hours, at the precision of an hour.
+
+        :param hours: The number of hours, up to a week.
+        :return: The usage during the hours, in the unit of the logic.
+        """
+        return self._usage_window.total(self._clock.utcnow(), hours)
+
+    def _get_restore_only_state(self) -> dict[str, str]:
+        # The usage statistics change on every update, they are only stored to be restored
+        state = {}
+        if hourly_usage := self._usage_window.to_state():
+            state[STATE_HOURLY_USAGE] = hourly_usage
+        if self._daily_usage is not None:
+            state[STATE_DAILY_USAGE] = self._daily_usage.to_state()
+        return state
+
+    def _restore_state(self, state: dict[str, str]):
+        if hourly_usage := state.get(STATE_HOURLY_USAGE):
+            self._usage_window.restore_state(hourly_usage)
+        if self._daily_usage is not None and (daily_usage := state.get(STATE_DAILY_USAGE)):
+            self._daily_usage.restore_state(daily_usage)
+
+    @property
+    def detects_usage_anomalies(self) -> bool:
+        """Return whether the statistics of the daily usage are kept to detect anomalies."""
+        return self._daily_usage is not None
+
+    @property
+    def daily_usage_statistics(self) -> DailyUsageStatistics | None:
+        """Return the statistics of the daily usage, up to date with the current day."""
+        if self._daily_usage is not None:
+            self._daily_usage.roll_over(self._clock.utcnow())
+        return self._daily_usage
+
+    @property
+    def usage_z_score(self) -> float | None:
+        """Return how many standard deviations the usage of today is above the mean daily usage."""
+        if (daily_usage := self.daily_usage_statistics) is None:
+            return None
+        return daily_usage.z_score(DEFAULT_ANOMALY_MIN_DAYS)
+
+    @property
+    def is_usage_anomalous(self) -> bool:
+        """Return whether the usage of today is anomalous."""
+        z_score = self.usage_z_score
+        return z_score is not None and z_score >= self._anomaly_z_score
+
+    def _maintenance_dates_changed(self):
+        self._min_deadline = self._last_maintenance_date + self._min_interval if self._min_interval else None
+        self._max_deadline = self._last_maintenance_date + self._max_interval if self._max_interval else None
+        self._prediction_key = None
+        self._prediction = None
+
+    def _is_maintenance_needed_at(self, now: datetime) -> bool:
+        """Indicate whether maintenance is needed based on the usage so far.
+
+        :param now: The current UTC time.
+        :return: True if maintenance is needed, False otherwise.
+        """
+        if self._max_deadline is not None and now > self._max_deadline:
+            return True
+        if self._min_deadline is not None and now < self._min_deadline:
+            return False
+        return self._usage() >= self._usage_limit
+
+    def _max_maintenance_date(self) -> datetime | None:
+        return self._max_deadline
+
+    def set_usage_profile(self, usage_profile: UsageProfile | None):
+        """Set the usage profile the prediction follows.
+
+        :param usage_profile: The usage profile, or None to extrapolate the average usage since the last reset.
+        """
+        self._usage_profile = usage_profile
+        self._prediction_key = None
+
+    def _predicted_maintenance_date_at(self, now: datetime) -> datetime | None:
+        """Return the predicted maintenance date based on the average usage per day since the last reset.
+
+        :param now: The current UTC time.
+        :return: The predicted maintenance date.
+        """
+        usage = self._usage()
+        prediction_key = (usage, now.date())
+        if prediction_key != self._prediction_key:
+            self._prediction_key = prediction_key
+            self._prediction = self._predict(now, usage)
+            _LOGGER.debug(
+                "Predicted maintenance date for device '%s': %s, Usage: %s of %s, Min deadline: %s, Max deadline: %s",
+                self._name,
+                self._prediction,
+                usage,
+                self._usage_limit,
+                self._min_deadline,
+                self._max_deadline,
+            )
+        return self._prediction
+
+    def _predict(self, now: datetime, usage: float) -> datetime | None:
+        """Predict the date the usage reaches the usage limit."""
+        try:
+            if self._usage_profile is not None:
+                time_left = self._usage_profile.time_until(now, self._usage_limit - usage)
+            else:
+                time_left = self._extrapolate(now, usage)
+            if time_left is None:
+                return None
+            predicted_date = now + time_left
+        except OverflowError:
+            # The usage is too low to ever reach the limit
+            return self._max_deadline
+
+        # Ensure the predicted date falls within the min and max intervals
+        if self._min_deadline is not None and predicted_date < self._min_deadline:
+            return self._min_deadline
+        if self._max_deadline is not None and predicted_date > self._max_deadline:
+            return self._max_deadline
+        return predicted_date
+
+    def _extrapolate(self, now: datetime, usage: float) -> timedelta | None:
+        """Extrapolate the average usage since the last reset to the usage limit."""
+        seconds_since_last_reset = (now - self._last_reset_date).total_seconds()
+        if seconds_since_last_reset <= 0 or usage <= 0:
+            return None
+
+        # The usage left divided by the average usage per second
+        return timedelta(seconds=(self._usage_limit - usage) * seconds_since_last_reset / usage)
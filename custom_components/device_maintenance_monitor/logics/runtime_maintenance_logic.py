@@ -3,29 +3,60 @@ from datetime import datetime, timedelta
 import logging
 
 from ..const import (
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_AGGREGATE_MIN_ON,
+    CONF_AGGREGATE_MODE,
+    CONF_ANOMALY_Z_SCORE,
     CONF_ENTITY_ID,
     CONF_INTERVAL,
     CONF_IS_ON_TEMPLATE,
+    CONF_LOAD_ATTRIBUTE,
+    CONF_LOAD_ENTITY_ID,
+    CONF_LOAD_FULL_SCALE,
     CONF_MAX_INTERVAL,
     CONF_MIN_INTERVAL,
     CONF_NAME,
     CONF_ON_STATES,
     CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
+    DEFAULT_LOAD_FULL_SCALE,
     DEFAULT_ON_STATES,
     DEFAULT_RUNTIME_UPDATE_FREQUENCY,
     STATE_RUNTIME_DURATION,
+    AggregateMode,
 )
-from .base_maintenance_logic import IsOnExpression, MaintenanceLogic
+from .base_maintenance_logic import IsOnExpression
+from .clock import Clock
+from .numeric_state import parse_number
+from .range_maintenance_logic import RangeMaintenanceLogic
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class RuntimeMaintenanceLogic(MaintenanceLogic):
-    """A class that represents the logic for maintaining a device based on the runtime."""
+class RuntimeMaintenanceLogic(RangeMaintenanceLogic):
+    """A class that represents the logic for maintaining a device based on the runtime.
 
-    _interval: timedelta  # The interval for maintenance
-    _min_interval: timedelta | None  # The minimum interval for maintenance
-    _max_interval: timedelta | None  # The maximum interval for maintenance
+    When a load entity is set, the runtime is weighted by the load of the device, e.g. the percentage of a fan or the
+    frequency of a compressor, relative to the load at full scale. The weighted runtime is integrated on every change
+    of the load, so an hour at half the full scale counts as half an hour, and the maintenance and the predictions
+    follow the weighted hours.
+    """
+
+    __slots__ = (
+        "_last_device_on_time",
+        "_runtime_duration",
+        "_load_entity_id",
+        "_load_attribute",
+        "_load_full_scale",
+        "_load",
+    )
+
+    _load_entity_id: str | None  # The entity reporting the load of the device, None to not weight the runtime
+    _load_attribute: str | None  # The attribute of the load entity holding the load, None to read its state
+    _load_full_scale: float  # The load at which the runtime counts fully
+    _load: float | None  # The last reported load, None until the load is reported
+
+    # Changing the load entity or attribute changes the listeners of the monitor and reloads the entry
+    _CONFIG_ATTRIBUTES = ("_load_full_scale",)
 
     def __init__(self, *,
                  name: str,
@@ -35,37 +66,63 @@ class RuntimeMaintenanceLogic(MaintenanceLogic):
                  entity_id: str | None,
                  on_states: list[str] | None,
                  is_on_expression: IsOnExpression | None,
-                 initial_last_maintenance_date: datetime | None = None):
+                 initial_last_maintenance_date: datetime | None = None,
+                 additional_entity_ids: list[str] | None = None,
+                 aggregate_mode: AggregateMode | None = None,
+                 aggregate_min_on: int | None = None,
+                 anomaly_z_score: float | None = None,
+                 load_entity_id: str | None = None,
+                 load_attribute: str | None = None,
+                 load_full_scale: float | None = None,
+                 clock: Clock | None = None):
         """Initialize a new instance of the MaintenanceLogic class.
 
         :param name: The name of the entity.
-        :param interval: The interval for maintenance.
+        :param interval: The interval for maintenance, in weighted runtime when the runtime is weighted by a load.
         :param min_interval: The minimum interval for maintenance.
         :param max_interval: The maximum interval for maintenance.
         :param entity_id: The unique identifier of the source entity.
         :param on_states: The states in which the device is considered to be "on".
         :param is_on_expression: The expression to determine if the device is on.
         :param initial_last_maintenance_date: The initial last maintenance date.
+        :param additional_entity_ids: The unique identifiers of additional source entities.
+        :param aggregate_mode: The way the on state of the source entities is combined.
+        :param aggregate_min_on: The number of sources that must be on, used by the 'at least' mode.
+        :param anomaly_z_score: The z-score of the daily usage from which a day is anomalous, None to not detect.
+        :param load_entity_id: The entity reporting the load of the device, None to not weight the runtime.
+        :param load_attribute: The attribute of the load entity holding the load, None to read its state.
+        :param load_full_scale: The load at which the runtime counts fully.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         """
         super().__init__(
             name=name,
+            usage_limit=interval.total_seconds(),
+            min_interval=min_interval,
+            max_interval=max_interval,
             entity_id=entity_id,
             on_states=on_states,
             is_on_expression=is_on_expression,
             initial_last_maintenance_date=initial_last_maintenance_date,
+            additional_entity_ids=additional_entity_ids,
+            aggregate_mode=aggregate_mode,
+            aggregate_min_on=aggregate_min_on,
+            anomaly_z_score=anomaly_z_score,
+            clock=clock,
         )
-        self._interval = interval
-        self._min_interval = min_interval
-        self._max_interval = max_interval
 
-        self._last_device_on_time = None
+        self._last_device_on_time: float | None = None  # The monotonic time the device was last seen on
         self._runtime_duration = timedelta(seconds=0)
+        self._load_entity_id = load_entity_id
+        self._load_attribute = load_attribute
+        self._load_full_scale = load_full_scale or DEFAULT_LOAD_FULL_SCALE
+        self._load = None
 
     @classmethod
-    def get_instance(cls, config: dict) -> "RuntimeMaintenanceLogic":
+    def get_instance(cls, config: dict, clock: Clock | None = None) -> "RuntimeMaintenanceLogic":
         """Return an instance of the maintenance logic.
 
         :param config: The configuration data of the device.
+        :param clock: The clock used to read the current time, defaults to the system clock.
         :return: An instance of the maintenance logic.
         """
         return RuntimeMaintenanceLogic(
@@ -77,70 +134,83 @@ class RuntimeMaintenanceLogic(MaintenanceLogic):
             on_states=config.get(CONF_ON_STATES) or DEFAULT_ON_STATES,
             is_on_expression=config.get(CONF_IS_ON_TEMPLATE),
             initial_last_maintenance_date=config.get(CONFIG_INITIAL_LAST_MAINTENANCE_DATE),
+            additional_entity_ids=config.get(CONF_ADDITIONAL_ENTITY_IDS),
+            aggregate_mode=config.get(CONF_AGGREGATE_MODE),
+            aggregate_min_on=config.get(CONF_AGGREGATE_MIN_ON),
+            anomaly_z_score=config.get(CONF_ANOMALY_Z_SCORE),
+            load_entity_id=_get_load_entity_id(config),
+            load_attribute=config.get(CONF_LOAD_ATTRIBUTE) or None,
+            load_full_scale=config.get(CONF_LOAD_FULL_SCALE),
+            clock=clock,
         )
 
     def _reset(self):
         # Reset the total runtime duration to 0
         self._runtime_duration = timedelta(seconds=0)
 
-        if self._last_device_on_time:
-            # If the device is on, reset the last device on time to the current time
-            self._last_device_on_time = datetime.now()
-        else:
-            # Reset the last device on time to None
-            self._last_device_on_time = None
+        if self._last_device_on_time is not None:
+            # If the device is on, count its runtime from the current time
+            self._last_device_on_time = self._clock.monotonic()
 
     def _handle_turn_on(self):
-        self._last_device_on_time = datetime.now()
+        self._last_device_on_time = self._clock.monotonic()
 
     def _handle_turn_off(self):
         if self._last_device_on_time is None:
             return
-        self._runtime_duration += datetime.now() - self._last_device_on_time
+        self._accumulate_runtime(self._clock.monotonic())
         self._last_device_on_time = None
 
-    @property
-    def is_maintenance_needed(self) -> bool:
-        """Indicate whether maintenance is needed based on the runtime so far.
+    def _accumulate_runtime(self, now: float):
+        """Add the runtime since the device was last seen on, weighted by the load, and restart from now.
 
-        :return: True if maintenance is needed, False otherwise.
+        :param now: The current monotonic time.
         """
-        _LOGGER.info(
-            "Checking if maintenance is needed for device '%s', Runtime duration: %s, Min interval: %s, Max interval: "
-            "%s, Interval: %s, Last Maintenance Date: %s, Last Reset Date: %s",
-            self._name,
-            self._runtime_duration,
-            self._min_interval,
-            self._max_interval,
-            self._interval,
-            self._last_maintenance_date,
-            self._last_reset_date,
-        )
-        now = datetime.now()
+        runtime = now - self._last_device_on_time
+        if self._load is not None:
+            runtime *= self._load / self._load_full_scale
+        self._runtime_duration += timedelta(seconds=runtime)
+        self._record_usage(runtime)
+        self._last_device_on_time = now
 
-        if self._max_interval:
-            # Check if enough time has passed since the last maintenance
-            max_maintenance_date = self._last_maintenance_date + self._max_interval
-            if now > max_maintenance_date:
-                return True
+    @property
+    def load_entity_id(self) -> str | None:
+        """Return the entity reporting the load of the device, None if the runtime is not weighted."""
+        return self._load_entity_id
+
+    @property
+    def load_attribute(self) -> str | None:
+        """Return the attribute of the load entity holding the load, None to read its state."""
+        return self._load_attribute
 
-        if self._min_interval:
-            # Check if the minimum interval has passed since the last maintenance
-            min_maintenance_date = self._last_maintenance_date + self._min_interval
-            if now < min_maintenance_date:
-                return False
+    def handle_load_change(self, load: str | float | None):
+        """Weight the runtime from now on by the new load, after adding the runtime at the previous load.
 
-        # Check if the runtime duration has exceeded the interval
-        return self._runtime_duration >= self._interval
+        A load that is not a number, e.g. while the load entity is unavailable, keeps the previous load.
+
+        :param load: The new load, None when it is not available.
+        """
+        if (new_load := parse_number(load)) is None:
+            _LOGGER.debug("Ignoring load %s for device '%s', not a number", load, self._name)
+            return
+        new_load = max(new_load, 0.0)
+        if self._last_device_on_time is not None:
+            self._accumulate_runtime(self._clock.monotonic())
+        self._load = new_load
+
+    def _usage(self) -> float:
+        return self._runtime_duration.total_seconds()
 
     def _get_state(self) -> dict[str, str]:
         return {
+            **super()._get_state(),
             STATE_RUNTIME_DURATION: str(
                 int(round(self._runtime_duration.total_seconds()))
             ),
         }
 
     def _restore_state(self, state: dict[str, str]):
+        super()._restore_state(state)
         self._runtime_duration = timedelta(
             seconds=int(
                 state.get(
@@ -150,56 +220,44 @@ class RuntimeMaintenanceLogic(MaintenanceLogic):
         )
 
     @property
-    def update_frequency(self) -> timedelta | None:
-        """Return the update frequency of the device.
-
-        :return: The update frequency of the device.
-        """
-        return DEFAULT_RUNTIME_UPDATE_FREQUENCY
+    def runtime_duration(self) -> timedelta:
+        """Return the runtime since the last reset."""
+        return self._runtime_duration
 
     @property
-    def predicted_maintenance_date(self) -> datetime | None:
-        """Return the predicted maintenance date based on the average runtime per day.
-
-        :return: The predicted maintenance date.
-        """
-        if self._last_reset_date is None:
-            return None
-
-        # TODO: move to consts
-        now = datetime.now()
-        days_since_last_reset = (now - self._last_reset_date).total_seconds() / 86400
-        if days_since_last_reset == 0:
-            return None
-
-        average_runtime_per_day = self._runtime_duration / days_since_last_reset
-        if not average_runtime_per_day:
-            # Avoid division by zero
-            return None
+    def runtime_last_24_hours(self) -> timedelta:
+        """Return the runtime during the last 24 hours."""
+        return timedelta(seconds=self._usage_in_last_hours(24))
 
-        runtime_left_until_maintenance = self._interval - self._runtime_duration
-
-        days_left_until_maintenance = runtime_left_until_maintenance / average_runtime_per_day
-
-        predicted_date = now + timedelta(days=days_left_until_maintenance)
+    @property
+    def runtime_last_7_days(self) -> timedelta:
+        """Return the runtime during the last 7 days."""
+        return timedelta(seconds=self._usage_in_last_hours(24 * 7))
 
-        # Ensure the predicted date falls within the min and max intervals
-        if self._min_interval:
-            min_maintenance_date = self._last_maintenance_date + self._min_interval
-            if predicted_date < min_maintenance_date:
-                return min_maintenance_date
+    @property
+    def runtime_remaining(self) -> timedelta:
+        """Return the runtime left until maintenance is needed."""
+        return timedelta(seconds=max(self._usage_limit - self._runtime_duration.total_seconds(), 0))
 
-        if self._max_interval:
-            max_maintenance_date = self._last_maintenance_date + self._max_interval
-            if predicted_date > max_maintenance_date:
-                return max_maintenance_date
+    @property
+    def update_frequency(self) -> timedelta | None:
+        """Return the update frequency of the device.
 
-        return predicted_date
+        :return: The update frequency of the device.
+        """
+        return DEFAULT_RUNTIME_UPDATE_FREQUENCY
 
     def update(self):
         """Update the runtime duration of the device."""
         if self._last_device_on_time is None:
             return
-        now = datetime.now()
-        self._runtime_duration += now - self._last_device_on_time
-        self._last_device_on_time = now
+        self._accumulate_runtime(self._clock.monotonic())
+
+
+def _get_load_entity_id(config: dict) -> str | None:
+    """Return the entity reporting the load, the source entity when only the attribute holding the load is set."""
+    if load_entity_id := config.get(CONF_LOAD_ENTITY_ID):
+        return load_entity_id
+    if config.get(CONF_LOAD_ATTRIBUTE):
+        return config.get(CONF_ENTITY_ID)
+    return None
@@ -0,0 +1,58 @@
+"""Provides the aggregation of the on state of several source entities."""
+from ..const import AggregateMode
+
+
+class SourceAggregate:
+    """A class that combines the on state of several source entities into a single on state.
+
+    The number of sources that are on is maintained incrementally, so every state change is handled in constant time.
+    """
+
+    __slots__ = (
+        "_is_source_on",
+        "_on_count",
+        "_required_on",
+    )
+
+    def __init__(self,
+                 entity_ids: list[str],
+                 mode: AggregateMode,
+                 min_on: int | None = None):
+        """Initialize a new instance of the SourceAggregate class.
+
+        :param entity_ids: The unique identifiers of the source entities.
+        :param mode: The way the on state of the source entities is combined.
+        :param min_on: The number of sources that must be on, used by the 'at least' mode.
+        """
+        self._is_source_on: dict[str, bool] = dict.fromkeys(entity_ids, False)
+        self._on_count = 0
+
+        if mode == AggregateMode.ALL:
+            self._required_on = len(self._is_source_on)
+        elif mode == AggregateMode.AT_LEAST:
+            self._required_on = max(1, min(int(min_on or 1), len(self._is_source_on)))
+        else:
+            self._required_on = 1
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Return the unique identifiers of the source entities."""
+        return list(self._is_source_on)
+
+    @property
+    def is_on(self) -> bool:
+        """Return whether the combined sources are considered to be on."""
+        return self._on_count >= self._required_on
+
+    def update(self, entity_id: str, is_on: bool) -> bool:
+        """Update the on state of a single source entity.
+
+        :param entity_id: The unique identifier of the source entity.
+        :param is_on: Whether the source entity is on.
+        :return: Whether the combined sources are considered to be on.
+        """
+        was_on = self._is_source_on.get(entity_id)
+        if was_on is not None and was_on != is_on:
+            self._is_source_on[entity_id] = is_on
+            self._on_count += 1 if is_on else -1
+        return self.is_on
@@ -0,0 +1,93 @@
+"""Provides the usage profile used to forecast when a device reaches its usage limit."""
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta, timezone
+
+HOURS_PER_WEEK = 168
+
+
+def _hour_of_week(value: datetime) -> int:
+    """Return the UTC hour of the week of a timezone aware datetime, counted from Monday midnight."""
+    value = value.astimezone(timezone.utc)
+    return value.weekday() * 24 + value.hour
+
+
+class UsageProfile:
+    """A class that represents the expected usage of a device for every hour of the week.
+
+    The hours are counted in UTC, so the profile of a device that is used at the same local time every day moves by
+    an hour when the daylight saving time changes.
+    """
+
+    __slots__ = ("_hourly_usage", "_weekly_usage")
+
+    def __init__(self, hourly_usage: Sequence[float]):
+        """Initialize the profile.
+
+        :param hourly_usage: The expected usage during every hour of the week, starting on Monday midnight UTC.
+        """
+        if len(hourly_usage) != HOURS_PER_WEEK:
+            raise ValueError(f"Expected {HOURS_PER_WEEK} hours, got {len(hourly_usage)}")
+        self._hourly_usage = tuple(hourly_usage)
+        self._weekly_usage = sum(self._hourly_usage)
+
+    @classmethod
+    def fit(cls, samples: Iterable[tuple[datetime, float]]) -> "UsageProfile | None":
+        """Fit a profile by averaging the usage samples of every hour of the week.
+
+        :param samples: The start of every hour, and the usage during that hour.
+        :return: The profile, or None if there was no usage at all.
+        """
+        totals = [0.0] * HOURS_PER_WEEK
+        counts = [0] * HOURS_PER_WEEK
+        for start, usage in samples:
+            hour = _hour_of_week(start)
+            totals[hour] += max(usage, 0)
+            counts[hour] += 1
+        if not any(totals):
+            return None
+
+        # An hour without any sample is not known to be idle, it is expected to be an average hour
+        averages = [total / count for total, count in zip(totals, counts, strict=True) if count]
+        default_usage = sum(averages) / len(averages)
+        return cls([
+            total / count if count else default_usage
+            for total, count in zip(totals, counts, strict=True)
+        ])
+
+    @property
+    def weekly_usage(self) -> float:
+        """Return the expected usage during a whole week."""
+        return self._weekly_usage
+
+    def time_until(self, now: datetime, usage: float) -> timedelta | None:
+        """Return how long it is expected to take to use the given usage, starting now.
+
+        The whole weeks are skipped at once, so at most a week of hours is walked.
+
+        :param now: The current UTC time.
+        :param usage: The usage left.
+        :return: The expected time, or None if the device is never used.
+        """
+        if usage <= 0:
+            return timedelta(0)
+        if self._weekly_usage <= 0:
+            return None
+
+        weeks, usage = divmod(usage, self._weekly_usage)
+        if usage == 0:
+            return timedelta(weeks=weeks)
+
+        hour = _hour_of_week(now)
+        # Only the rest of the current hour is left
+        fraction = 1 - (now.minute * 60 + now.second + now.microsecond / 1_000_000) / 3600
+        hours = 0.0
+        for offset in range(HOURS_PER_WEEK + 1):
+            hourly_usage = self._hourly_usage[(hour + offset) % HOURS_PER_WEEK]
+            available = hourly_usage * fraction
+            if available >= usage:
+                return timedelta(weeks=weeks, hours=hours + usage / hourly_usage)
+            usage -= available
+            hours += fraction
+            fraction = 1.0
+        # Only reached through rounding errors, the hours walked hold more than a week of usage
+        return timedelta(weeks=weeks + 1)
@@ -0,0 +1,112 @@
+"""Fires the events of the monitors whose maintenance became due."""
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .common import get_maintenance_needed_entity_id
+from .const import (
+    DOMAIN,
+    EVENT_MAINTENANCE_DUE,
+    EVENT_MAINTENANCE_DUE_DIGEST,
+    SIGNAL_MONITOR_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MaintenanceEventNotifier:
+    """A class that fires an event when the maintenance of a monitor becomes needed.
+
+    The event is only fired on the edge from not needed to needed, so the state writes that do not change whether
+    maintenance is needed do not fire anything. With a digest window, the monitors that became due during the window
+    are collected and fired in a single digest event instead.
+    """
+
+    def __init__(self, hass: HomeAssistant, digest_window: timedelta | None = None):
+        """Initialize the notifier.
+
+        :param hass: The Home Assistant instance.
+        :param digest_window: The window to collect the monitors in before firing a digest, or None to fire an event
+            for every monitor as soon as its maintenance is needed.
+        """
+        self._hass = hass
+        self._digest_window = digest_window
+        self._maintenance_needed: dict[str, bool] = {}  # The last known state of every entry_id
+        self._pending: dict[str, dict[str, Any]] = {}  # The monitors that became due since the last digest
+        self._unsub_digest: CALLBACK_TYPE | None = None
+        self._unsub_monitor_updated: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start tracking the updates of the monitors.
+
+        :return: The callback to stop tracking.
+        """
+        self.async_stop()
+        self._unsub_monitor_updated = async_dispatcher_connect(
+            self._hass, SIGNAL_MONITOR_UPDATED, self.async_update
+        )
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking the updates of the monitors and drop the pending digest, safe to call more than once."""
+        if self._unsub_monitor_updated:
+            self._unsub_monitor_updated()
+            self._unsub_monitor_updated = None
+        if self._unsub_digest:
+            self._unsub_digest()
+            self._unsub_digest = None
+
+    @callback
+    def async_update(self, entry_id: str) -> None:
+        """Fire the event of a monitor if its maintenance became needed since its last update.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        """
+        logic = self._hass.data.get(DOMAIN, {}).get(entry_id)
+        if logic is None:
+            self._maintenance_needed.pop(entry_id, None)
+            self._pending.pop(entry_id, None)
+            return
+
+        is_maintenance_needed = logic.is_maintenance_needed
+        # A monitor seen for the first time was just set up with its restored state, which is not an edge
+        was_maintenance_needed = self._maintenance_needed.get(entry_id, is_maintenance_needed)
+        self._maintenance_needed[entry_id] = is_maintenance_needed
+        if not is_maintenance_needed:
+            # Maintenance was performed before the digest, so the monitor is no longer due
+            self._pending.pop(entry_id, None)
+            return
+        if was_maintenance_needed:
+            return
+
+        data = {
+            "entry_id": entry_id,
+            "name": logic.name,
+            "entity_id": get_maintenance_needed_entity_id(self._hass, entry_id),
+            "logic_type": logic.logic_type,
+        }
+        if self._digest_window is None:
+            _LOGGER.debug("Maintenance of '%s' became due, firing %s", logic.name, EVENT_MAINTENANCE_DUE)
+            self._hass.bus.async_fire(EVENT_MAINTENANCE_DUE, data)
+            return
+
+        self._pending[entry_id] = data
+        if self._unsub_digest is None:
+            self._unsub_digest = async_call_later(self._hass, self._digest_window, self._async_fire_digest)
+
+    @callback
+    def _async_fire_digest(self, __: datetime | None = None) -> None:
+        """Fire a single event with every monitor that became due during the window."""
+        self._unsub_digest = None
+        if not self._pending:
+            return
+        devices = list(self._pending.values())
+        self._pending.clear()
+        _LOGGER.debug("Maintenance of %s devices became due, firing %s", len(devices), EVENT_MAINTENANCE_DUE_DIGEST)
+        self._hass.bus.async_fire(EVENT_MAINTENANCE_DUE_DIGEST, {"devices": devices})
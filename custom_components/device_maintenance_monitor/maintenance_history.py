@@ -0,0 +1,262 @@
+"""Keeps the history of the maintenance of the monitors in an append-only log file."""
+from array import array
+import asyncio
+from bisect import bisect_left
+from collections.abc import Container
+from datetime import datetime
+import json
+import logging
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DATA_MAINTENANCE_HISTORY,
+    DEFAULT_HISTORY_MAX_SIZE,
+    DOMAIN,
+    MaintenanceAction,
+    MaintenanceSource,
+)
+from .logics import MaintenanceLogic
+from .logics.clock import format_date
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_FILE = f"{DOMAIN}.history.jsonl"
+
+# The (entry_id, action, source) of a record
+RecordKey = tuple[str, str, str]
+
+
+def _scan_log(path: str) -> tuple[list[int], list[float], list[RecordKey]]:
+    """Read the offset, the time and the key of every record of the log file, in the executor.
+
+    A line left incomplete by an interrupted write is cut off, so the next record starts on its own line.
+    """
+    offsets: list[int] = []
+    times: list[float] = []
+    keys: list[RecordKey] = []
+    if not os.path.exists(path):
+        return offsets, times, keys
+
+    offset = 0
+    with open(path, "rb") as log_file:
+        for line in log_file:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+                time = datetime.fromisoformat(record["time"]).timestamp()
+                key = (record["entry_id"], record["action"], record["source"])
+            except (ValueError, KeyError, TypeError):
+                _LOGGER.warning("Skipping an invalid maintenance history record at offset %s", offset)
+            else:
+                offsets.append(offset)
+                times.append(time)
+                keys.append(key)
+            offset += len(line)
+    if offset != os.path.getsize(path):
+        with open(path, "r+b") as log_file:
+            log_file.truncate(offset)
+    return offsets, times, keys
+
+
+def _append_line(path: str, line: bytes) -> tuple[int, int]:
+    """Append a line to the log file, in the executor.
+
+    :return: The offset of the line, and the size of the file.
+    """
+    with open(path, "ab") as log_file:
+        offset = log_file.tell()
+        log_file.write(line)
+        return offset, offset + len(line)
+
+
+def _drop_head(path: str, offset: int) -> None:
+    """Drop the start of the log file up to the given offset, in the executor."""
+    temp_path = f"{path}.tmp"
+    with open(path, "rb") as log_file, open(temp_path, "wb") as temp_file:
+        log_file.seek(offset)
+        while chunk := log_file.read(1024 * 1024):
+            temp_file.write(chunk)
+    os.replace(temp_path, path)
+
+
+def _read_lines(path: str, offsets: list[int]) -> list[dict[str, Any]]:
+    """Read the records at the given offsets, in the executor."""
+    records = []
+    with open(path, "rb") as log_file:
+        for offset in offsets:
+            log_file.seek(offset)
+            records.append(json.loads(log_file.readline()))
+    return records
+
+
+class MaintenanceHistory:
+    """A class that records every reset and update of the maintenance of the monitors in a log file.
+
+    The log file holds a JSON record per line and is only appended to. Only the offset, the time and the key of every
+    record are kept in memory, so a query selects its page from the index and only reads the lines of that page. When
+    the file grows past its maximum size, the oldest records are dropped until it is half that size.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_size: int = DEFAULT_HISTORY_MAX_SIZE):
+        """Initialize the history.
+
+        :param hass: The Home Assistant instance.
+        :param max_size: The maximum size of the log file, in bytes.
+        """
+        self._hass = hass
+        self._path = hass.config.path(STORAGE_DIR, HISTORY_FILE)
+        self._max_size = max_size
+        self._lock = asyncio.Lock()  # Keeps the index in line with the file while it is appended to or shrunk
+        self._loaded = False
+        self._offsets = array("q")  # The offset of every record in the file
+        self._times = array("d")  # The timestamp of every record, in the order they were recorded
+        self._record_keys = array("I")  # The index of the key of every record in the keys
+        self._keys: list[RecordKey] = []  # The distinct keys of the records
+        self._key_indexes: dict[RecordKey, int] = {}
+
+    def _key_index(self, key: RecordKey) -> int:
+        if (index := self._key_indexes.get(key)) is None:
+            index = self._key_indexes[key] = len(self._keys)
+            self._keys.append(key)
+        return index
+
+    async def _async_load(self) -> None:
+        """Build the index from the log file on first use."""
+        if self._loaded:
+            return
+        offsets, times, keys = await self._hass.async_add_executor_job(_scan_log, self._path)
+        self._offsets.extend(offsets)
+        self._times.extend(times)
+        self._record_keys.extend(self._key_index(key) for key in keys)
+        self._loaded = True
+        _LOGGER.debug("Loaded %s maintenance history records", len(self._offsets))
+
+    @callback
+    def async_record(self,
+                     entry_id: str,
+                     logic: MaintenanceLogic,
+                     action: MaintenanceAction,
+                     source: MaintenanceSource,
+                     last_maintenance_date: datetime | None = None) -> None:
+        """Record a change of the maintenance of a monitor, before it is applied to the logic.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        :param logic: The maintenance logic of the monitor, with the usage before the change.
+        :param action: The change of the maintenance.
+        :param source: The origin of the change.
+        :param last_maintenance_date: The new last maintenance date, the current date when omitted.
+        """
+        now = dt_util.utcnow()
+        record = {
+            "time": now.isoformat(),
+            "entry_id": entry_id,
+            "name": logic.name,
+            "logic_type": logic.logic_type,
+            "action": action,
+            "source": source,
+            "last_maintenance_date": format_date(last_maintenance_date or now),
+            "state": logic.get_state(),
+        }
+        self._hass.async_create_task(self._async_append(record))
+
+    async def _async_append(self, record: dict[str, Any]) -> None:
+        """Append a record to the log file and the index."""
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        async with self._lock:
+            await self._async_load()
+            try:
+                offset, size = await self._hass.async_add_executor_job(_append_line, self._path, line)
+            except OSError:
+                _LOGGER.exception("Error writing the maintenance history of '%s'", record["name"])
+                return
+            self._offsets.append(offset)
+            self._times.append(datetime.fromisoformat(record["time"]).timestamp())
+            self._record_keys.append(self._key_index((record["entry_id"], record["action"], record["source"])))
+            if size > self._max_size:
+                await self._async_shrink(size)
+
+    async def _async_shrink(self, size: int) -> None:
+        """Drop the oldest records until the log file is half its maximum size."""
+        first = bisect_left(self._offsets, size - self._max_size // 2)
+        if first >= len(self._offsets):
+            # Always keep the last record
+            first = len(self._offsets) - 1
+        head = self._offsets[first]
+        try:
+            await self._hass.async_add_executor_job(_drop_head, self._path, head)
+        except OSError:
+            _LOGGER.exception("Error shrinking the maintenance history")
+            return
+        self._offsets = array("q", (offset - head for offset in self._offsets[first:]))
+        del self._times[:first]
+        del self._record_keys[:first]
+        _LOGGER.debug("Dropped %s maintenance history records", first)
+
+    def _matching_keys(self,
+                       entry_ids: Container[str] | None,
+                       action: str | None,
+                       source: str | None) -> set[int]:
+        return {
+            index
+            for index, (entry_id, key_action, key_source) in enumerate(self._keys)
+            if (entry_ids is None or entry_id in entry_ids)
+            and (action is None or key_action == action)
+            and (source is None or key_source == source)
+        }
+
+    async def async_query(self, *,
+                          entry_ids: Container[str] | None = None,
+                          action: str | None = None,
+                          source: str | None = None,
+                          start_time: datetime | None = None,
+                          end_time: datetime | None = None,
+                          offset: int = 0,
+                          limit: int) -> dict[str, Any]:
+        """Return a page of the records matching the filters, the most recent first.
+
+        :param entry_ids: Only the records of these monitors, all the monitors when omitted.
+        :param action: Only the records of this action.
+        :param source: Only the records of this source.
+        :param start_time: Only the records at or after this time.
+        :param end_time: Only the records before this time.
+        :param offset: The number of matching records to skip.
+        :param limit: The maximum number of records to return.
+        :return: The records of the page under 'records', and the number of matching records under 'total'.
+        """
+        async with self._lock:
+            await self._async_load()
+            keys = self._matching_keys(entry_ids, action, source)
+            low = bisect_left(self._times, start_time.timestamp()) if start_time else 0
+            high = bisect_left(self._times, end_time.timestamp()) if end_time else len(self._times)
+
+            total = 0
+            page: list[int] = []
+            for index in range(high - 1, low - 1, -1):
+                if self._record_keys[index] not in keys:
+                    continue
+                if offset <= total < offset + limit:
+                    page.append(self._offsets[index])
+                total += 1
+
+            records = []
+            if page:
+                records = await self._hass.async_add_executor_job(_read_lines, self._path, page)
+        return {"records": records, "total": total}
+
+
+@callback
+def async_get_maintenance_history(hass: HomeAssistant) -> MaintenanceHistory:
+    """Get the maintenance history, creating it on first use.
+
+    :param hass: The Home Assistant instance.
+    :return: The maintenance history.
+    """
+    if (history := hass.data.get(DATA_MAINTENANCE_HISTORY)) is None:
+        history = hass.data[DATA_MAINTENANCE_HISTORY] = MaintenanceHistory(hass)
+    return history
@@ -0,0 +1,362 @@
+"""Replay a recorded state history through a maintenance logic without starting Home Assistant.
+
+The history is streamed from a CSV export (the "Download data" file of the history panel), a JSONL file with
+``entity_id``, ``state`` and ``last_changed`` fields, or a recorder SQLite database opened read-only.
+Time is simulated from the event timestamps, so months of history are replayed in seconds.
+
+Usage::
+
+    python -m custom_components.device_maintenance_monitor.replay history.csv --entity-id climate.ac --interval 250h
+"""
+import argparse
+import asyncio
+from collections.abc import Iterable, Iterator
+import csv
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import heapq
+from itertools import chain
+import json
+from pathlib import Path
+import re
+import sqlite3
+import sys
+import time
+from typing import TextIO
+
+from .const import (
+    CONF_ADDITIONAL_ENTITY_IDS,
+    CONF_CONSUMPTION,
+    CONF_COUNT,
+    CONF_ENERGY,
+    CONF_ENTITY_ID,
+    CONF_IDLE_TIMEOUT,
+    CONF_INTERVAL,
+    CONF_LOAD_ENTITY_ID,
+    CONF_LOAD_FULL_SCALE,
+    CONF_MAX_DELTA,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_CYCLE_LENGTH,
+    CONF_MIN_INTERVAL,
+    CONF_NAME,
+    CONF_ON_STATES,
+    CONF_START_THRESHOLD,
+    CONFIG_INITIAL_LAST_MAINTENANCE_DATE,
+    DEFAULT_ON_STATES,
+    SensorType,
+)
+from .logics import IMPLEMENTED_LOGICS, MaintenanceLogic
+from .logics.clock import FakeClock
+
+DEFAULT_REPORT_INTERVAL = timedelta(days=1)
+DEFAULT_CHUNK_SIZE = 10_000
+
+_DURATION_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+_SQLITE_STATES_QUERY = (
+    "SELECT states.state, states.last_updated_ts FROM states "
+    "JOIN states_meta ON states.metadata_id = states_meta.metadata_id "
+    "WHERE states_meta.entity_id = ? ORDER BY states.last_updated_ts"
+)
+_CSV_COLUMNS = ("entity_id", "state", "last_changed")
+
+# The argument holding the threshold every sensor type needs
+_REQUIRED_THRESHOLDS = {
+    SensorType.RUNTIME: "interval",
+    SensorType.COUNT: "count",
+    SensorType.FIXED_INTERVAL: "interval",
+    SensorType.POWER: "energy",
+    SensorType.METER: "consumption",
+    SensorType.CYCLE: "count",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class StateEvent:
+    """A state reported by a source entity at a point in time."""
+
+    timestamp: datetime
+    entity_id: str
+    state: str
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration such as '250h', '30d' or '12:30:00'."""
+    if match := _DURATION_PATTERN.match(value.strip()):
+        return timedelta(**{_DURATION_UNITS[match.group(2)]: float(match.group(1))})
+    parts = value.strip().split(":")
+    if 2 <= len(parts) <= 3 and all(part.isdigit() for part in parts):
+        hours, minutes, *seconds = (int(part) for part in parts)
+        return timedelta(hours=hours, minutes=minutes, seconds=seconds[0] if seconds else 0)
+    raise argparse.ArgumentTypeError(f"Invalid duration: {value}")
+
+
+def _parse_timestamp(value: str | float) -> datetime:
+    """Parse an ISO timestamp or an epoch into a UTC datetime, naive timestamps are considered to be UTC."""
+    if isinstance(value, int | float):
+        return datetime.fromtimestamp(value, timezone.utc)
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def _missing_csv_columns(path: Path) -> list[str]:
+    """Return the columns the replay needs that are missing from the header of a CSV export."""
+    with path.open(newline="", encoding="utf-8") as file:
+        header = next(csv.reader(file), [])
+    return [column for column in _CSV_COLUMNS if column not in header]
+
+
+def _read_csv(path: Path, entity_id: str) -> Iterator[StateEvent]:
+    with path.open(newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        entity_id_index, state_index, last_changed_index = (header.index(column) for column in _CSV_COLUMNS)
+        for row in reader:
+            if row[entity_id_index] == entity_id:
+                yield StateEvent(_parse_timestamp(row[last_changed_index]), entity_id, row[state_index])
+
+
+def _read_jsonl(path: Path, entity_id: str) -> Iterator[StateEvent]:
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if entity_id not in line:
+                # Cheap pre-filter before parsing the line
+                continue
+            row = json.loads(line)
+            if row["entity_id"] == entity_id:
+                timestamp = row.get("last_changed") or row.get("last_updated")
+                yield StateEvent(_parse_timestamp(timestamp), entity_id, str(row["state"]))
+
+
+def _read_sqlite(path: Path, entity_id: str, chunk_size: int) -> Iterator[StateEvent]:
+    connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(_SQLITE_STATES_QUERY, (entity_id,))
+        while rows := cursor.fetchmany(chunk_size):
+            for state, last_updated_ts in rows:
+                if state is not None:
+                    yield StateEvent(_parse_timestamp(last_updated_ts), entity_id, state)
+    finally:
+        connection.close()
+
+
+def _guess_format(path: Path) -> str:
+    """Guess the format of a history file from its suffix."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".json", ".ndjson"):
+        return "jsonl"
+    return "sqlite"
+
+
+def read_events(
+        path: Path,
+        entity_ids: Iterable[str],
+        source_format: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[StateEvent]:
+    """Stream the state events of the given entities from a history file.
+
+    :param path: The path of the history file.
+    :param entity_ids: The source entities to read.
+    :param source_format: The format of the file (csv, jsonl or sqlite), guessed from the suffix when omitted.
+    :param chunk_size: The number of rows fetched at once from a SQLite database.
+    :return: The state events, sorted by time.
+    """
+    source_format = source_format or _guess_format(path)
+
+    streams: list[Iterator[StateEvent]] = []
+    for entity_id in sorted(set(entity_ids)):
+        if source_format == "csv":
+            streams.append(_read_csv(path, entity_id))
+        elif source_format == "jsonl":
+            streams.append(_read_jsonl(path, entity_id))
+        else:
+            streams.append(_read_sqlite(path, entity_id, chunk_size))
+
+    # Exports group the states by entity, so every entity is streamed on its own and the streams are merged by time
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=lambda event: event.timestamp)
+
+
+def _format_report(timestamp: datetime, logic: MaintenanceLogic, label: str) -> str:
+    state = logic.get_state()
+    details = " ".join(f"{key}={value}" for key, value in state.items())
+    return f"{timestamp.isoformat(sep=' ', timespec='seconds')} {label:<8} needed={logic.is_maintenance_needed} {details}\n"
+
+
+async def replay(
+        events: Iterator[StateEvent],
+        sensor_type: SensorType,
+        config: dict,
+        report_interval: timedelta | None = DEFAULT_REPORT_INTERVAL,
+        auto_reset: bool = False,
+        output: TextIO = sys.stdout,
+) -> int:
+    """Replay the state events through a maintenance logic.
+
+    :param events: The state events, sorted by time.
+    :param sensor_type: The type of the maintenance logic.
+    :param config: The configuration data of the maintenance logic.
+    :param report_interval: How often the state of the logic is reported, None to report only the flips.
+    :param auto_reset: Whether to reset the logic when maintenance is needed, as if the maintenance was performed.
+    :param output: Where the reports are written.
+    :return: The number of replayed events.
+    """
+    first_event = next(events, None)
+    if first_event is None:
+        return 0
+
+    clock = FakeClock(first_event.timestamp)
+    logic = IMPLEMENTED_LOGICS[sensor_type].get_instance(
+        {CONFIG_INITIAL_LAST_MAINTENANCE_DATE: first_event.timestamp, **config},
+        clock=clock,
+    )
+    last_states: dict[str, str] = {}
+    next_report = first_event.timestamp + report_interval if report_interval else None
+    is_maintenance_needed = False
+    count = 0
+
+    for event in chain([first_event], events):
+        while (next_update_time := logic.next_update_time) is not None and next_update_time <= event.timestamp:
+            # Run the update the logic requested, e.g. the end of a cycle, at the time it requested
+            clock.set(next_update_time)
+            logic.update()
+            if logic.next_update_time == next_update_time:
+                break
+        while next_report is not None and next_report <= event.timestamp:
+            # Report the state of the logic at every boundary crossed since the previous event
+            clock.set(next_report)
+            logic.update()
+            output.write(_format_report(next_report, logic, "report"))
+            next_report += report_interval
+
+        clock.set(event.timestamp)
+        old_state = last_states.get(event.entity_id)
+        if event.entity_id == logic.load_entity_id and event.entity_id not in logic.source_entity_ids:
+            logic.handle_load_change(event.state)
+        elif old_state is None:
+            await logic.handle_startup(event.state, event.entity_id)
+        elif old_state != event.state or sensor_type in (SensorType.POWER, SensorType.METER, SensorType.CYCLE):
+            await logic.handle_source_entity_state_change(old_state, event.state, event.entity_id)
+        last_states[event.entity_id] = event.state
+        count += 1
+
+        if logic.is_maintenance_needed != is_maintenance_needed:
+            is_maintenance_needed = not is_maintenance_needed
+            output.write(_format_report(event.timestamp, logic, "due" if is_maintenance_needed else "cleared"))
+            if is_maintenance_needed and auto_reset:
+                logic.reset()
+                is_maintenance_needed = False
+                output.write(_format_report(event.timestamp, logic, "reset"))
+
+    logic.update()
+    output.write(_format_report(clock.utcnow(), logic, "final"))
+    return count
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Replay a state history through a device maintenance monitor logic.",
+    )
+    parser.add_argument("history", type=Path, help="CSV export, JSONL file or recorder SQLite database")
+    parser.add_argument("--format", choices=["csv", "jsonl", "sqlite"], help="format of the history file")
+    parser.add_argument(
+        "--sensor-type",
+        type=SensorType,
+        choices=list(IMPLEMENTED_LOGICS),
+        default=SensorType.RUNTIME,
+        help="type of the maintenance logic",
+    )
+    parser.add_argument("--entity-id", action="append", required=True, help="source entity, may be repeated")
+    parser.add_argument("--on-state", action="append", help="state considered as on, may be repeated")
+    parser.add_argument("--interval", type=parse_duration, help="runtime or fixed interval, e.g. 250h")
+    parser.add_argument("--min-interval", type=parse_duration, help="minimum interval, e.g. 30d")
+    parser.add_argument("--max-interval", type=parse_duration, help="maximum interval, e.g. 180d")
+    parser.add_argument("--count", type=int, help="turn on or cycle count threshold")
+    parser.add_argument("--energy", type=float, help="energy threshold in kWh")
+    parser.add_argument("--consumption", type=float, help="meter consumption threshold")
+    parser.add_argument("--max-delta", type=float, help="largest meter delta accepted between readings")
+    parser.add_argument("--load-entity-id", help="entity whose state weights the runtime, e.g. a fan percentage")
+    parser.add_argument("--load-full-scale", type=float, help="load at which the runtime counts fully, 100 by default")
+    parser.add_argument("--start-threshold", type=float, help="power (W) from which a cycle is running")
+    parser.add_argument("--min-cycle-length", type=parse_duration, help="shortest cycle counted, e.g. 10m")
+    parser.add_argument("--idle-timeout", type=parse_duration, help="idle time that ends a cycle, e.g. 5m")
+    parser.add_argument(
+        "--report-interval",
+        type=parse_duration,
+        default=DEFAULT_REPORT_INTERVAL,
+        help="how often the state is reported, e.g. 1d (default), 0s to report only maintenance flips",
+    )
+    parser.add_argument("--auto-reset", action="store_true", help="reset the logic whenever maintenance is due")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="SQLite rows fetched at once")
+    return parser
+
+
+def _check_args(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Report the missing threshold of the sensor type and an unreadable history file as usage errors."""
+    threshold = _REQUIRED_THRESHOLDS[args.sensor_type]
+    if getattr(args, threshold) is None:
+        parser.error(f"--{threshold} is required for the {args.sensor_type} sensor type")
+
+    if not args.history.is_file():
+        parser.error(f"{args.history} is not a file")
+    if (args.format or _guess_format(args.history)) == "csv":
+        try:
+            missing_columns = _missing_csv_columns(args.history)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            parser.error(f"Cannot read {args.history}: {e}")
+        if missing_columns:
+            parser.error(f"{args.history} has no {', '.join(missing_columns)} column")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the replay command line."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    _check_args(parser, args)
+    entity_id, *additional_entity_ids = args.entity_id
+    config = {
+        CONF_NAME: entity_id,
+        CONF_ENTITY_ID: entity_id,
+        CONF_ON_STATES: args.on_state or DEFAULT_ON_STATES,
+        CONF_INTERVAL: args.interval,
+        CONF_MIN_INTERVAL: args.min_interval,
+        CONF_MAX_INTERVAL: args.max_interval,
+        CONF_COUNT: args.count,
+        CONF_ENERGY: args.energy,
+        CONF_CONSUMPTION: args.consumption,
+        CONF_MAX_DELTA: args.max_delta,
+        CONF_START_THRESHOLD: args.start_threshold,
+        CONF_MIN_CYCLE_LENGTH: args.min_cycle_length,
+        CONF_IDLE_TIMEOUT: args.idle_timeout,
+        CONF_LOAD_ENTITY_ID: args.load_entity_id,
+        CONF_LOAD_FULL_SCALE: args.load_full_scale,
+    }
+    if additional_entity_ids:
+        config[CONF_ADDITIONAL_ENTITY_IDS] = additional_entity_ids
+
+    entity_ids = [*args.entity_id, args.load_entity_id] if args.load_entity_id else args.entity_id
+    events = read_events(args.history, entity_ids, args.format, args.chunk_size)
+    started = time.perf_counter()
+    count = asyncio.run(
+        replay(
+            events,
+            args.sensor_type,
+            config,
+            report_interval=args.report_interval or None,
+            auto_reset=args.auto_reset,
+        )
+    )
+    elapsed = time.perf_counter() - started
+    sys.stderr.write(f"Replayed {count} events in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} events/s)\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
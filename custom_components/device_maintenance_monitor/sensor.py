@@ -1,32 +1,81 @@
 """The sensors for the Device Maintenance Monitor integration."""
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import logging
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
+import homeassistant.util.dt as dt_util
 
-from .common import SourceEntity, create_source_entity, generate_sensor_entity_id
-from .const import DOMAIN, SIGNAL_SENSOR_STATE_CHANGE, STATE_PREDICTED_MAINTENANCE_DATE
+from .common import (
+    SourceEntity,
+    create_source_entity,
+    generate_sensor_entity_id,
+    get_maintenance_needed_entity_id,
+)
+from .const import (
+    DOMAIN,
+    ENTITY_NEXT_MAINTENANCE_DUE_KEY,
+    SIGNAL_DUE_DATES_CHANGED,
+    SIGNAL_MONITOR_UPDATED,
+    STATE_CYCLE_COUNT,
+    STATE_CYCLE_REMAINING,
+    STATE_DEVICE_TURN_ON_COUNT,
+    STATE_DEVICE_TURN_ON_REMAINING,
+    STATE_DEVICE_TURN_ONS_LAST_24_HOURS,
+    STATE_ENERGY_CONSUMED,
+    STATE_ENERGY_REMAINING,
+    STATE_METER_CONSUMED,
+    STATE_METER_REMAINING,
+    STATE_PREDICTED_MAINTENANCE_DATE,
+    STATE_RUNTIME_DURATION,
+    STATE_RUNTIME_LAST_7_DAYS,
+    STATE_RUNTIME_LAST_24_HOURS,
+    STATE_RUNTIME_REMAINING,
+)
 from .device_binding import get_device_info
-from .logics import MaintenanceLogic
+from .due_dates import DueDateTracker, async_get_due_date_tracker
+from .logics import (
+    CountMaintenanceLogic,
+    CycleMaintenanceLogic,
+    MaintenanceLogic,
+    MeterMaintenanceLogic,
+    PowerMaintenanceLogic,
+    RuntimeMaintenanceLogic,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _as_local_date(value: datetime | None) -> date | None:
+    """Convert a UTC datetime to the local date."""
+    if value is None:
+        return None
+    return dt_util.as_local(value).date()
+
+
+def _as_hours(value: timedelta) -> float:
+    """Convert a duration to hours."""
+    return value.total_seconds() / 3600
+
+
 @dataclass(frozen=True, kw_only=True)
 class MaintenanceSensorEntityDescription(SensorEntityDescription):
     """Class describing sensors entities."""
 
-    value_fn: Callable[[MaintenanceLogic], str | float | datetime]
+    value_fn: Callable[[MaintenanceLogic], str | float | date | None]
+    exists_fn: Callable[[MaintenanceLogic], bool] = lambda _: True
 
 
 class MaintenanceDurationSensorEntity(SensorEntity):
@@ -37,12 +86,14 @@ class MaintenanceDurationSensorEntity(SensorEntity):
     def __init__(self,
                  hass: HomeAssistant,
                  logic: MaintenanceLogic,
+                 entry_id: str,
                  unique_id: str,
                  source_entity: SourceEntity | None,
                  description: MaintenanceSensorEntityDescription):
         """Initialize the sensor entity.
 
         :param logic: The maintenance logic to be  used.
+        :param entry_id: The identifier of the config entry of the logic.
         """
         self.entity_description = description
         self._attr_unique_id = f"{unique_id}_{description.key}"
@@ -60,35 +111,233 @@ class MaintenanceDurationSensorEntity(SensorEntity):
         )
 
         self._logic = logic
+        self._entry_id = entry_id
+
+    @property
+    def _precision(self) -> int | None:
+        """Return the display precision chosen for the sensor, or the suggested one."""
+        if self.registry_entry and (sensor_options := self.registry_entry.options.get("sensor")):
+            if (display_precision := sensor_options.get("display_precision")) is not None:
+                return display_precision
+        return self.entity_description.suggested_display_precision
 
     @property
-    def native_value(self) -> StateType:
-        """Return the state."""
-        return self.entity_description.value_fn(self._logic)
+    def native_value(self) -> StateType | date:
+        """Return the state, rounded to the display precision so the state is only written when it shows."""
+        value = self.entity_description.value_fn(self._logic)
+        if isinstance(value, float) and (precision := self._precision) is not None:
+            return round(value, precision)
+        return value
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return the time the usage was last reset, so the statistics start a new cycle."""
+        if self.state_class != SensorStateClass.TOTAL:
+            return None
+        return self._logic.last_reset_date
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
-        @callback
-        def signal_sensor_state_change_listener() -> None:
-            self.async_write_ha_state()
-
         self.async_on_remove(
             async_dispatcher_connect(
                 self.hass,
-                SIGNAL_SENSOR_STATE_CHANGE,
-                signal_sensor_state_change_listener,
+                SIGNAL_MONITOR_UPDATED,
+                self._async_monitor_updated,
             )
         )
 
+    @callback
+    def _async_monitor_updated(self, entry_id: str) -> None:
+        """Write the state when the logic of the sensor was updated."""
+        if entry_id == self._entry_id:
+            self.async_write_ha_state()
+
 
 MAINTENANCE_SENSORS: list[MaintenanceSensorEntityDescription] = [
     MaintenanceSensorEntityDescription(
         key=STATE_PREDICTED_MAINTENANCE_DATE,
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda logic: logic.predicted_maintenance_date.date() if logic.predicted_maintenance_date else None,
+        value_fn=lambda logic: _as_local_date(logic.predicted_maintenance_date),
+    ),
+    # The usage of the device changes on every update, so it is kept out of the attributes of the binary sensor, and
+    # it is reported as a total reset with the logic so the recorder compiles it into long term statistics
+    MaintenanceSensorEntityDescription(
+        key=STATE_RUNTIME_DURATION,
+        state_class=SensorStateClass.TOTAL,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        value_fn=lambda logic: _as_hours(logic.runtime_duration),
+        exists_fn=lambda logic: isinstance(logic, RuntimeMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_RUNTIME_REMAINING,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+        value_fn=lambda logic: _as_hours(logic.runtime_remaining),
+        exists_fn=lambda logic: isinstance(logic, RuntimeMaintenanceLogic),
+    ),
+    # The usage over the last hours is read from the hourly buckets of the logic instead of querying the history
+    MaintenanceSensorEntityDescription(
+        key=STATE_RUNTIME_LAST_24_HOURS,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        value_fn=lambda logic: _as_hours(logic.runtime_last_24_hours),
+        exists_fn=lambda logic: isinstance(logic, RuntimeMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_RUNTIME_LAST_7_DAYS,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        value_fn=lambda logic: _as_hours(logic.runtime_last_7_days),
+        exists_fn=lambda logic: isinstance(logic, RuntimeMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_DEVICE_TURN_ON_COUNT,
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda logic: logic.device_turn_on_count,
+        exists_fn=lambda logic: isinstance(logic, CountMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_DEVICE_TURN_ON_REMAINING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda logic: logic.device_turn_on_remaining,
+        exists_fn=lambda logic: isinstance(logic, CountMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_DEVICE_TURN_ONS_LAST_24_HOURS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda logic: logic.device_turn_ons_last_24_hours,
+        exists_fn=lambda logic: isinstance(logic, CountMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_ENERGY_CONSUMED,
+        state_class=SensorStateClass.TOTAL,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        value_fn=lambda logic: logic.energy_consumed,
+        exists_fn=lambda logic: isinstance(logic, PowerMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_ENERGY_REMAINING,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+        value_fn=lambda logic: logic.energy_remaining,
+        exists_fn=lambda logic: isinstance(logic, PowerMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_METER_CONSUMED,
+        state_class=SensorStateClass.TOTAL,
+        suggested_display_precision=2,
+        value_fn=lambda logic: logic.meter_consumed,
+        exists_fn=lambda logic: isinstance(logic, MeterMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_METER_REMAINING,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+        value_fn=lambda logic: logic.meter_remaining,
+        exists_fn=lambda logic: isinstance(logic, MeterMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_CYCLE_COUNT,
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda logic: logic.cycle_count,
+        exists_fn=lambda logic: isinstance(logic, CycleMaintenanceLogic),
+    ),
+    MaintenanceSensorEntityDescription(
+        key=STATE_CYCLE_REMAINING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda logic: logic.cycle_remaining,
+        exists_fn=lambda logic: isinstance(logic, CycleMaintenanceLogic),
     ),
 ]
 
+NEXT_MAINTENANCE_DUE_SENSOR = SensorEntityDescription(
+    key=ENTITY_NEXT_MAINTENANCE_DUE_KEY,
+    device_class=SensorDeviceClass.TIMESTAMP,
+    has_entity_name=True,
+    translation_key=ENTITY_NEXT_MAINTENANCE_DUE_KEY,
+)
+
+
+class NextMaintenanceDueSensorEntity(SensorEntity):
+    """A class that represents a sensor entity for the monitor whose maintenance is due the soonest."""
+
+    def __init__(self, tracker: DueDateTracker):
+        """Initialize the sensor entity.
+
+        :param tracker: The tracker of the due dates of the monitors.
+        """
+        self.entity_description = NEXT_MAINTENANCE_DUE_SENSOR
+        self._attr_unique_id = f"{DOMAIN}_{ENTITY_NEXT_MAINTENANCE_DUE_KEY}"
+        self._tracker = tracker
+        self._next: tuple[datetime, str] | None = None  # The (due date, entry_id) of the next monitor
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added to hass."""
+        self._next = self._get_next()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DUE_DATES_CHANGED,
+                self._async_due_dates_changed,
+            )
+        )
+
+    def _get_next(self) -> tuple[datetime, str] | None:
+        """Return the monitor at the head of the due date index."""
+        for due_date_and_entry_id in self._tracker.index.first(1):
+            return due_date_and_entry_id
+        return None
+
+    @callback
+    def _async_due_dates_changed(self, __: str) -> None:
+        """Write the state only when the head of the index has changed."""
+        next_due = self._get_next()
+        if next_due != self._next:
+            self._next = next_due
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the due date of the next monitor."""
+        return self._next[0] if self._next else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str | None] | None:
+        """Return the monitor whose maintenance is due the soonest."""
+        if self._next is None:
+            return None
+        entry_id = self._next[1]
+        logic = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        return {
+            "monitor": logic.name if logic else None,
+            "entity_id": get_maintenance_needed_entity_id(self.hass, entry_id),
+            "entry_id": entry_id,
+        }
+
+
+async def async_setup_platform(
+        hass: HomeAssistant,
+        config: ConfigType,
+        async_add_entities: AddEntitiesCallback,
+        discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the next maintenance due sensor shared by all the monitors, loaded by the integration setup."""
+    if discovery_info is None:
+        return
+    async_add_entities([NextMaintenanceDueSensorEntity(async_get_due_date_tracker(hass))])
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the sensor platform."""
@@ -104,6 +353,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         logic.logic_type
     )
     async_add_entities([
-        MaintenanceDurationSensorEntity(hass, logic, entry.unique_id, source_entity, sensor_description)
+        MaintenanceDurationSensorEntity(hass, logic, entry.entry_id, entry.unique_id, source_entity, sensor_description)
         for sensor_description in MAINTENANCE_SENSORS
+        if sensor_description.exists_fn(logic)
     ])
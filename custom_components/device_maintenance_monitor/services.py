@@ -0,0 +1,187 @@
+"""The services of the Device Maintenance Monitor integration that are not bound to an entity."""
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import entity_registry as er
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+
+from .common import get_maintenance_needed_entity_id
+from .const import (
+    DEFAULT_HISTORY_PAGE_SIZE,
+    DEFAULT_NEXT_MAINTENANCE_COUNT,
+    DEFAULT_TRANSFER_FILE,
+    DOMAIN,
+    MAX_HISTORY_PAGE_SIZE,
+    SERVICE_EXPORT_MONITORS,
+    SERVICE_GET_MAINTENANCE_HISTORY,
+    SERVICE_GET_NEXT_MAINTENANCE,
+    SERVICE_GET_NEXT_MAINTENANCE_COUNT,
+    SERVICE_HISTORY_ACTION,
+    SERVICE_HISTORY_END_TIME,
+    SERVICE_HISTORY_ENTITY_ID,
+    SERVICE_HISTORY_LIMIT,
+    SERVICE_HISTORY_OFFSET,
+    SERVICE_HISTORY_SOURCE,
+    SERVICE_HISTORY_START_TIME,
+    SERVICE_IMPORT_MONITORS,
+    SERVICE_TRANSFER_FILE_PATH,
+    SERVICE_TRANSFER_RESTORE_CONFIG,
+    MaintenanceAction,
+    MaintenanceSource,
+)
+from .due_dates import async_get_due_date_tracker
+from .fleet_transfer import async_export_monitors, async_import_monitors
+from .maintenance_history import async_get_maintenance_history
+
+SERVICE_GET_NEXT_MAINTENANCE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(SERVICE_GET_NEXT_MAINTENANCE_COUNT, default=DEFAULT_NEXT_MAINTENANCE_COUNT): vol.All(
+            cv.positive_int, vol.Range(min=1)
+        ),
+    }
+)
+
+# The filters and the page of a maintenance history query, shared with the websocket command
+HISTORY_QUERY_SCHEMA = {
+    vol.Optional(SERVICE_HISTORY_ACTION): vol.In([action.value for action in MaintenanceAction]),
+    vol.Optional(SERVICE_HISTORY_SOURCE): vol.In([source.value for source in MaintenanceSource]),
+    vol.Optional(SERVICE_HISTORY_START_TIME): cv.datetime,
+    vol.Optional(SERVICE_HISTORY_END_TIME): cv.datetime,
+    vol.Optional(SERVICE_HISTORY_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(SERVICE_HISTORY_LIMIT, default=DEFAULT_HISTORY_PAGE_SIZE): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_HISTORY_PAGE_SIZE)
+    ),
+}
+
+SERVICE_GET_MAINTENANCE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(SERVICE_HISTORY_ENTITY_ID): cv.entity_ids,
+        **HISTORY_QUERY_SCHEMA,
+    }
+)
+
+SERVICE_EXPORT_MONITORS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(SERVICE_TRANSFER_FILE_PATH, default=DEFAULT_TRANSFER_FILE): cv.string,
+    }
+)
+
+SERVICE_IMPORT_MONITORS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(SERVICE_TRANSFER_FILE_PATH, default=DEFAULT_TRANSFER_FILE): cv.string,
+        vol.Optional(SERVICE_TRANSFER_RESTORE_CONFIG, default=True): cv.boolean,
+    }
+)
+
+
+def history_query_kwargs(data: dict) -> dict:
+    """Return the arguments of a maintenance history query from the data validated by the query schema.
+
+    :param data: The validated data of the service call or the websocket command.
+    :return: The keyword arguments of MaintenanceHistory.async_query, without the monitors.
+    """
+    start_time = data.get(SERVICE_HISTORY_START_TIME)
+    end_time = data.get(SERVICE_HISTORY_END_TIME)
+    return {
+        "action": data.get(SERVICE_HISTORY_ACTION),
+        "source": data.get(SERVICE_HISTORY_SOURCE),
+        "start_time": dt_util.as_utc(start_time) if start_time else None,
+        "end_time": dt_util.as_utc(end_time) if end_time else None,
+        "offset": data[SERVICE_HISTORY_OFFSET],
+        "limit": data[SERVICE_HISTORY_LIMIT],
+    }
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    @callback
+    def get_next_maintenance(call: ServiceCall) -> ServiceResponse:
+        """Return the devices whose maintenance is due the soonest, the most overdue first."""
+        logics = hass.data.get(DOMAIN, {})
+        now = dt_util.utcnow()
+        devices = []
+        for due_date, entry_id in async_get_due_date_tracker(hass).index.first(
+                call.data[SERVICE_GET_NEXT_MAINTENANCE_COUNT]
+        ):
+            logic = logics.get(entry_id)
+            if logic is None:
+                continue
+            devices.append(
+                {
+                    "entry_id": entry_id,
+                    "name": logic.name,
+                    "entity_id": get_maintenance_needed_entity_id(hass, entry_id),
+                    "due_date": due_date.isoformat(),
+                    "overdue": due_date <= now,
+                }
+            )
+        return {"devices": devices}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_NEXT_MAINTENANCE,
+        get_next_maintenance,
+        schema=SERVICE_GET_NEXT_MAINTENANCE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def get_maintenance_history(call: ServiceCall) -> ServiceResponse:
+        """Return a page of the maintenance history, the most recent first."""
+        entry_ids = None
+        if entity_ids := call.data.get(SERVICE_HISTORY_ENTITY_ID):
+            # The monitors are selected by any of their entities, usually the maintenance needed binary sensor
+            registry = er.async_get(hass)
+            entry_ids = {
+                entity_entry.config_entry_id
+                for entity_id in entity_ids
+                if (entity_entry := registry.async_get(entity_id)) and entity_entry.platform == DOMAIN
+            }
+        return await async_get_maintenance_history(hass).async_query(
+            entry_ids=entry_ids,
+            **history_query_kwargs(call.data),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MAINTENANCE_HISTORY,
+        get_maintenance_history,
+        schema=SERVICE_GET_MAINTENANCE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def export_monitors(call: ServiceCall) -> ServiceResponse:
+        """Write the state and the config of every monitor to a JSONL file."""
+        return await async_export_monitors(hass, call.data[SERVICE_TRANSFER_FILE_PATH])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_MONITORS,
+        export_monitors,
+        schema=SERVICE_EXPORT_MONITORS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def import_monitors(call: ServiceCall) -> ServiceResponse:
+        """Restore the state and the config of the monitors from a JSONL file, matching them by unique_id."""
+        return await async_import_monitors(
+            hass,
+            call.data[SERVICE_TRANSFER_FILE_PATH],
+            call.data[SERVICE_TRANSFER_RESTORE_CONFIG],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_MONITORS,
+        import_monitors,
+        schema=SERVICE_IMPORT_MONITORS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
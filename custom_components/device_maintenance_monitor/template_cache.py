@@ -0,0 +1,145 @@
+"""Shares the is on templates of the monitors that use the same template source."""
+import logging
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_template_result,
+)
+from homeassistant.helpers.template import Template
+
+from .const import DATA_TEMPLATE_CACHE
+from .logics.base_maintenance_logic import IsOnExpression
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SharedTemplate:
+    """A class that represents an is on template compiled once and rendered once for all the monitors using it.
+
+    The is on templates are rendered without variables, so their result only depends on their source. While the
+    template is used, its result is tracked, and the monitors read the last result instead of rendering it again.
+    """
+
+    def __init__(self, hass: HomeAssistant, template: Template):
+        """Initialize the shared template.
+
+        :param hass: The Home Assistant instance.
+        :param template: The compiled and validated template.
+        """
+        self._hass = hass
+        self._template = template
+        self._result: Any = None  # The last result of the template
+        self._track: TrackTemplateResultInfo | None = None
+
+    def _render(self) -> Any:
+        """Render the template, which is off when it fails."""
+        try:
+            return self._template.async_render()
+        except TemplateError as e:
+            _LOGGER.error("Error rendering is on template: %s", e)
+            return False
+
+    @callback
+    def _async_result_changed(self, __: Event | None, updates: list[TrackTemplateResult]) -> None:
+        """Keep the new result of the template."""
+        for update in updates:
+            if isinstance(update.result, TemplateError):
+                _LOGGER.error("Error rendering is on template: %s", update.result)
+                self._result = False
+            else:
+                self._result = update.result
+
+    @callback
+    def async_start(self) -> None:
+        """Render the template and track the changes of its result, when the first monitor uses it."""
+        if self._track is not None:
+            return
+        self._result = self._render()
+        self._track = async_track_template_result(
+            self._hass,
+            [TrackTemplate(self._template, None)],
+            self._async_result_changed,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking the template, once the last monitor stopped using it."""
+        if self._track is not None:
+            self._track.async_remove()
+            self._track = None
+
+    async def async_is_on(self) -> Any:
+        """Return the last result of the template."""
+        if self._track is None:
+            return self._render()
+        return self._result
+
+
+class TemplateCache:
+    """A class that keeps the shared templates by template source, and the template used by every monitor."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache.
+
+        :param hass: The Home Assistant instance.
+        """
+        self._hass = hass
+        self._templates: dict[str, SharedTemplate] = {}  # The shared templates by template source
+        self._sources: dict[str, str] = {}  # The template source used by every entry_id
+
+    def __len__(self) -> int:
+        """Return the number of shared templates."""
+        return len(self._templates)
+
+    @callback
+    def async_acquire(self, entry_id: str, source: str) -> IsOnExpression | None:
+        """Get the expression of an is on template, compiling the template on its first use.
+
+        The template previously used by the monitor is released.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        :param source: The source of the template.
+        :return: The expression, or None if the template is invalid.
+        """
+        if self._sources.get(entry_id) != source:
+            self.async_release(entry_id)
+
+        if (shared_template := self._templates.get(source)) is None:
+            template = Template(source, self._hass)
+            try:
+                template.ensure_valid()
+            except TemplateError as e:
+                _LOGGER.error("Error parsing is on template %s: %s", source, e)
+                return None
+            shared_template = self._templates[source] = SharedTemplate(self._hass, template)
+            shared_template.async_start()
+        self._sources[entry_id] = source
+        return shared_template.async_is_on
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Stop using the template of a monitor, and drop the template once no monitor uses it.
+
+        :param entry_id: The identifier of the config entry of the monitor.
+        """
+        if (source := self._sources.pop(entry_id, None)) is None:
+            return
+        if source not in self._sources.values():
+            self._templates.pop(source).async_stop()
+
+
+@callback
+def async_get_template_cache(hass: HomeAssistant) -> TemplateCache:
+    """Get the template cache, creating it on first use.
+
+    :param hass: The Home Assistant instance.
+    :return: The template cache.
+    """
+    if (cache := hass.data.get(DATA_TEMPLATE_CACHE)) is None:
+        cache = hass.data[DATA_TEMPLATE_CACHE] = TemplateCache(hass)
+    return cache
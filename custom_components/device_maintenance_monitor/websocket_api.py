@@ -0,0 +1,71 @@
+"""The websocket commands of the Device Maintenance Monitor integration."""
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import WS_GET_MAINTENANCE_HISTORY, WS_SUBSCRIBE_FLEET_STATUS
+from .fleet_status import FleetStatusDelta, async_get_fleet_status_tracker
+from .maintenance_history import async_get_maintenance_history
+from .services import HISTORY_QUERY_SCHEMA, history_query_kwargs
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_fleet_status)
+    websocket_api.async_register_command(hass, websocket_get_maintenance_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE_FLEET_STATUS,
+    }
+)
+@callback
+def websocket_subscribe_fleet_status(
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg: dict[str, Any],
+) -> None:
+    """Send the status of every monitor, and then the changes as they happen.
+
+    The first event holds the status of every monitor under 'monitors'. The following events hold the fields that
+    changed for every updated monitor under 'changed', and the removed monitors under 'removed'.
+    """
+    @callback
+    def send_delta(delta: FleetStatusDelta) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    statuses, unsubscribe = async_get_fleet_status_tracker(hass).async_subscribe(send_delta)
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"monitors": statuses}))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_GET_MAINTENANCE_HISTORY,
+        vol.Optional("entry_ids"): [str],
+        **HISTORY_QUERY_SCHEMA,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_maintenance_history(
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg: dict[str, Any],
+) -> None:
+    """Send a page of the maintenance history, the most recent first.
+
+    The result holds the records of the page under 'records', and the number of records matching the filters under
+    'total', so the next page is requested with an offset of the records already received.
+    """
+    entry_ids = msg.get("entry_ids")
+    result = await async_get_maintenance_history(hass).async_query(
+        entry_ids=set(entry_ids) if entry_ids is not None else None,
+        **history_query_kwargs(msg),
+    )
+    connection.send_result(msg["id"], result)
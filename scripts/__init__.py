@@ -0,0 +1 @@
+"""Development scripts for the device maintenance monitor integration."""
@@ -0,0 +1,93 @@
+"""Report the time it takes to import the integration and its Home Assistant independent core.
+
+Every module is imported in a fresh interpreter, so the measurement includes everything the module pulls in.
+
+Usage::
+
+    python -m scripts.import_time --runs 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+DEFAULT_RUNS = 5
+
+# Loaded by Home Assistant before any integration, the platforms only cost what they import on top of it
+REFERENCE_MODULES = [
+    "homeassistant.helpers.entity_platform",
+]
+CORE_MODULES = [
+    "custom_components.device_maintenance_monitor.const",
+    "custom_components.device_maintenance_monitor.logics",
+    "custom_components.device_maintenance_monitor.replay",
+]
+INTEGRATION_MODULES = [
+    "custom_components.device_maintenance_monitor",
+    "custom_components.device_maintenance_monitor.binary_sensor",
+    "custom_components.device_maintenance_monitor.sensor",
+    "custom_components.device_maintenance_monitor.button",
+    "custom_components.device_maintenance_monitor.config_flow",
+]
+
+_MEASURE_SCRIPT = """
+import importlib, json, sys, time
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "elapsed": elapsed,
+    "homeassistant": sorted(name for name in sys.modules if name.startswith("homeassistant.components.")),
+    "imports_homeassistant": "homeassistant" in sys.modules,
+}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    """Import the module in fresh interpreters and return the fastest run.
+
+    :param module: The name of the module to import.
+    :param runs: The number of interpreters to start.
+    :return: The import time in seconds and the Home Assistant modules it pulled in.
+    """
+    results = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _MEASURE_SCRIPT, module],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        results.append(json.loads(completed.stdout))
+    return min(results, key=lambda result: result["elapsed"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the import time report."""
+    parser = argparse.ArgumentParser(description="Report the import time of the integration modules.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="fresh interpreters started per module")
+    parser.add_argument("--verbose", action="store_true", help="list the Home Assistant components pulled in")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in REFERENCE_MODULES + CORE_MODULES + INTEGRATION_MODULES:
+        result = measure(module, args.runs)
+        is_core = module in CORE_MODULES
+        sys.stdout.write(
+            f"{module:<60} {result['elapsed'] * 1000:>8.1f} ms"
+            f"{'  imports homeassistant' if result['imports_homeassistant'] else ''}\n"
+        )
+        if args.verbose:
+            for component in result["homeassistant"]:
+                sys.stdout.write(f"    {component}\n")
+        if is_core and result["imports_homeassistant"]:
+            failed = True
+
+    if failed:
+        sys.stderr.write("The core modules must not import Home Assistant\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())